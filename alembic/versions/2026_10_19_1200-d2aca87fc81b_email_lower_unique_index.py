@@ -0,0 +1,100 @@
+"""unique index on lower(email)
+
+Revision ID: d2aca87fc81b
+Revises: ebfe604dd94c
+Create Date: 2026-10-19 12:00:00.000000
+
+Заменяет ix_users_email (unique btree по email как есть) на уникальный
+индекс по lower(email): варианты email, отличающиеся только регистром,
+больше не могут сосуществовать, даже если запись прошла мимо value object.
+
+Дополнительно (опция) — hash индекс по lower(email) для equality-lookup'ов:
+    alembic -x email_hash_index=true upgrade head
+Hash индекс не бывает уникальным, поэтому уникальность по-прежнему
+обеспечивает btree.
+
+Индексы создаются CONCURRENTLY (без блокировки записи в users).
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2aca87fc81b"
+down_revision: Union[str, Sequence[str], None] = "ebfe604dd94c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _hash_index_enabled() -> bool:
+    value = context.get_x_argument(as_dictionary=True).get("email_hash_index", "")
+    return value.lower() in ("1", "true", "yes")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    duplicates = (
+        conn.execute(
+            sa.text(
+                "SELECT lower(btrim(email)) AS email FROM users "
+                "GROUP BY lower(btrim(email)) HAVING count(*) > 1 LIMIT 10"
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Есть email, отличающиеся только регистром/пробелами — "
+            f"разрешите вручную перед миграцией: {', '.join(duplicates)}"
+        )
+
+    op.execute(
+        "UPDATE users SET email = lower(btrim(email)) "
+        "WHERE email <> lower(btrim(email))"
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ux_users_email_lower",
+            "users",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        if _hash_index_enabled():
+            op.create_index(
+                "ix_users_email_lower_hash",
+                "users",
+                [sa.text("lower(email)")],
+                postgresql_using="hash",
+                postgresql_concurrently=True,
+            )
+        op.drop_index(
+            "ix_users_email", table_name="users", postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email",
+            "users",
+            ["email"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_users_email_lower_hash",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ux_users_email_lower", table_name="users", postgresql_concurrently=True
+        )
@@ -0,0 +1,33 @@
+"""add users.last_login_at
+
+Revision ID: 5b1f0c9e7a42
+Revises: d2aca87fc81b
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1f0c9e7a42"
+down_revision: Union[str, Sequence[str], None] = "d2aca87fc81b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # nullable без default — только изменение каталога, без перезаписи таблицы
+    op.add_column(
+        "users",
+        sa.Column("last_login_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "last_login_at")
@@ -0,0 +1,65 @@
+"""create partitioned auth_events
+
+Revision ID: 8e3c41d7b6f5
+Revises: 5b1f0c9e7a42
+Create Date: 2026-10-19 14:00:00.000000
+
+Таблица секционирована по месяцам (RANGE по occurred_at).
+Миграция создаёт DEFAULT секцию и секции на текущий и следующий месяц,
+дальше секции ведёт `python -m cli.main audit-partitions` (cron).
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e3c41d7b6f5"
+down_revision: Union[str, Sequence[str], None] = "5b1f0c9e7a42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _add_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "auth_events",
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("event_type", sa.String(length=32), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=True),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("details", postgresql.JSONB(), nullable=True),
+        sa.PrimaryKeyConstraint("occurred_at", "id"),
+        postgresql_partition_by="RANGE (occurred_at)",
+    )
+    op.create_index(
+        "ix_auth_events_user_id_occurred_at",
+        "auth_events",
+        ["user_id", "occurred_at"],
+    )
+    # сюда попадают события вне созданных секций (если cron не отработал)
+    op.execute("CREATE TABLE auth_events_default PARTITION OF auth_events DEFAULT")
+
+    month = date.today().replace(day=1)
+    for _ in range(2):
+        next_month = _add_month(month)
+        op.execute(
+            f"CREATE TABLE auth_events_{month:%Y_%m} PARTITION OF auth_events "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # секции удаляются вместе с родительской таблицей
+    op.drop_table("auth_events")
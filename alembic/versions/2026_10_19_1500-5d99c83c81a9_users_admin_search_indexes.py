@@ -0,0 +1,58 @@
+"""indexes for admin user search
+
+Revision ID: 5d99c83c81a9
+Revises: 8e3c41d7b6f5
+Create Date: 2026-10-19 15:00:00.000000
+
+• ix_users_email_lower_trgm — GIN (pg_trgm) по lower(email): обслуживает
+  LIKE 'prefix%' и LIKE '%substring%' без seq scan;
+• ix_users_created_at_id — btree (created_at, id) для keyset-пагинации.
+
+Расширение pg_trgm создаётся, если его ещё нет (нужны права на CREATE EXTENSION).
+Индексы создаются CONCURRENTLY (без блокировки записи в users).
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d99c83c81a9"
+down_revision: Union[str, Sequence[str], None] = "8e3c41d7b6f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email_lower_trgm",
+            "users",
+            [sa.text("lower(email) gin_trgm_ops")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_created_at_id",
+            "users",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_created_at_id", table_name="users", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_users_email_lower_trgm",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,35 @@
+"""add users.token_epoch
+
+Revision ID: f6ca6e6358b5
+Revises: 5d99c83c81a9
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6ca6e6358b5"
+down_revision: Union[str, Sequence[str], None] = "5d99c83c81a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # константный default (PG 11+) — только изменение каталога, без перезаписи таблицы
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_epoch", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_epoch")
@@ -0,0 +1,165 @@
+"""
+Бенчмарк админского поиска пользователей (SQlAlchemyUserRepository.search).
+
+Синтетическая таблица bench_users_search (по умолчанию 5M строк, генерируется
+в самом Postgres через generate_series) с теми же индексами, что и users:
+ix_..._email_lower_trgm (GIN, pg_trgm) и ix_..._created_at_id.
+
+Сравнивается:
+  • OFFSET vs keyset — время получения страницы на глубине N строк
+    (ORDER BY created_at, id LIMIT page);
+  • подстрока/префикс email без триграммного индекса и с ним.
+
+Запуск (настройки из POSTGRES_*):
+    python -m benchmarks.bench_admin_search [--users 5000000] [--page 50]
+        [--depths 0 10000 100000 1000000] [--repeat 20] [--keep]
+
+Таблица удаляется в конце (если не указан --keep).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import asyncpg
+
+from src.core.settings.database import DatabaseSettings
+
+TABLE = "bench_users_search"
+HASH = "$argon2id$v=19$m=98304,t=4,p=4$c29tZXNhbHQ$q0Zp3o5c1m1J1tW2cQz2b0n0p8a0lX6dZ2E0o4Vq9Yk"
+
+_ORDER = "ORDER BY created_at, id"
+SEARCHES = {
+    "prefix": "lower(email) LIKE 'user12345%'",
+    "contains": "lower(email) LIKE '%r12345@%'",
+    "domain": "lower(email) LIKE '%@corp.invalid'",
+}
+
+
+async def _prepare_table(conn: asyncpg.Connection, users: int) -> None:
+    await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    await conn.execute(
+        f"""
+        CREATE UNLOGGED TABLE {TABLE} (
+            id uuid PRIMARY KEY,
+            email varchar(255) NOT NULL,
+            hashed_password varchar(255) NOT NULL,
+            created_at timestamptz NOT NULL,
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            last_login_at timestamptz,
+            is_active boolean NOT NULL,
+            email_verified boolean NOT NULL
+        )
+        """
+    )
+    start = time.perf_counter()
+    # created_at с повторами (шаг 1 с на 3 строки) — проверяет id как tie-breaker
+    await conn.execute(
+        f"""
+        INSERT INTO {TABLE} (id, email, hashed_password, created_at, is_active, email_verified)
+        SELECT md5(i::text)::uuid,
+               'user' || i || '@' || (ARRAY['gmail.com', 'mail.ru', 'yandex.ru', 'corp.invalid'])[i % 4 + 1],
+               $1,
+               timestamptz '2023-01-01' + (i / 3) * interval '1 second',
+               true,
+               true
+        FROM generate_series(1, $2::int) AS i
+        """,
+        HASH,
+        users,
+    )
+    await conn.execute(f"CREATE UNIQUE INDEX ON {TABLE} (lower(email))")
+    await conn.execute(
+        f"CREATE INDEX {TABLE}_created_at_id ON {TABLE} (created_at, id)"
+    )
+    await conn.execute(f"VACUUM ANALYZE {TABLE}")
+    print(f"таблица готова за {time.perf_counter() - start:.1f} с")
+
+
+async def _timed(conn: asyncpg.Connection, query: str, *args, repeat: int) -> float:
+    """Медиана времени выполнения запроса, мс (после одного прогрева)"""
+    await conn.fetch(query, *args)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await conn.fetch(query, *args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def _plan(conn: asyncpg.Connection, query: str, *args) -> str:
+    rows = await conn.fetch(f"EXPLAIN (COSTS OFF) {query}", *args)
+    return " / ".join(row[0].strip() for row in rows)
+
+
+async def bench_pagination(
+    conn: asyncpg.Connection, depths: list[int], page: int, repeat: int
+) -> None:
+    print(f"\n{'depth':>10} {'offset ms':>10} {'keyset ms':>10}")
+    for depth in depths:
+        offset_query = f"SELECT * FROM {TABLE} {_ORDER} LIMIT $1 OFFSET $2"
+        offset_ms = await _timed(conn, offset_query, page, depth, repeat=repeat)
+
+        # курсор = последняя строка предыдущей страницы
+        cursor = await conn.fetchrow(
+            f"SELECT created_at, id FROM {TABLE} {_ORDER} LIMIT 1 OFFSET $1",
+            max(depth - 1, 0),
+        )
+        keyset_query = (
+            f"SELECT * FROM {TABLE} WHERE (created_at, id) > ($1, $2) {_ORDER} LIMIT $3"
+        )
+        keyset_ms = await _timed(
+            conn, keyset_query, cursor["created_at"], cursor["id"], page, repeat=repeat
+        )
+        print(f"{depth:>10} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+
+
+async def bench_search(
+    conn: asyncpg.Connection, page: int, repeat: int, label: str
+) -> None:
+    print(f"\n[{label}]")
+    for name, condition in SEARCHES.items():
+        query = f"SELECT * FROM {TABLE} WHERE {condition} {_ORDER} LIMIT $1"
+        ms = await _timed(conn, query, page, repeat=repeat)
+        print(f"{name:>10} {ms:>10.2f} ms  {await _plan(conn, query, page)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5_000_000)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument(
+        "--depths", type=int, nargs="+", default=[0, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="не удалять таблицу")
+    args = parser.parse_args()
+
+    dsn = str(DatabaseSettings().get_url()).replace(
+        "postgresql+asyncpg", "postgresql", 1
+    )
+    conn = await asyncpg.connect(dsn)
+    try:
+        await _prepare_table(conn, args.users)
+        depths = [d for d in args.depths if d < args.users]
+        await bench_pagination(conn, depths, args.page, args.repeat)
+
+        await bench_search(conn, args.page, max(args.repeat // 4, 1), "без pg_trgm")
+        start = time.perf_counter()
+        await conn.execute(
+            f"CREATE INDEX {TABLE}_email_trgm ON {TABLE} "
+            f"USING gin (lower(email) gin_trgm_ops)"
+        )
+        await conn.execute(f"ANALYZE {TABLE}")
+        print(f"\nGIN индекс построен за {time.perf_counter() - start:.1f} с")
+        await bench_search(conn, args.page, args.repeat, "с pg_trgm")
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
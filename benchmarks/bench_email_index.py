@@ -0,0 +1,180 @@
+"""
+Бенчмарк стратегий индексации email для get_by_email на больших объёмах.
+
+Для каждой стратегии создаётся отдельная таблица bench_users_<name> с одинаковыми
+синтетическими данными (по умолчанию 10M строк, генерируются в самом Postgres
+через generate_series) и своим индексом:
+  • btree        — unique btree по email (как было до ux_users_email_lower);
+  • lower_btree  — unique btree по lower(email) (текущая схема);
+  • lower_hash   — hash по lower(email) (+ unique btree для уникальности);
+  • citext       — колонка citext с unique btree (если расширение доступно).
+
+Для каждой печатается размер индекса, план одного запроса и p50/p99 латентности.
+
+Запуск (настройки из POSTGRES_*):
+    python -m benchmarks.bench_email_index [--users 10000000] [--lookups 20000]
+        [--strategies btree lower_btree lower_hash citext] [--keep]
+
+Таблицы удаляются в конце (если не указан --keep).
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import asyncpg
+
+from src.core.settings.database import DatabaseSettings
+
+HASH = "$argon2id$v=19$m=98304,t=4,p=4$c29tZXNhbHQ$q0Zp3o5c1m1J1tW2cQz2b0n0p8a0lX6dZ2E0o4Vq9Yk"
+
+# name -> (тип колонки email, DDL индексов, запрос поиска)
+STRATEGIES = {
+    "btree": (
+        "varchar(255)",
+        ["CREATE UNIQUE INDEX ON {table} (email)"],
+        "SELECT * FROM {table} WHERE email = $1",
+    ),
+    "lower_btree": (
+        "varchar(255)",
+        ["CREATE UNIQUE INDEX ON {table} (lower(email))"],
+        "SELECT * FROM {table} WHERE lower(email) = $1",
+    ),
+    "lower_hash": (
+        "varchar(255)",
+        [
+            "CREATE UNIQUE INDEX ON {table} (lower(email))",
+            "CREATE INDEX {table}_hash ON {table} USING hash (lower(email))",
+        ],
+        "SELECT * FROM {table} WHERE lower(email) = $1",
+    ),
+    "citext": (
+        "citext",
+        ["CREATE UNIQUE INDEX ON {table} (email)"],
+        "SELECT * FROM {table} WHERE email = $1",
+    ),
+}
+
+
+async def _prepare_table(conn: asyncpg.Connection, name: str, users: int) -> str:
+    column_type, indexes, _ = STRATEGIES[name]
+    table = f"bench_users_{name}"
+    if column_type == "citext":
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS citext")
+
+    await conn.execute(f"DROP TABLE IF EXISTS {table}")
+    await conn.execute(
+        f"""
+        CREATE UNLOGGED TABLE {table} (
+            id uuid PRIMARY KEY,
+            email {column_type} NOT NULL,
+            hashed_password varchar(255) NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            is_active boolean NOT NULL,
+            email_verified boolean NOT NULL
+        )
+        """
+    )
+    start = time.perf_counter()
+    # md5(i) как id — детерминированные данные, одинаковые для всех стратегий
+    await conn.execute(
+        f"""
+        INSERT INTO {table} (id, email, hashed_password, is_active, email_verified)
+        SELECT md5(i::text)::uuid, 'user' || i || '@bench.invalid', $1, true, true
+        FROM generate_series(1, $2::int) AS i
+        """,
+        HASH,
+        users,
+    )
+    for ddl in indexes:
+        await conn.execute(ddl.format(table=table))
+    await conn.execute(f"VACUUM ANALYZE {table}")
+    print(f"[{name}] таблица готова за {time.perf_counter() - start:.1f} с")
+    return table
+
+
+async def _index_sizes(conn: asyncpg.Connection, table: str) -> str:
+    rows = await conn.fetch(
+        """
+        SELECT indexrelid::regclass::text AS name,
+               pg_size_pretty(pg_relation_size(indexrelid)) AS size
+        FROM pg_index WHERE indrelid = $1::regclass
+        """,
+        table,
+    )
+    return ", ".join(f"{row['name']}={row['size']}" for row in rows)
+
+
+async def _measure(
+    conn: asyncpg.Connection, query: str, users: int, lookups: int
+) -> list[float]:
+    statement = await conn.prepare(query)
+    emails = [f"user{random.randint(1, users)}@bench.invalid" for _ in range(lookups)]
+    # прогрев кеша страниц
+    for email in emails[:500]:
+        await statement.fetchrow(email)
+
+    timings = []
+    for email in emails:
+        start = time.perf_counter()
+        row = await statement.fetchrow(email)
+        timings.append(time.perf_counter() - start)
+        assert row is not None
+    return sorted(timings)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument(
+        "--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES)
+    )
+    parser.add_argument("--keep", action="store_true", help="не удалять таблицы")
+    args = parser.parse_args()
+
+    dsn = str(DatabaseSettings().get_url()).replace(
+        "postgresql+asyncpg", "postgresql", 1
+    )
+    conn = await asyncpg.connect(dsn)
+    tables = []
+    results = []
+    try:
+        for name in args.strategies:
+            try:
+                table = await _prepare_table(conn, name, args.users)
+            except asyncpg.PostgresError as e:
+                print(f"[{name}] пропущено: {e}")
+                continue
+            tables.append(table)
+            query = STRATEGIES[name][2].format(table=table)
+
+            plan = await conn.fetch(
+                f"EXPLAIN (COSTS OFF) {query}", "user1@bench.invalid"
+            )
+            print(f"[{name}] индексы: {await _index_sizes(conn, table)}")
+            print(f"[{name}] план: {' / '.join(row[0].strip() for row in plan)}")
+
+            timings = await _measure(conn, query, args.users, args.lookups)
+            results.append(
+                (
+                    name,
+                    timings[len(timings) // 2],
+                    timings[int(len(timings) * 0.99)],
+                )
+            )
+
+        print(f"\n{'strategy':>12} {'p50 us':>10} {'p99 us':>10}")
+        for name, p50, p99 in results:
+            print(f"{name:>12} {p50 * 1e6:>10.1f} {p99 * 1e6:>10.1f}")
+    finally:
+        if not args.keep:
+            for table in tables:
+                await conn.execute(f"DROP TABLE IF EXISTS {table}")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
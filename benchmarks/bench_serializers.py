@@ -0,0 +1,69 @@
+"""
+Бенчмарк сериализаторов pending-записи (VerificationCodeRepository).
+
+Запуск:
+    python -m benchmarks.bench_serializers [--iterations 100000]
+
+Для каждого доступного сериализатора печатает стоимость encode/decode
+и размер значения в байтах. Сериализаторы, чьи пакеты не установлены, пропускаются.
+"""
+
+import argparse
+import json
+import time
+
+from src.infrastructure.caching.serializers import (
+    PayloadSerializer,
+    build_serializer,
+)
+
+PENDING_RECORD = {
+    "email": "someone.with.a.long.name@example-company.com",
+    "hashed_password": (
+        "$argon2id$v=19$m=98304,t=4,p=4$"
+        "c29tZXNhbHRzb21lc2FsdA$"
+        "q0Zp3o5c1m1J1tW2cQz2b0n0p8a0lX6dZ2E0o4Vq9Yk"
+    ),
+    "max_attempts": 5,
+}
+
+
+def _bench(serializer: PayloadSerializer, iterations: int) -> tuple[float, float, int]:
+    encoded = serializer.dumps(PENDING_RECORD)
+    assert serializer.loads(encoded) == PENDING_RECORD
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serializer.dumps(PENDING_RECORD)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serializer.loads(encoded)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    return encode_us, decode_us, len(encoded)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    legacy = json.dumps(PENDING_RECORD).encode()
+    print(f"legacy json.dumps (без заголовка): {len(legacy)} bytes")
+    print(f"{'serializer':<10} {'encode, us':>12} {'decode, us':>12} {'bytes':>8}")
+
+    for name in ("json", "orjson", "msgpack"):
+        try:
+            serializer = build_serializer(name)
+        except RuntimeError:
+            print(f"{name:<10} {'не установлен':>34}")
+            continue
+
+        encode_us, decode_us, size = _bench(serializer, args.iterations)
+        print(f"{name:<10} {encode_us:>12.2f} {decode_us:>12.2f} {size:>8}")
+
+
+if __name__ == "__main__":
+    main()
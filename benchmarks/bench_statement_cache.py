@@ -0,0 +1,103 @@
+"""
+Бенчмарк задержки get_by_email при разных настройках prepared statements asyncpg:
+  • cache=N      — кеши asyncpg/SQLAlchemy включены (по умолчанию в приложении);
+  • cache=0      — кеши выключены, каждый запрос заново prepare;
+  • pgbouncer    — кеши выключены + уникальные имена statements.
+
+Запуск (нужна БД с применёнными миграциями, настройки из POSTGRES_*):
+    python -m benchmarks.bench_statement_cache [--users 10000] [--lookups 20000]
+        [--cache-size 100] [--url postgresql+asyncpg://...@pgbouncer:6432/db]
+
+--url позволяет прогнать те же конфигурации через PgBouncer
+(cache=N там ожидаемо упадёт в transaction mode).
+Скрипт создаёт синтетических пользователей с доменом @bench.invalid и удаляет их в конце.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.bench_user_lookup import _cleanup, _seed
+from src.core.settings.database import DatabaseSettings
+from src.infrastructure.persistence.asyncpg_options import asyncpg_connect_args
+from src.infrastructure.persistence.repositories.user import SQlAlchemyUserRepository
+
+
+async def _measure(
+    url: str, connect_args: dict, emails: list[str], lookups: int
+) -> list[float]:
+    engine = create_async_engine(
+        url,
+        pool_size=1,
+        connect_args=connect_args,
+        isolation_level="AUTOCOMMIT",
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    sample = random.choices(emails, k=lookups)
+    timings: list[float] = []
+    try:
+        async with session_factory() as session:
+            users = SQlAlchemyUserRepository(session)
+            # прогрев соединения
+            for email in sample[:200]:
+                await users.get_by_email(email)
+            for email in sample:
+                start = time.perf_counter()
+                user = await users.get_by_email(email)
+                timings.append(time.perf_counter() - start)
+                assert user is not None
+    finally:
+        await engine.dispose()
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--cache-size", type=int, default=100)
+    parser.add_argument(
+        "--url", default=None, help="DSN для замеров (например, PgBouncer)"
+    )
+    args = parser.parse_args()
+
+    settings = DatabaseSettings()
+    seed_engine = create_async_engine(str(settings.get_url()), pool_size=1)
+    seed_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+        seed_engine, expire_on_commit=False
+    )
+    url = args.url or str(settings.get_url())
+
+    configs = {
+        f"cache={args.cache_size}": asyncpg_connect_args(args.cache_size, False),
+        "cache=0": asyncpg_connect_args(0, False),
+        "pgbouncer": asyncpg_connect_args(args.cache_size, True),
+    }
+
+    try:
+        emails = await _seed(seed_factory, args.users)
+        print(f"{'config':>12} {'avg us':>10} {'p50 us':>10} {'p99 us':>10}")
+        for name, connect_args in configs.items():
+            try:
+                timings = await _measure(url, connect_args, emails, args.lookups)
+            except Exception as e:
+                print(f"{name:>12} ошибка: {e.__class__.__name__}: {e}")
+                continue
+            timings.sort()
+            p50 = timings[len(timings) // 2]
+            p99 = timings[int(len(timings) * 0.99)]
+            print(
+                f"{name:>12} {statistics.fmean(timings) * 1e6:>10.1f} "
+                f"{p50 * 1e6:>10.1f} {p99 * 1e6:>10.1f}"
+            )
+    finally:
+        await _cleanup(seed_factory)
+        await seed_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
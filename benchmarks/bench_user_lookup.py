@@ -0,0 +1,124 @@
+"""
+Бенчмарк чтения пользователя: ORM (select(UserModel) + to_domain) против
+Core-пути SQlAlchemyUserRepository (select колонок + сборка User из строки).
+
+Запуск (нужна БД с применёнными миграциями, настройки из POSTGRES_*):
+    python -m benchmarks.bench_user_lookup [--users 10000] [--lookups 1000 10000 100000]
+
+Скрипт создаёт синтетических пользователей с доменом @bench.invalid и удаляет их в конце.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.settings.database import DatabaseSettings
+from src.infrastructure.persistence.models import UserModel
+from src.infrastructure.persistence.repositories.user import SQlAlchemyUserRepository
+
+BENCH_DOMAIN = "bench.invalid"
+HASH = "$argon2id$v=19$m=98304,t=4,p=4$c29tZXNhbHQ$q0Zp3o5c1m1J1tW2cQz2b0n0p8a0lX6dZ2E0o4Vq9Yk"
+SESSION_BATCH = 1000
+
+
+async def _seed(
+    session_factory: async_sessionmaker[AsyncSession], count: int
+) -> list[str]:
+    emails = [f"user{i}-{uuid4().hex[:8]}@{BENCH_DOMAIN}" for i in range(count)]
+    async with session_factory() as session:
+        for start in range(0, count, 5000):
+            chunk = emails[start : start + 5000]
+            await session.execute(
+                insert(UserModel),
+                [
+                    {
+                        "id": uuid4(),
+                        "email": email,
+                        "hashed_password": HASH,
+                        "is_active": True,
+                        "email_verified": True,
+                    }
+                    for email in chunk
+                ],
+            )
+        await session.commit()
+    return emails
+
+
+async def _cleanup(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async with session_factory() as session:
+        await session.execute(
+            delete(UserModel).where(UserModel.email.like(f"%@{BENCH_DOMAIN}"))
+        )
+        await session.commit()
+
+
+async def _orm_lookup(session: AsyncSession, email: str) -> None:
+    result = await session.execute(
+        select(UserModel).where(func.lower(UserModel.email) == email)
+    )
+    model = result.scalar_one_or_none()
+    assert model is not None
+    model.to_domain()
+
+
+async def _core_lookup(session: AsyncSession, email: str) -> None:
+    user = await SQlAlchemyUserRepository(session).get_by_email(email)
+    assert user is not None
+
+
+async def _run(
+    session_factory: async_sessionmaker[AsyncSession],
+    lookup,
+    emails: list[str],
+    lookups: int,
+) -> float:
+    sample = random.choices(emails, k=lookups)
+    start = time.perf_counter()
+    for offset in range(0, lookups, SESSION_BATCH):
+        async with session_factory() as session:
+            for email in sample[offset : offset + SESSION_BATCH]:
+                await lookup(session, email)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument(
+        "--lookups", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    settings = DatabaseSettings()
+    engine = create_async_engine(str(settings.get_url()), pool_size=1)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    try:
+        emails = await _seed(session_factory, args.users)
+        # прогрев соединения и кеша планов
+        await _run(session_factory, _orm_lookup, emails, 200)
+        await _run(session_factory, _core_lookup, emails, 200)
+
+        print(
+            f"{'lookups':>8} {'orm, s':>10} {'core, s':>10} {'orm us/op':>10} {'core us/op':>10}"
+        )
+        for lookups in args.lookups:
+            orm = await _run(session_factory, _orm_lookup, emails, lookups)
+            core = await _run(session_factory, _core_lookup, emails, lookups)
+            print(
+                f"{lookups:>8} {orm:>10.3f} {core:>10.3f} "
+                f"{orm / lookups * 1e6:>10.1f} {core / lookups * 1e6:>10.1f}"
+            )
+    finally:
+        await _cleanup(session_factory)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
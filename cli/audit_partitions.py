@@ -0,0 +1,174 @@
+"""
+Обслуживание месячных секций auth_events (запускать по cron, например раз в день):
+  • создаёт секции auth_events_YYYY_MM на текущий месяц и months_ahead вперёд;
+  • отсоединяет и удаляет секции старше retention_months;
+  • удаляет из auth_events_default строки старше retention_months.
+
+Секции создаются заранее, чтобы события не копились в auth_events_default:
+секцию нельзя создать, если DEFAULT уже содержит строки из её диапазона.
+Если cron пропустил запуск и такие строки есть, DEFAULT на время отсоединяется,
+секция создаётся и строки её месяца переносятся в неё (одна транзакция).
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Dict, List
+
+import typer
+
+from cli.db import connect
+
+_PARTITION_RE = re.compile(r"^auth_events_(\d{4})_(\d{2})$")
+_DEFAULT = "auth_events_default"
+_COLUMNS = "occurred_at, id, event_type, user_id, email, details"
+
+
+@dataclass
+class PartitionChanges:
+    created: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+    # секция -> строк, перенесённых в неё из DEFAULT
+    moved: Dict[str, int] = field(default_factory=dict)
+    # строк старше срока хранения, удалённых из DEFAULT
+    pruned_default: int = 0
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"auth_events_{month:%Y_%m}"
+
+
+def _ts(month: date) -> datetime:
+    # границы секций — полночь UTC (CLI работает в TIME ZONE 'UTC')
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+async def maintain_partitions(
+    months_ahead: int, retention_months: int, dry_run: bool
+) -> PartitionChanges:
+    current = date.today().replace(day=1)
+    oldest_kept = add_months(current, -retention_months)
+
+    conn = await connect()
+    changes = PartitionChanges()
+    try:
+        existing = {
+            row["name"]
+            for row in await conn.fetch(
+                """
+                SELECT c.relname AS name
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'auth_events'::regclass
+                """
+            )
+        }
+        has_default = _DEFAULT in existing
+
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            start, end = month, add_months(month, 1)
+            stranded = (
+                await conn.fetchval(
+                    f"SELECT count(*) FROM {_DEFAULT} "
+                    f"WHERE occurred_at >= $1 AND occurred_at < $2",
+                    _ts(start),
+                    _ts(end),
+                )
+                if has_default
+                else 0
+            )
+            if not dry_run:
+                if stranded:
+                    await _create_from_default(conn, name, start, end)
+                else:
+                    await conn.execute(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF auth_events "
+                        f"FOR VALUES FROM ('{start.isoformat()}') "
+                        f"TO ('{end.isoformat()}')"
+                    )
+            changes.created.append(name)
+            if stranded:
+                changes.moved[name] = stranded
+
+        for name in sorted(existing):
+            match = _PARTITION_RE.match(name)
+            if not match:
+                continue  # auth_events_default чистится ниже построчно
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if month >= oldest_kept:
+                continue
+            if not dry_run:
+                # DETACH ... CONCURRENTLY недоступен при наличии DEFAULT секции;
+                # DROP секции берёт короткую блокировку родителя
+                await conn.execute(f"DROP TABLE {name}")
+            changes.dropped.append(name)
+
+        if has_default:
+            if dry_run:
+                changes.pruned_default = await conn.fetchval(
+                    f"SELECT count(*) FROM {_DEFAULT} WHERE occurred_at < $1",
+                    _ts(oldest_kept),
+                )
+            else:
+                status = await conn.execute(
+                    f"DELETE FROM {_DEFAULT} WHERE occurred_at < $1", _ts(oldest_kept)
+                )
+                # статус вида "DELETE <n>"
+                changes.pruned_default = int(status.rsplit(" ", 1)[-1])
+    finally:
+        await conn.close()
+
+    return changes
+
+
+async def _create_from_default(conn, name: str, start: date, end: date) -> None:
+    """
+    Секцию нельзя создать, пока DEFAULT содержит строки из её диапазона:
+    DEFAULT отсоединяется, секция создаётся, строки переносятся, DEFAULT
+    присоединяется обратно. Блокировка родителя держится до commit — вставки
+    событий в это время ждут, а не падают.
+    """
+    async with conn.transaction():
+        await conn.execute(f"ALTER TABLE auth_events DETACH PARTITION {_DEFAULT}")
+        await conn.execute(
+            f"CREATE TABLE {name} PARTITION OF auth_events "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        await conn.execute(
+            f"WITH moved AS ("
+            f"DELETE FROM {_DEFAULT} WHERE occurred_at >= $1 AND occurred_at < $2 "
+            f"RETURNING {_COLUMNS}"
+            f") INSERT INTO {name} ({_COLUMNS}) SELECT {_COLUMNS} FROM moved",
+            _ts(start),
+            _ts(end),
+        )
+        await conn.execute(
+            f"ALTER TABLE auth_events ATTACH PARTITION {_DEFAULT} DEFAULT"
+        )
+
+
+def report(changes: PartitionChanges, dry_run: bool) -> None:
+    prefix = "[dry-run] " if dry_run else ""
+    for name in changes.created:
+        typer.echo(f"{prefix}создана секция {name}")
+        if name in changes.moved:
+            typer.echo(
+                f"{prefix}  перенесено из {_DEFAULT}: {changes.moved[name]} строк"
+            )
+    for name in changes.dropped:
+        typer.echo(f"{prefix}удалена секция {name}")
+    if changes.pruned_default:
+        typer.echo(
+            f"{prefix}удалено из {_DEFAULT} устаревших строк: {changes.pruned_default}"
+        )
+    if not (changes.created or changes.dropped or changes.pruned_default):
+        typer.echo("Секции в актуальном состоянии")
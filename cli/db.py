@@ -0,0 +1,14 @@
+import asyncpg
+
+from src.core.settings.database import DatabaseSettings
+
+
+async def connect() -> asyncpg.Connection:
+    """Прямое asyncpg соединение для CLI (COPY, DDL обслуживания)"""
+    # asyncpg не понимает схему SQLAlchemy "postgresql+asyncpg"
+    dsn = str(DatabaseSettings().get_url()).replace(
+        "postgresql+asyncpg", "postgresql", 1
+    )
+    conn = await asyncpg.connect(dsn)
+    await conn.execute("SET TIME ZONE 'UTC'")
+    return conn
@@ -0,0 +1,23 @@
+from redis.asyncio import Redis
+
+from src.core.settings import RedisSettings
+from src.infrastructure.caching.email_bloom_filter import RedisEmailBloomFilter
+
+
+async def invalidate_email_filter() -> None:
+    """
+    Сбрасывает фильтр email после вставок в обход регистрации (импорт,
+    ручной SQL, восстановление БД): приложение перестроит его из users.
+    """
+    settings = RedisSettings()
+    redis = Redis.from_url(settings.get_url())
+    try:
+        email_filter = RedisEmailBloomFilter(
+            redis=redis,
+            capacity=settings.email_filter_capacity,
+            error_rate=settings.email_filter_error_rate,
+            backend=settings.email_filter_backend,
+        )
+        await email_filter.invalidate()
+    finally:
+        await redis.aclose()
@@ -1,5 +1,7 @@
+import asyncio
 import typer
 from pathlib import Path
+from typing import Optional
 import subprocess
 
 
@@ -64,5 +66,68 @@ def keys_generate(
     typer.echo(f"   Публичный:  {public_path.relative_to(project_root)}")
 
 
+@app.command()
+def users_export(
+    output: Path = typer.Argument(..., help="Файл для выгрузки ('-' — stdout)"),
+    fmt: Optional[str] = typer.Option(
+        None, "--format", "-f", help="csv / ndjson (по умолчанию — по расширению)"
+    ),
+    progress_every: int = typer.Option(100_000, help="Шаг вывода прогресса, строк"),
+):
+    """Выгружает пользователей (с хешами паролей) через COPY"""
+    from cli.users_io import detect_format, export_users
+
+    fmt = detect_format(output, fmt or ("ndjson" if str(output) == "-" else None))
+    count = asyncio.run(export_users(output, fmt, progress_every))
+    typer.echo(f"✅ Выгружено пользователей: {count}", err=True)
+
+
+@app.command()
+def users_import(
+    source: Path = typer.Argument(..., help="Файл для загрузки ('-' — stdin)"),
+    fmt: Optional[str] = typer.Option(
+        None, "--format", "-f", help="csv / ndjson (по умолчанию — по расширению)"
+    ),
+    batch_size: int = typer.Option(10_000, help="Строк в одном COPY батче"),
+    progress_every: int = typer.Option(100_000, help="Шаг вывода прогресса, строк"),
+):
+    """Загружает пользователей через бинарный COPY, существующие id/email пропускаются"""
+    from cli.users_io import detect_format, import_users
+
+    fmt = detect_format(source, fmt or ("ndjson" if str(source) == "-" else None))
+    valid, rejected, inserted = asyncio.run(
+        import_users(source, fmt, batch_size, progress_every)
+    )
+    typer.echo(
+        f"✅ Прочитано: {valid + rejected}, невалидных: {rejected}, "
+        f"добавлено: {inserted}, уже были: {valid - inserted}",
+        err=True,
+    )
+
+
+@app.command()
+def email_filter_reset():
+    """Сбрасывает фильтр email (после ручных вставок в users или восстановления БД)"""
+    from cli.email_filter import invalidate_email_filter
+
+    asyncio.run(invalidate_email_filter())
+    typer.echo("✅ Фильтр email сброшен, приложение перестроит его из users")
+
+
+@app.command()
+def audit_partitions(
+    months_ahead: int = typer.Option(2, help="Сколько месяцев вперёд держать секции"),
+    retention_months: int = typer.Option(
+        12, help="Сколько прошлых месяцев хранить (старше — удаляются)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Только показать изменения"),
+):
+    """Создаёт будущие и удаляет устаревшие месячные секции auth_events"""
+    from cli.audit_partitions import maintain_partitions, report
+
+    changes = asyncio.run(maintain_partitions(months_ahead, retention_months, dry_run))
+    report(changes, dry_run)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,264 @@
+"""
+Потоковый импорт/экспорт таблицы users через COPY (asyncpg).
+
+Экспорт:
+  • csv    — COPY (SELECT ...) TO STDOUT, чанки пишутся в файл как есть;
+  • ndjson — серверный курсор, по одной JSON-строке на пользователя.
+Импорт:
+  • строки проверяются value objects домена (Email, HashedPassword),
+    невалидные выводятся в stderr и пропускаются;
+  • файл читается батчами, каждый батч уходит в temp-таблицу бинарным COPY
+    (copy_records_to_table), затем одним INSERT ... ON CONFLICT DO NOTHING
+    переносится в users — существующие id/email пропускаются;
+  • после вставки фильтр email сбрасывается — приложение перестроит его из users.
+
+Память постоянна (не больше одного батча), хеши паролей (argon2) переносятся без изменений.
+"""
+
+import csv
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import asyncpg
+import typer
+
+from cli.db import connect
+from cli.email_filter import invalidate_email_filter
+from src.domain.exceptions import DomainError
+from src.domain.value_objects import Email, HashedPassword
+
+COLUMNS = (
+    "id",
+    "email",
+    "hashed_password",
+    "is_active",
+    "email_verified",
+    "created_at",
+    "updated_at",
+)
+FORMATS = ("csv", "ndjson")
+_SELECT_USERS = f"SELECT {', '.join(COLUMNS)} FROM users ORDER BY created_at, id"
+_STAGING_TABLE = "users_import"
+
+
+def detect_format(path: Path, fmt: Optional[str]) -> str:
+    if fmt:
+        if fmt not in FORMATS:
+            raise typer.BadParameter(
+                f"Формат должен быть одним из: {', '.join(FORMATS)}"
+            )
+        return fmt
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in ("ndjson", "jsonl"):
+        return "ndjson"
+    if suffix == "csv":
+        return "csv"
+    raise typer.BadParameter(
+        "Не удалось определить формат по расширению, укажите --format"
+    )
+
+
+class _Progress:
+    def __init__(self, action: str, every: int) -> None:
+        self.action = action
+        self.every = every
+        self.count = 0
+        self._next = every
+        self._started = time.perf_counter()
+
+    def add(self, n: int) -> None:
+        self.count += n
+        if self.count >= self._next:
+            self._next = (self.count // self.every + 1) * self.every
+            self._report()
+
+    def done(self) -> None:
+        self._report()
+
+    def _report(self) -> None:
+        elapsed = time.perf_counter() - self._started
+        rate = self.count / elapsed if elapsed else 0.0
+        typer.echo(
+            f"{self.action}: {self.count} строк, {elapsed:.1f} с ({rate:.0f} строк/с)",
+            err=True,
+        )
+
+
+# ─── export ──────────────────────────────────────────────────────────────────
+
+
+async def export_users(output: Path, fmt: str, progress_every: int) -> int:
+    conn = await connect()
+    progress = _Progress("Экспорт", progress_every)
+    stream: IO[bytes] = sys.stdout.buffer if str(output) == "-" else open(output, "wb")
+    try:
+        if fmt == "csv":
+            header_skipped = False
+
+            async def _write(chunk: bytes) -> None:
+                nonlocal header_skipped
+                stream.write(chunk)
+                lines = chunk.count(b"\n")
+                if not header_skipped and lines:
+                    lines -= 1
+                    header_skipped = True
+                progress.add(lines)
+
+            await conn.copy_from_query(
+                _SELECT_USERS, output=_write, format="csv", header=True
+            )
+        else:
+            async with conn.transaction():
+                async for row in conn.cursor(_SELECT_USERS, prefetch=1000):
+                    stream.write(_row_to_json(row))
+                    progress.add(1)
+    finally:
+        if stream is not sys.stdout.buffer:
+            stream.close()
+        await conn.close()
+
+    progress.done()
+    return progress.count
+
+
+def _row_to_json(row: asyncpg.Record) -> bytes:
+    record = {
+        "id": str(row["id"]),
+        "email": row["email"],
+        "hashed_password": row["hashed_password"],
+        "is_active": row["is_active"],
+        "email_verified": row["email_verified"],
+        "created_at": row["created_at"].isoformat(),
+        "updated_at": row["updated_at"].isoformat(),
+    }
+    return json.dumps(record, ensure_ascii=False).encode() + b"\n"
+
+
+# ─── import ──────────────────────────────────────────────────────────────────
+
+
+def _parse_bool(value: Any, default: bool) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("t", "true", "1", "yes")
+
+
+def _parse_datetime(value: Any, default: datetime) -> datetime:
+    if not value:
+        return default
+    parsed = datetime.fromisoformat(str(value))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _to_record(raw: Any) -> Tuple[Any, ...]:
+    """Строка файла -> запись COPY. Невалидная строка — DomainError / ValueError"""
+    if not isinstance(raw, dict):
+        raise ValueError("ожидается JSON-объект")
+    # те же проверки, что при регистрации: в users не попадёт то,
+    # что приложение не сможет прочитать
+    email = Email.create(raw.get("email") or "")
+    hashed_password = HashedPassword.from_hasher(raw.get("hashed_password") or "")
+
+    now = datetime.now(timezone.utc)
+    created_at = _parse_datetime(raw.get("created_at"), now)
+    return (
+        UUID(str(raw["id"])) if raw.get("id") else uuid4(),
+        email.value,
+        hashed_password.value,
+        _parse_bool(raw.get("is_active"), True),
+        _parse_bool(raw.get("email_verified"), False),
+        created_at,
+        _parse_datetime(raw.get("updated_at"), created_at),
+    )
+
+
+def _read_rows(stream: IO[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """(номер строки файла, строка); битый JSON отклонит _to_record"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line, raw_line in enumerate(stream, start=1):
+        if not raw_line.strip():
+            continue
+        try:
+            yield line, json.loads(raw_line)
+        except ValueError:
+            yield line, raw_line
+
+
+def _batches(
+    stream: IO[str], fmt: str, batch_size: int, rejected: List[int]
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """Невалидные строки пропускаются, их номера добавляются в rejected"""
+    batch: List[Tuple[Any, ...]] = []
+    for line, raw in _read_rows(stream, fmt):
+        try:
+            batch.append(_to_record(raw))
+        except (DomainError, ValueError, TypeError) as e:
+            rejected.append(line)
+            typer.echo(f"Строка {line} пропущена: {e}", err=True)
+            continue
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def import_users(
+    source: Path, fmt: str, batch_size: int, progress_every: int
+) -> Tuple[int, int, int]:
+    """Возвращает (валидных строк, невалидных строк, добавлено пользователей)"""
+    conn = await connect()
+    progress = _Progress("Импорт", progress_every)
+    stream: IO[str] = (
+        sys.stdin if str(source) == "-" else open(source, encoding="utf-8", newline="")
+    )
+    columns = ", ".join(COLUMNS)
+    rejected: List[int] = []
+    try:
+        async with conn.transaction():
+            await conn.execute(
+                f"CREATE TEMP TABLE {_STAGING_TABLE} "
+                f"(LIKE users INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            for batch in _batches(stream, fmt, batch_size, rejected):
+                # бинарный COPY
+                await conn.copy_records_to_table(
+                    _STAGING_TABLE, records=batch, columns=COLUMNS
+                )
+                progress.add(len(batch))
+
+            status = await conn.execute(
+                f"INSERT INTO users ({columns}) "
+                f"SELECT {columns} FROM {_STAGING_TABLE} "
+                f"ON CONFLICT DO NOTHING"
+            )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        await conn.close()
+
+    progress.done()
+    # статус вида "INSERT 0 <n>"
+    inserted = int(status.rsplit(" ", 1)[-1])
+    if inserted:
+        # пользователи вставлены в обход регистрации — фильтр про них не знает
+        try:
+            await invalidate_email_filter()
+        except Exception as e:
+            typer.echo(
+                f"⚠️ Не удалось сбросить фильтр email ({e}), "
+                f"выполните: python -m cli.main email-filter-reset",
+                err=True,
+            )
+    return progress.count, len(rejected), inserted
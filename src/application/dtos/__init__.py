@@ -1,5 +1,16 @@
 from .auth_credentials_dto import AuthCredentialsDTO
 from .auth_response_dto import AuthResponseDTO
 from .verify_code_dto import VerifyCodeDTO
+from .user_search_dto import UserSearchDTO, UserPageDTO
+from .principal_dto import EMBEDDED_CLAIMS, PrincipalDTO, principal_claims
 
-__all__ = ["AuthCredentialsDTO", "AuthResponseDTO", "VerifyCodeDTO"]
+__all__ = [
+    "AuthCredentialsDTO",
+    "AuthResponseDTO",
+    "VerifyCodeDTO",
+    "UserSearchDTO",
+    "UserPageDTO",
+    "EMBEDDED_CLAIMS",
+    "PrincipalDTO",
+    "principal_claims",
+]
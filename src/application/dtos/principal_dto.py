@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional
+from uuid import UUID
+
+from src.domain.entities.user import User
+
+# Claims о пользователе, которые встраиваются в access-токен (и переносятся
+# при ротации через refresh-токен)
+EMBEDDED_CLAIMS = ("email_verified",)
+
+
+def principal_claims(user: User) -> Dict[str, Any]:
+    """Claims для access-токена, из которых потом собирается PrincipalDTO"""
+    return {"email_verified": user.email_verified}
+
+
+@dataclass(frozen=True, slots=True)
+class PrincipalDTO:
+    """
+    Пользователь запроса по проверенным claims access-токена — без похода в БД.
+    email_verified / jti / epoch = None: токен выпущен до появления claim.
+    """
+
+    user_id: UUID
+    email_verified: Optional[bool] = None
+    expires_at: Optional[datetime] = None
+    jti: Optional[str] = None
+    epoch: Optional[int] = None
+
+    @classmethod
+    def from_claims(cls, claims: Mapping[str, Any]) -> "PrincipalDTO":
+        exp = claims.get("exp")
+        return cls(
+            user_id=UUID(str(claims["sub"])),
+            email_verified=claims.get("email_verified"),
+            expires_at=(
+                datetime.fromtimestamp(int(exp), tz=timezone.utc)
+                if exp is not None
+                else None
+            ),
+            jti=claims.get("jti"),
+            epoch=int(claims["epoch"]) if "epoch" in claims else None,
+        )
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.application.interfaces import UserSearchMode
+from src.domain.entities.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class UserSearchDTO:
+    query: str
+    mode: UserSearchMode = UserSearchMode.PREFIX
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class UserPageDTO:
+    items: List[User]
+    # None — страница последняя
+    next_cursor: Optional[str] = None
@@ -65,3 +65,9 @@ class TokenReuseDetectedError(ApplicationError):
     попыткой переиспользовать истекший токен"""
 
     pass
+
+
+class InvalidCursorError(ApplicationError):
+    """Курсор пагинации повреждён или подделан"""
+
+    pass
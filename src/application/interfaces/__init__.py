@@ -1,25 +1,56 @@
+from .audit_log import AbstractAuditLog, AuthEventType
 from .authentication_service import AbstractAuthenticationService
 from .email_sender import AbstractEmailSender
+from .email_filter import AbstractEmailFilter
 from .jwt_service import AbstractJWTService
 from .hasher import AbstractHasher
-from .rate_limit_repository import AbstractRateLimitRepository
+from .login_tracker import AbstractLoginTracker
+from .rate_limit_repository import (
+    AbstractRateLimitRepository,
+    RateLimitDecision,
+    RateLimitRule,
+    RateLimitRuleKind,
+    SharedRateLimitRepository,
+)
 from .refresh_token_repository import AbstractRefreshTokenRepository
-from .user_repository import AbstractUserRepository
+from .token_denylist import AbstractTokenDenylist
+from .token_epoch import AbstractTokenEpochStore
+from .user_repository import AbstractUserRepository, UserCursor, UserSearchMode
 from .verification_code_repository import (
     AbstractVerificationCodeRepository,
     PendingRegistrationData,
+    VerificationAttempt,
+)
+from .unit_of_work import (
+    AbstractUnitOfWork,
+    AbstractReadOnlyUnitOfWork,
+    PrimaryReadOnlyUnitOfWork,
 )
-from .unit_of_work import AbstractUnitOfWork
 
 __all__ = [
+    "AbstractAuditLog",
+    "AuthEventType",
     "AbstractAuthenticationService",
     "AbstractEmailSender",
+    "AbstractEmailFilter",
     "AbstractJWTService",
     "AbstractHasher",
+    "AbstractLoginTracker",
     "AbstractRateLimitRepository",
+    "RateLimitDecision",
+    "RateLimitRule",
+    "RateLimitRuleKind",
+    "SharedRateLimitRepository",
     "AbstractRefreshTokenRepository",
+    "AbstractTokenDenylist",
+    "AbstractTokenEpochStore",
     "AbstractUserRepository",
+    "UserCursor",
+    "UserSearchMode",
     "AbstractVerificationCodeRepository",
     "PendingRegistrationData",
+    "VerificationAttempt",
     "AbstractUnitOfWork",
+    "AbstractReadOnlyUnitOfWork",
+    "PrimaryReadOnlyUnitOfWork",
 ]
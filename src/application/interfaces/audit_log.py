@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+
+class AuthEventType(str, Enum):
+    LOGIN = "login"
+    LOGIN_FAILED = "login_failed"
+    REFRESH = "refresh"
+    TOKEN_REUSE = "token_reuse"
+    PASSWORD_CHANGED = "password_changed"
+
+
+class AbstractAuditLog(ABC):
+    """Журнал событий аутентификации (audit trail)."""
+
+    @abstractmethod
+    def record(
+        self,
+        event_type: AuthEventType,
+        user_id: Optional[UUID] = None,
+        email: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Записать событие. Не блокирует и не ходит в БД: событие буферизуется
+        и пишется пачкой в фоне. При переполнении буфера событие может быть отброшено.
+        """
+        ...
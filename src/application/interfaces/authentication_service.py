@@ -17,11 +17,15 @@ class AbstractAuthenticationService(ABC):
         self,
         user_id: Optional[UUID] = None,
         refresh_token: Optional[str] = NotImplemented,
+        extra_claims: Optional[dict] = None,
     ) -> Tuple[str, str]:
         """
         Генерирует access и refresh токены, сохраняет refresh (jti) в хранилище (удаляет предыдущий если он передан для ротации)
         и возвращает пару токенов.
 
+        extra_claims встраиваются в токены; при ротации без extra_claims
+        переносятся claims из предъявленного refresh-токена.
+
         Returns:
             (access_token: str, refresh_token: str)
         """
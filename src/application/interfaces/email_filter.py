@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractEmailFilter(ABC):
+    """
+    Вероятностный фильтр зарегистрированных email (Bloom filter).
+    Ложноположительные ответы допустимы, ложноотрицательные — нет.
+    """
+
+    @abstractmethod
+    async def might_exist(self, email: str) -> bool:
+        """
+        False — email точно не зарегистрирован, в БД можно не ходить.
+        True — email, возможно, зарегистрирован (или фильтр ещё не построен /
+        недоступен) — нужна проверка в БД.
+        """
+        ...
+
+    @abstractmethod
+    async def add(self, email: str) -> None:
+        """Добавить email в фильтр (вызывается при регистрации до вставки в БД)."""
+        ...
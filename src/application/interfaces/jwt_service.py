@@ -25,12 +25,14 @@ class AbstractJWTService(ABC):
     def create_refresh_token(
         self,
         user_id: UUID,
+        extra_claims: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
         Создаёт refresh-токен (долгоживущий, с jti)
 
         Args:
             user_id: ID пользователя
+            extra_claims: claims, которые перейдут в access-токен при ротации
         """
         ...
 
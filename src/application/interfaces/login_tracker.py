@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+
+class AbstractLoginTracker(ABC):
+    """Учёт времени последней успешной аутентификации пользователя."""
+
+    @abstractmethod
+    def record(self, user_id: UUID, at: Optional[datetime] = None) -> None:
+        """
+        Отметить успешный вход (логин или ротация refresh).
+        Не блокирует и не ходит в БД: запись буферизуется и сбрасывается пачкой.
+        """
+        ...
@@ -1,6 +1,80 @@
 # src/application/interfaces/rate_limit_repository.py
 from abc import ABC, abstractmethod
-from typing import Tuple
+from dataclasses import dataclass
+from enum import Enum
+from typing import NewType, Optional, Sequence, Tuple
+
+
+class RateLimitRuleKind(str, Enum):
+    # Счётчик попыток в фиксированном окне (INCR + EXPIRE)
+    WINDOW = "window"
+    # Кулдаун: пока ключ жив — действие запрещено
+    COOLDOWN = "cooldown"
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitRule:
+    """
+    Одно правило rate limiting.
+
+    Ключ в хранилище строится как "{prefix}:{identifier}", поэтому одно и то же
+    описание подходит для лимита по email, по IP или глобального лимита
+    (identifier="global").
+    """
+
+    name: str
+    kind: RateLimitRuleKind
+    prefix: str
+    identifier: str
+    window_seconds: int
+    limit: int = 1
+
+    @classmethod
+    def window(
+        cls,
+        name: str,
+        prefix: str,
+        identifier: str,
+        limit: int,
+        window_seconds: int,
+    ) -> "RateLimitRule":
+        """В течении window_seconds может быть только limit попыток"""
+        return cls(
+            name=name,
+            kind=RateLimitRuleKind.WINDOW,
+            prefix=prefix,
+            identifier=identifier,
+            limit=limit,
+            window_seconds=window_seconds,
+        )
+
+    @classmethod
+    def cooldown(
+        cls,
+        name: str,
+        identifier: str,
+        cooldown_seconds: int,
+        prefix: str = "cooldown",
+    ) -> "RateLimitRule":
+        """Одно действие раз в cooldown_seconds"""
+        return cls(
+            name=name,
+            kind=RateLimitRuleKind.COOLDOWN,
+            prefix=prefix,
+            identifier=identifier,
+            window_seconds=cooldown_seconds,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    """Результат проверки набора правил"""
+
+    is_allowed: bool
+    # первое нарушенное правило (None если всё разрешено)
+    violated_rule: Optional[RateLimitRule] = None
+    # через сколько секунд можно повторить
+    retry_after: int = 0
 
 
 class AbstractRateLimitRepository(ABC):
@@ -48,3 +122,26 @@ class AbstractRateLimitRepository(ABC):
             remaining_cooldown: int
         """
         pass
+
+    @abstractmethod
+    async def check_rules(self, rules: Sequence[RateLimitRule]) -> RateLimitDecision:
+        """
+        Атомарно (за один round trip) проверяет все правила.
+        Квота расходуется только если прошли ВСЕ правила, иначе
+        ни один счётчик не меняется.
+
+        Args:
+            rules: правила в порядке приоритета (первое нарушенное попадёт в ответ)
+
+        Returns:
+            RateLimitDecision с первым нарушенным правилом и retry_after в секундах
+        """
+        pass
+
+
+# Лимитер без локального pre-filter: общие для всех воркеров счётчики в хранилище.
+# Нужен middleware — IP и глобальные ключи не должны упираться в маленькое
+# локальное ведро ключа
+SharedRateLimitRepository = NewType(
+    "SharedRateLimitRepository", AbstractRateLimitRepository
+)
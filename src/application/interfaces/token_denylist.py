@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class AbstractTokenDenylist(ABC):
+    """Отозванные access-токены (по jti) — до истечения их exp."""
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        """
+        Отозвать access-токен. Запись живёт ровно до expires_at:
+        после него токен отклоняется и без денайлиста.
+        """
+        ...
+
+    @abstractmethod
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Проверка на каждом защищённом запросе.
+        Должна отвечать из памяти процесса, без сетевого round trip.
+        """
+        ...
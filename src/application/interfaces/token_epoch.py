@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+
+class AbstractTokenEpochStore(ABC):
+    """
+    Эпоха токенов пользователя: встраивается в access-токен при выдаче,
+    токены с эпохой меньше текущей недействительны.
+    Источник истины — users.token_epoch, хранилище держит копию для проверок.
+    """
+
+    @abstractmethod
+    async def get(self, user_id: UUID) -> int:
+        """Текущая эпоха. Вызывается на каждом защищённом запросе."""
+        ...
+
+    @abstractmethod
+    async def publish(self, user_id: UUID, epoch: int) -> None:
+        """
+        Сообщить о новой эпохе (после коммита bump_token_epoch в БД):
+        все access-токены пользователя с меньшей эпохой перестают действовать.
+        """
+        ...
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import NewType
 
 from src.application.interfaces import AbstractUserRepository
 
@@ -19,3 +20,25 @@ class AbstractUnitOfWork(ABC):
 
     @abstractmethod
     async def rollback(self) -> None: ...
+
+
+class AbstractReadOnlyUnitOfWork(AbstractUnitOfWork):
+    """
+    UoW только для чтения (одиночные SELECT).
+    Работает без явной транзакции: нет BEGIN/COMMIT round trip'ов,
+    commit/rollback — no-op.
+    """
+
+    async def commit(self) -> None:
+        return None
+
+    async def rollback(self) -> None:
+        return None
+
+
+# Read-only UoW, который всегда читает primary: для чтений сразу после записи
+# (логин после регистрации или смены пароля, заполнение кеша пользователей),
+# где реплика может ещё не догнать primary
+PrimaryReadOnlyUnitOfWork = NewType(
+    "PrimaryReadOnlyUnitOfWork", AbstractReadOnlyUnitOfWork
+)
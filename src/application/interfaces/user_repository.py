@@ -1,11 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
 from uuid import UUID
 
 
 from src.domain.entities.user import User
 
 
+class UserSearchMode(str, Enum):
+    """Как искать подстроку в email"""
+
+    PREFIX = "prefix"
+    CONTAINS = "contains"
+
+
+# Позиция keyset-пагинации: последняя отданная строка в порядке (created_at, id)
+@dataclass(frozen=True)
+class UserCursor:
+    created_at: datetime
+    id: UUID
+
+
 class AbstractUserRepository(ABC):
     @abstractmethod
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
@@ -46,7 +63,69 @@ class AbstractUserRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    async def add_if_absent(self, user: User) -> bool:
+        """Атомарно добавить пользователя, если email ещё не занят.
+
+        Один запрос без предварительного SELECT: конкурентные регистрации
+        на один email не приводят к IntegrityError.
+
+        Args:
+            user: Объект User с валидными данными
+
+        Returns:
+            True, если пользователь добавлен; False, если email уже занят
+        """
+        ...
+
+    @abstractmethod
+    async def update(self, user: User) -> None:
+        """Сохранить изменённые поля существующего пользователя.
+
+        Args:
+            user: Объект User с ID из БД
+        """
+        ...
+
+    @abstractmethod
+    async def delete(self, user_id: UUID) -> None:
+        """Удалить пользователя (компенсация неудавшейся регистрации)."""
+        ...
+
     @abstractmethod
     async def set_password(self, user_id: UUID, hashed_password: str) -> None:
         """Изменить пароль пользователя на новый."""
         ...
+
+    @abstractmethod
+    async def bump_token_epoch(self, user_id: UUID) -> int:
+        """Увеличить эпоху токенов пользователя (отзыв всех access-токенов).
+
+        Returns:
+            Новое значение эпохи
+        """
+        ...
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        mode: UserSearchMode,
+        limit: int,
+        after: Optional[UserCursor] = None,
+    ) -> List[User]:
+        """Найти пользователей по части email (для админки).
+
+        Результат упорядочен по (created_at, id); следующая страница
+        запрашивается курсором последней строки, без OFFSET.
+
+        Args:
+            query: Искомая строка (без учёта регистра)
+            mode: Префикс или подстрока email
+            limit: Максимальное число строк
+            after: Курсор — отдаются строки строго после него
+
+        Returns:
+            Список пользователей (не больше limit)
+        """
+        ...
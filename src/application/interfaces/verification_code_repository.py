@@ -12,6 +12,15 @@ class PendingRegistrationData:
     max_attempts: int
 
 
+# Результат одной попытки ввода кода (pending-данные + счётчик попыток)
+@dataclass(frozen=True)
+class VerificationAttempt:
+    data: PendingRegistrationData
+    is_allowed: bool
+    current_attempts: int
+    remaining_attempts: int
+
+
 class AbstractVerificationCodeRepository(ABC):
     """
     Репозиторий для хранения и управления данными незавершённой работы с otp.
@@ -74,6 +83,38 @@ class AbstractVerificationCodeRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def begin_attempt(
+        self,
+        email: str,
+        limit_attempts: int,
+    ) -> Optional[VerificationAttempt]:
+        """
+        За один round trip: увеличивает счётчик попыток и возвращает
+        pending-данные вместе с результатом проверки лимита.
+
+        Args:
+            email: уникальный идентификатор (email)
+            limit_attempts: лимит попыток ввода кода
+        Returns:
+            VerificationAttempt или None, если pending истёк/удалён
+        """
+        pass
+
+    @abstractmethod
+    async def consume_pending(self, email: str, otp_hash: str) -> bool:
+        """
+        Атомарно удаляет pending, только если в нём всё ещё лежит otp_hash
+        (код не был перевыпущен параллельным resend).
+
+        Args:
+            email: уникальный идентификатор (email)
+            otp_hash: хеш кода, который был успешно проверен
+        Returns:
+            True, если запись была удалена
+        """
+        pass
+
     @abstractmethod
     async def delete_pending(
         self,
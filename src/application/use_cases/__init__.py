@@ -9,6 +9,7 @@ from .change_password.resend_code_change_pass import ResendCodeChangePasswordUse
 from .jwks.jwks import JWKSUseCase
 from .refresh.refresh import RefreshTokensUseCase
 from .logout.logout import LogoutUseCase
+from .admin.search_users import SearchUsersUseCase
 
 
 __all__ = [
@@ -23,4 +24,5 @@ __all__ = [
     "JWKSUseCase",
     "RefreshTokensUseCase",
     "LogoutUseCase",
+    "SearchUsersUseCase",
 ]
@@ -0,0 +1,71 @@
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from src.application.dtos import UserPageDTO, UserSearchDTO
+from src.application.exceptions import InvalidCursorError
+from src.application.interfaces import AbstractReadOnlyUnitOfWork, UserCursor
+from src.core.settings import AdminSettings
+
+
+def encode_cursor(cursor: UserCursor) -> str:
+    """Непрозрачный для клиента курсор: base64url("<created_at>|<id>")"""
+    raw = f"{cursor.created_at.isoformat()}|{cursor.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> UserCursor:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        created_at, user_id = raw.split("|", 1)
+        return UserCursor(
+            created_at=datetime.fromisoformat(created_at), id=UUID(user_id)
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Неверный курсор пагинации")
+
+
+class SearchUsersUseCase:
+    """
+    Поиск пользователей по email для операторов.
+
+    Пагинация keyset по (created_at, id): запрашивается limit + 1 строка,
+    лишняя строка означает, что есть следующая страница, и курсор указывает
+    на последнюю отданную.
+    """
+
+    def __init__(
+        self,
+        uow: AbstractReadOnlyUnitOfWork,
+        admin_cfg: AdminSettings,
+    ):
+        self.uow = uow
+        self.default_limit = admin_cfg.search_default_limit
+        self.max_limit = admin_cfg.search_max_limit
+
+    async def execute(self, input_dto: UserSearchDTO) -> UserPageDTO:
+        limit = min(input_dto.limit or self.default_limit, self.max_limit)
+        after = decode_cursor(input_dto.cursor) if input_dto.cursor else None
+
+        async with self.uow:
+            users = await self.uow.users.search(
+                query=input_dto.query.strip(),
+                mode=input_dto.mode,
+                limit=limit + 1,
+                after=after,
+            )
+
+        if len(users) <= limit:
+            return UserPageDTO(items=users)
+
+        users = users[:limit]
+        last = users[-1]
+        # created_at в users NOT NULL — у загруженного из БД пользователя он есть
+        assert last.created_at is not None
+        return UserPageDTO(
+            items=users,
+            next_cursor=encode_cursor(
+                UserCursor(created_at=last.created_at, id=last.id)
+            ),
+        )
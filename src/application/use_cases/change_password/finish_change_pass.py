@@ -1,10 +1,13 @@
 import asyncio
 import structlog
-from src.application.dtos.auth_response_dto import AuthResponseDTO
+from src.application.dtos import AuthResponseDTO, principal_claims
 from src.domain.entities.user import User
 from src.domain.value_objects.hashed_password import HashedPassword
 from src.application.interfaces import (
+    AbstractAuditLog,
+    AuthEventType,
     AbstractAuthenticationService,
+    AbstractTokenEpochStore,
     AbstractVerificationCodeRepository,
     AbstractUnitOfWork,
     AbstractHasher,
@@ -18,11 +21,15 @@ class FinishChangePasswordUseCase:
         verification_code_repo: AbstractVerificationCodeRepository,
         authentication: AbstractAuthenticationService,
         uow: AbstractUnitOfWork,
+        audit_log: AbstractAuditLog,
+        token_epochs: AbstractTokenEpochStore,
     ):
         self.hasher = hasher
         self.verification_code_repo = verification_code_repo
         self.authentication = authentication
         self.uow = uow
+        self.audit_log = audit_log
+        self.token_epochs = token_epochs
         self.logger = structlog.get_logger(__name__)
 
     async def execute(self, user: User, new_password: str) -> AuthResponseDTO:
@@ -31,17 +38,26 @@ class FinishChangePasswordUseCase:
             await asyncio.to_thread(self.hasher.hash, new_password)
         )
 
-        # Обновляем пароль пользователя
+        # Обновляем пароль пользователя и в той же транзакции — эпоху токенов
         async with self.uow:
             await self.uow.users.set_password(user.id, password_hash.value)
+            epoch = await self.uow.users.bump_token_epoch(user.id)
             await self.uow.commit()
         self.logger.info("Пароль изменен в БД", user_id=user.id)
+        self.audit_log.record(
+            AuthEventType.PASSWORD_CHANGED, user_id=user.id, email=user.email.value
+        )
+        # все выданные ранее access-токены (включая текущий) больше не действуют;
+        # новая пара ниже выпускается уже с новой эпохой
+        await self.token_epochs.publish(user.id, epoch)
 
         # генерируем токены доступа и сохраняем refresh в редис
         (
             access_token,
             refresh_token,
-        ) = await self.authentication.authenticate_and_generate_tokens(user.id)
+        ) = await self.authentication.authenticate_and_generate_tokens(
+            user.id, extra_claims=principal_claims(user)
+        )
         self.logger.info("Сгенерированны токены", user_id=user.id)
 
         return AuthResponseDTO(access_token, refresh_token)
@@ -9,6 +9,7 @@ from src.application.interfaces import (
     AbstractVerificationCodeRepository,
     AbstractUnitOfWork,
     AbstractHasher,
+    RateLimitRule,
 )
 from src.domain.value_objects import Email
 
@@ -45,11 +46,17 @@ class ResendCodeChangePasswordUseCase:
             raise RequestExpiredError(str("Запрос истек. Начните сброс пароля заново"))
 
         # проверяем rate limit на отправвку email
-        created, seconds_left = await self.rate_limit_repo.check_and_set_cooldown(
-            email=email_vo.value, cooldown=self.resend_code_cooldown_seconds
+        decision = await self.rate_limit_repo.check_rules(
+            [
+                RateLimitRule.cooldown(
+                    name="email_cooldown",
+                    identifier=email_vo.value,
+                    cooldown_seconds=self.resend_code_cooldown_seconds,
+                ),
+            ]
         )
-        if not created:
-            raise CooldownEmailError(remaining_seconds=seconds_left)
+        if not decision.is_allowed:
+            raise CooldownEmailError(remaining_seconds=decision.retry_after)
 
         # Генерируем код верификации
         otp = str(secrets.randbelow(899000) + 100000)
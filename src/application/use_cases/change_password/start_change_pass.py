@@ -9,11 +9,14 @@ from src.application.exceptions import (
     UserNotFoundError,
 )
 from src.application.interfaces import (
+    AbstractEmailFilter,
     AbstractEmailSender,
     AbstractRateLimitRepository,
     AbstractVerificationCodeRepository,
-    AbstractUnitOfWork,
+    AbstractReadOnlyUnitOfWork,
     AbstractHasher,
+    RateLimitRule,
+    RateLimitRuleKind,
 )
 from src.domain.value_objects import Email
 
@@ -25,7 +28,8 @@ class StartChangePasswordUseCase:
         hasher: AbstractHasher,
         verification_code_repo: AbstractVerificationCodeRepository,
         email_sender: AbstractEmailSender,
-        uow: AbstractUnitOfWork,
+        email_filter: AbstractEmailFilter,
+        uow: AbstractReadOnlyUnitOfWork,
         verification_code_cfg: VerificationCodeConfig,
         rate_limit_cgf: RateLimitConfig,
     ):
@@ -33,6 +37,7 @@ class StartChangePasswordUseCase:
         self.hasher = hasher
         self.verification_code_repo = verification_code_repo
         self.email_sender = email_sender
+        self.email_filter = email_filter
         self.uow = uow
         self.reset_pass_limit = rate_limit_cgf.reset_pass_limit
         self.reset_pass_window_seconds = rate_limit_cgf.reset_pass_window_seconds
@@ -43,32 +48,42 @@ class StartChangePasswordUseCase:
     async def execute(self, email: str, background_tasks: BackgroundTasks) -> None:
         email_vo = Email.create(email)
 
-        # Проверка email
+        # Проверка email: точный промах фильтра — пользователя нет, в БД не идём
+        if not await self.email_filter.might_exist(email_vo.value):
+            raise UserNotFoundError(email=email_vo.value)
+
         async with self.uow:
             if not await self.uow.users.get_by_email(email_vo.value):
                 raise UserNotFoundError(email=email_vo.value)
 
-            await self.uow.commit()
-
-        # Rate limiting на количество попыток сброса пароля
-        is_allowed, _, _ = await self.rate_limit_repo.increment_and_check(
-            email=email_vo.value,
-            prefix="reset_pass",
-            limit_attempts=self.reset_pass_limit,
-            window_seconds=self.reset_pass_window_seconds,
+        # Rate limiting на количество попыток сброса пароля и кулдаун на отправку
+        # email за один round trip. Квота расходуется только если прошли оба правила
+        decision = await self.rate_limit_repo.check_rules(
+            [
+                RateLimitRule.window(
+                    name="reset_pass",
+                    prefix="reset_pass",
+                    identifier=email_vo.value,
+                    limit=self.reset_pass_limit,
+                    window_seconds=self.reset_pass_window_seconds,
+                ),
+                RateLimitRule.cooldown(
+                    name="email_cooldown",
+                    identifier=email_vo.value,
+                    cooldown_seconds=self.resend_code_cooldown_seconds,
+                ),
+            ]
         )
-        if not is_allowed:
+        if not decision.is_allowed:
+            if (
+                decision.violated_rule is not None
+                and decision.violated_rule.kind is RateLimitRuleKind.COOLDOWN
+            ):
+                raise CooldownEmailError(remaining_seconds=decision.retry_after)
             raise RateLimitExceededError(
                 "Слишком много попыток сброса пароля, повторите позже"
             )
 
-        # проверяем rate limit на отправвку email
-        created, seconds_left = await self.rate_limit_repo.check_and_set_cooldown(
-            email=email_vo.value, cooldown=self.resend_code_cooldown_seconds
-        )
-        if not created:
-            raise CooldownEmailError(remaining_seconds=seconds_left)
-
         # Генерируем код верификации
         otp = str(secrets.randbelow(899000) + 100000)
         # Отправляем код верификации на email пользователя
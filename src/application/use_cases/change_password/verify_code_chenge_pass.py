@@ -12,7 +12,7 @@ from src.application.exceptions import (
 from src.application.interfaces import (
     AbstractAuthenticationService,
     AbstractVerificationCodeRepository,
-    AbstractUnitOfWork,
+    AbstractReadOnlyUnitOfWork,
     AbstractHasher,
     AbstractJWTService,
 )
@@ -25,7 +25,7 @@ class VerifyCodeChangePasswordUseCase:
         hasher: AbstractHasher,
         verification_code_repo: AbstractVerificationCodeRepository,
         authentication: AbstractAuthenticationService,
-        uow: AbstractUnitOfWork,
+        uow: AbstractReadOnlyUnitOfWork,
         verification_code_cfg: VerificationCodeConfig,
         jwt: AbstractJWTService,
     ):
@@ -40,28 +40,23 @@ class VerifyCodeChangePasswordUseCase:
         email_vo = Email.create(input_dto.email)
         user_otp = input_dto.code
 
-        # получаем хеш отпрвленного кода для сравнения
-        user_data = await self.verification_code_repo.get_pending(email=email_vo.value)
+        # За один round trip: увеличиваем счётчик попыток и получаем хеш отправленного кода
+        attempt = await self.verification_code_repo.begin_attempt(
+            email_vo.value, limit_attempts=self.max_attempts
+        )
 
         # Проверяем наличие pending в редис
-        if user_data is None:
+        if attempt is None:
             raise RequestExpiredError("Запрос истек. Начните сброс пароля заново")
 
-        # уменьшаем количество попыток
-        (
-            is_allowed,
-            _,
-            remaining_attempts,
-        ) = await self.verification_code_repo.increment_and_check(
-            email_vo.value, limit_attempts=self.max_attempts
-        )
-
-        if not is_allowed:
+        if not attempt.is_allowed:
             # если попытки исчерпаны возвращаем ошибку (запрет на попытки)
             raise LimitCodeAttemptsError(
                 "Все попытки исчерпаны, начните сброс пароля заново или запросите новый код"
             )
 
+        user_data = attempt.data
+
         # Проверяем соответствие кода верификации
         check_code = await asyncio.to_thread(
             self.hasher.verify, user_otp, user_data.otp_hash
@@ -69,15 +64,17 @@ class VerifyCodeChangePasswordUseCase:
 
         if not check_code:
             # возвращаем ошибку что код не верный и указываем оставшиеся попытки
-            raise CodeAttemptError(remaining_attempts=remaining_attempts)
+            raise CodeAttemptError(remaining_attempts=attempt.remaining_attempts)
 
         # Если коды совпадают то выдаем временный токен доступа для сброса пароля
-        # очищаем редис
-        await self.verification_code_repo.delete_pending(email=email_vo.value)
+        # очищаем редис (код одноразовый: параллельный запрос с тем же кодом не пройдёт)
+        if not await self.verification_code_repo.consume_pending(
+            email=email_vo.value, otp_hash=user_data.otp_hash
+        ):
+            raise RequestExpiredError("Запрос истек. Начните сброс пароля заново")
 
         async with self.uow:
             user = await self.uow.users.get_by_email(email=email_vo.value)
-            await self.uow.commit()
 
         if not user:
             raise UserNotFoundError(email=email_vo.value)
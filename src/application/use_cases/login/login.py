@@ -1,12 +1,22 @@
 import asyncio
+from typing import Optional
+from uuid import UUID
 from src.application.interfaces import (
+    AbstractAuditLog,
+    AuthEventType,
+    AbstractEmailFilter,
     AbstractHasher,
-    AbstractUnitOfWork,
+    AbstractLoginTracker,
+    PrimaryReadOnlyUnitOfWork,
     AbstractAuthenticationService,
     AbstractRateLimitRepository,
 )
 from src.domain.value_objects import Email
-from src.application.dtos import AuthCredentialsDTO, AuthResponseDTO
+from src.application.dtos import (
+    AuthCredentialsDTO,
+    AuthResponseDTO,
+    principal_claims,
+)
 from src.core.settings import RateLimitConfig
 
 from src.application.exceptions import (
@@ -19,27 +29,40 @@ class LoginCodeUseCase:
     def __init__(
         self,
         hasher: AbstractHasher,
-        uow: AbstractUnitOfWork,
+        # primary: логин сразу после регистрации/смены пароля не должен
+        # упереться в отставание реплики
+        uow: PrimaryReadOnlyUnitOfWork,
         authentication: AbstractAuthenticationService,
         rate_limit_repo: AbstractRateLimitRepository,
         rate_limit_cgf: RateLimitConfig,
+        email_filter: AbstractEmailFilter,
+        login_tracker: AbstractLoginTracker,
+        audit_log: AbstractAuditLog,
     ):
         self.hasher = hasher
         self.uow = uow
         self.authentication = authentication
         self.login_limit = rate_limit_cgf.register_limit
         self.rate_limit_repo = rate_limit_repo
+        self.email_filter = email_filter
+        self.login_tracker = login_tracker
+        self.audit_log = audit_log
         self.login_window_seconds = rate_limit_cgf.register_window_seconds
 
     async def execute(self, input_dto: AuthCredentialsDTO) -> AuthResponseDTO:
         email_vo = Email.create(input_dto.email)
 
+        # точный промах фильтра — такого email нет, в БД не идём
+        if not await self.email_filter.might_exist(email_vo.value):
+            self._login_failed(email_vo.value, "unknown_email")
+            raise InvalidCredentialsError("Неверный логин или пароль")
+
         # ищем пользователя в БД
         async with self.uow:
             user = await self.uow.users.get_by_email(email_vo.value)
-            await self.uow.commit()
         # Если пользователь не найден (проверка email)
         if user is None:
+            self._login_failed(email_vo.value, "unknown_email")
             raise InvalidCredentialsError("Неверный логин или пароль")
 
         # Rate limiting
@@ -50,6 +73,7 @@ class LoginCodeUseCase:
             window_seconds=self.login_window_seconds,
         )
         if not is_allowed:
+            self._login_failed(email_vo.value, "rate_limited", user.id)
             raise RateLimitExceededError(
                 "Слишком много попыток авторизации, попробуйте позже"
             )
@@ -60,6 +84,7 @@ class LoginCodeUseCase:
         )
 
         if not result:
+            self._login_failed(email_vo.value, "invalid_password", user.id)
             raise InvalidCredentialsError("Неверный логин или пароль")
 
         # если все проверки пройдены
@@ -67,6 +92,24 @@ class LoginCodeUseCase:
         (
             access_token,
             refresh_token,
-        ) = await self.authentication.authenticate_and_generate_tokens(user.id)
+        ) = await self.authentication.authenticate_and_generate_tokens(
+            user.id, extra_claims=principal_claims(user)
+        )
+
+        # last_login_at пишется пачкой в фоне, не на горячем пути
+        self.login_tracker.record(user.id)
+        self.audit_log.record(
+            AuthEventType.LOGIN, user_id=user.id, email=email_vo.value
+        )
 
         return AuthResponseDTO(access_token, refresh_token)
+
+    def _login_failed(
+        self, email: str, reason: str, user_id: Optional[UUID] = None
+    ) -> None:
+        self.audit_log.record(
+            AuthEventType.LOGIN_FAILED,
+            user_id=user_id,
+            email=email,
+            details={"reason": reason},
+        )
@@ -1,18 +1,30 @@
 import structlog
+from typing import Optional
 from uuid import UUID
-from src.application.interfaces import AbstractRefreshTokenRepository
+from src.application.dtos import PrincipalDTO
+from src.application.interfaces import (
+    AbstractRefreshTokenRepository,
+    AbstractTokenDenylist,
+)
 
 
 class LogoutUseCase:
     def __init__(
         self,
         refresh_token_repo: AbstractRefreshTokenRepository,
+        denylist: AbstractTokenDenylist,
     ):
         self.refresh_token_repo = refresh_token_repo
+        self.denylist = denylist
         self.logger = structlog.get_logger(__name__)
 
-    async def execute(self, user_id: UUID) -> None:
+    async def execute(
+        self, user_id: UUID, principal: Optional[PrincipalDTO] = None
+    ) -> None:
         await self.refresh_token_repo.revoke_by_user_id(user_id=user_id)
+        # access-токен запроса перестаёт действовать сразу, а не по exp
+        if principal is not None and principal.jti and principal.expires_at:
+            await self.denylist.revoke(principal.jti, principal.expires_at)
         self.logger.info("Произведен Logout пользователя", user_id=user_id)
 
         return None
@@ -1,17 +1,22 @@
 import asyncio
-from uuid import uuid4
+from uuid import UUID, uuid4
+
+import structlog
 from src.core.settings import VerificationCodeConfig
-from src.application.dtos import VerifyCodeDTO, AuthResponseDTO
+from src.application.dtos import VerifyCodeDTO, AuthResponseDTO, principal_claims
 from src.application.interfaces import (
     AbstractHasher,
     AbstractVerificationCodeRepository,
     AbstractAuthenticationService,
+    AbstractEmailFilter,
+    AbstractRefreshTokenRepository,
     AbstractUnitOfWork,
 )
 from src.domain.entities.user import User
 from src.domain.value_objects import Email, HashedPassword
 
 from src.application.exceptions import (
+    EmailAlreadyExistsError,
     LimitCodeAttemptsError,
     CodeAttemptError,
     RequestExpiredError,
@@ -24,41 +29,41 @@ class FinishRegistrationUseCase:
         hasher: AbstractHasher,
         verification_code_repo: AbstractVerificationCodeRepository,
         authentication: AbstractAuthenticationService,
+        refresh_token_repo: AbstractRefreshTokenRepository,
+        email_filter: AbstractEmailFilter,
         uow: AbstractUnitOfWork,
         verification_code_cfg: VerificationCodeConfig,
     ):
         self.hasher = hasher
         self.verification_code_repo = verification_code_repo
         self.authentication = authentication
+        self.refresh_token_repo = refresh_token_repo
+        self.email_filter = email_filter
         self.uow = uow
         self.max_attempts = verification_code_cfg.max_attempts
+        self.logger = structlog.get_logger(__name__)
 
     async def execute(self, input_dto: VerifyCodeDTO) -> tuple[AuthResponseDTO, str]:
         email_vo = Email.create(input_dto.email)
         user_otp = input_dto.code
 
-        # получаем хеш отпрвленного кода для сравнения
-        user_data = await self.verification_code_repo.get_pending(email=email_vo.value)
+        # За один round trip: увеличиваем счётчик попыток и получаем хеш отправленного кода
+        attempt = await self.verification_code_repo.begin_attempt(
+            email_vo.value, limit_attempts=self.max_attempts
+        )
 
         # Проверяем наличие pending registration в редис
-        if user_data is None:
+        if attempt is None:
             raise RequestExpiredError("Запрос истек. Начните регистрацию заново")
 
-        # уменьшаем количество попыток
-        (
-            is_allowed,
-            _,
-            remaining_attempts,
-        ) = await self.verification_code_repo.increment_and_check(
-            email_vo.value, limit_attempts=self.max_attempts
-        )
-
-        if not is_allowed:
+        if not attempt.is_allowed:
             # если попытки исчерпаны возвращаем ошибку (запрет на попытки)
             raise LimitCodeAttemptsError(
                 "Все попытки исчерпаны, начните регистрацию заново или запросите новый код"
             )
 
+        user_data = attempt.data
+
         # Проверяем соответствие кода верификации
         check_code = await asyncio.to_thread(
             self.hasher.verify, user_otp, user_data.otp_hash
@@ -66,7 +71,7 @@ class FinishRegistrationUseCase:
 
         if not check_code:
             # возвращаем ошибку что код не верный и указываем оставшиеся попытки
-            raise CodeAttemptError(remaining_attempts=remaining_attempts)
+            raise CodeAttemptError(remaining_attempts=attempt.remaining_attempts)
 
         # Если коды совпадают то добавляем пользователя в бд и возвращаем токены
         user = User(
@@ -76,18 +81,61 @@ class FinishRegistrationUseCase:
             is_active=True,
             email_verified=True,
         )
+        # В фильтр — до вставки: лишняя запись при неудачной вставке безопасна,
+        # а пропуск email после коммита дал бы ложный отказ при логине
+        await self.email_filter.add(email_vo.value)
+
+        # Транзакция покрывает только вставку: соединение возвращается в пул
+        # сразу после commit, а не держится на время подписи JWT и походов в Redis
         async with self.uow:
-            await self.uow.users.add(user)
+            # уникальность email проверяется самой вставкой (ON CONFLICT DO NOTHING)
+            if not await self.uow.users.add_if_absent(user):
+                raise EmailAlreadyExistsError(email=email_vo.value)
+            await self.uow.commit()
 
-            # генерируем токены доступа и сохраняем refresh в редис
+        # генерируем токены доступа и сохраняем refresh в редис
+        try:
             (
                 access_token,
                 refresh_token,
-            ) = await self.authentication.authenticate_and_generate_tokens(user.id)
-
-            # очищаем редис
-            await self.verification_code_repo.delete_pending(email=email_vo.value)
+            ) = await self.authentication.authenticate_and_generate_tokens(
+                user.id, extra_claims=principal_claims(user)
+            )
+        except Exception:
+            # pending данные не тронуты — пользователь может повторить ввод кода
+            await self._compensate(user.id)
+            raise
 
-            await self.uow.commit()
+        # очищаем редис (только если код не был перевыпущен параллельно)
+        try:
+            consumed = await self.verification_code_repo.consume_pending(
+                email=email_vo.value, otp_hash=user_data.otp_hash
+            )
+        except Exception:
+            # ошибка Redis: pending не удалён — код можно ввести снова
+            await self._compensate(user.id, revoke_session=True)
+            raise
+        if not consumed:
+            await self._compensate(user.id, revoke_session=True)
+            raise RequestExpiredError("Запрос истек. Начните регистрацию заново")
 
         return AuthResponseDTO(access_token, refresh_token), str(user.id)
+
+    async def _compensate(self, user_id: UUID, revoke_session: bool = False) -> None:
+        """Откатывает уже закоммиченную регистрацию, если шаги после commit не прошли"""
+        # сначала БД: компенсация обычно идёт из-за недоступного Redis, и отзыв
+        # сессии тоже упадёт — email при этом не должен остаться занятым
+        async with self.uow:
+            await self.uow.users.delete(user_id)
+            await self.uow.commit()
+        if not revoke_session:
+            return
+        try:
+            await self.refresh_token_repo.revoke_by_user_id(user_id)
+        except Exception as e:
+            # пользователя уже нет — refresh по такой сессии не выпустит токены
+            self.logger.error(
+                "Не удалось отозвать сессию удалённого пользователя",
+                user_id=str(user_id),
+                error=str(e),
+            )
@@ -10,11 +10,14 @@ from src.application.exceptions import (
     CooldownEmailError,
 )
 from src.application.interfaces import (
+    AbstractEmailFilter,
     AbstractEmailSender,
     AbstractHasher,
     AbstractRateLimitRepository,
     AbstractVerificationCodeRepository,
-    AbstractUnitOfWork,
+    AbstractReadOnlyUnitOfWork,
+    RateLimitRule,
+    RateLimitRuleKind,
 )
 from src.domain.value_objects import Email, HashedPassword
 
@@ -26,7 +29,8 @@ class InitiateRegistrationUseCase:
         rate_limit_repo: AbstractRateLimitRepository,
         verification_code_repo: AbstractVerificationCodeRepository,
         email_sender: AbstractEmailSender,
-        uow: AbstractUnitOfWork,
+        email_filter: AbstractEmailFilter,
+        uow: AbstractReadOnlyUnitOfWork,
         verification_code_cfg: VerificationCodeConfig,
         rate_limit_cgf: RateLimitConfig,
     ):
@@ -34,6 +38,7 @@ class InitiateRegistrationUseCase:
         self.rate_limit_repo = rate_limit_repo
         self.verification_code_repo = verification_code_repo
         self.email_sender = email_sender
+        self.email_filter = email_filter
         self.uow = uow
         self.register_limit = rate_limit_cgf.register_limit
         self.register_window_seconds = rate_limit_cgf.register_window_seconds
@@ -50,32 +55,40 @@ class InitiateRegistrationUseCase:
             await asyncio.to_thread(self.hasher.hash, input_dto.password)
         )
 
-        # Проверка уникальности email
-        async with self.uow:
-            if await self.uow.users.get_by_email(email_vo.value):
-                raise EmailAlreadyExistsError(email=email_vo.value)
+        # Проверка уникальности email: точный промах фильтра — в БД не идём
+        if await self.email_filter.might_exist(email_vo.value):
+            async with self.uow:
+                if await self.uow.users.get_by_email(email_vo.value):
+                    raise EmailAlreadyExistsError(email=email_vo.value)
 
-            await self.uow.commit()
-
-        # Rate limiting
-        is_allowed, _, _ = await self.rate_limit_repo.increment_and_check(
-            email=email_vo.value,
-            prefix="register",
-            limit_attempts=self.register_limit,
-            window_seconds=self.register_window_seconds,
+        # Rate limiting на регистрацию и кулдаун на отправку email за один round trip.
+        # Квота расходуется только если прошли оба правила
+        decision = await self.rate_limit_repo.check_rules(
+            [
+                RateLimitRule.window(
+                    name="register",
+                    prefix="register",
+                    identifier=email_vo.value,
+                    limit=self.register_limit,
+                    window_seconds=self.register_window_seconds,
+                ),
+                RateLimitRule.cooldown(
+                    name="email_cooldown",
+                    identifier=email_vo.value,
+                    cooldown_seconds=self.resend_code_cooldown_seconds,
+                ),
+            ]
         )
-        if not is_allowed:
+        if not decision.is_allowed:
+            if (
+                decision.violated_rule is not None
+                and decision.violated_rule.kind is RateLimitRuleKind.COOLDOWN
+            ):
+                raise CooldownEmailError(remaining_seconds=decision.retry_after)
             raise RateLimitExceededError(
                 "Слишком много попыток регистрации, повторите через час"
             )
 
-        # проверяем rate limit на отправвку email
-        created, seconds_left = await self.rate_limit_repo.check_and_set_cooldown(
-            email=email_vo.value, cooldown=self.resend_code_cooldown_seconds
-        )
-        if not created:
-            raise CooldownEmailError(remaining_seconds=seconds_left)
-
         # Генерируем код верификации
         otp = str(secrets.randbelow(899000) + 100000)
         # Отправляем код верификации на email пользователя
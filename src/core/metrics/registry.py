@@ -0,0 +1,56 @@
+from collections import defaultdict
+from typing import Any, Dict
+
+
+class _Summary:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "avg": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """
+    Простейший in-process реестр метрик (счётчики и сводки count/sum/max).
+    Один экземпляр на воркер, значения отдаются через /metrics.
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._summaries: Dict[str, _Summary] = defaultdict(_Summary)
+
+    def inc(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def get(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def observe(self, name: str, value: float) -> None:
+        self._summaries[name].observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(self._counters),
+            "summaries": {
+                name: summary.as_dict() for name, summary in self._summaries.items()
+            },
+        }
+
+
+metrics = MetricsRegistry()
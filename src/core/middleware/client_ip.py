@@ -0,0 +1,56 @@
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+from typing import Iterable, List, Sequence, Union
+
+from starlette.types import Scope
+
+IPNetwork = Union[IPv4Network, IPv6Network]
+
+
+def parse_trusted_proxies(values: Iterable[str]) -> List[IPNetwork]:
+    """Переводит список IP/CIDR из настроек в сети (один раз при старте)"""
+    return [ip_network(value.strip(), strict=False) for value in values if value]
+
+
+def _is_trusted(host: str, trusted: Sequence[IPNetwork]) -> bool:
+    try:
+        addr = ip_address(host)
+    except ValueError:
+        return False
+    return any(addr in network for network in trusted)
+
+
+def _get_header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def get_client_ip(scope: Scope, trusted: Sequence[IPNetwork]) -> str:
+    """
+    IP клиента из ASGI scope.
+
+    Заголовкам прокси верим только если непосредственный собеседник — доверенный прокси.
+    X-Forwarded-For разбираем справа налево и берём первый адрес,
+    который не принадлежит доверенным прокси (левые значения клиент может подделать).
+    """
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+
+    if not trusted or not _is_trusted(peer, trusted):
+        return peer
+
+    forwarded_for = _get_header(scope, b"x-forwarded-for")
+    if forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted(hop, trusted):
+                return hop
+        if hops:
+            return hops[0]
+
+    real_ip = _get_header(scope, b"x-real-ip")
+    if real_ip:
+        return real_ip.strip()
+
+    return peer
@@ -0,0 +1,50 @@
+from typing import List
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.metrics.registry import metrics
+from src.core.middleware.client_ip import get_client_ip, parse_trusted_proxies
+from src.core.middleware.rate_limit_response import send_rate_limited
+from src.core.rate_limit.token_bucket import TokenBucketLimiter
+
+
+class LocalRateLimitMiddleware:
+    """
+    Чистый ASGI middleware: локальный token bucket на IP клиента.
+    Отсекает явный флуд ещё до логирования, роутинга, DI и походов в Redis/БД.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        capacity: int,
+        refill_per_second: float,
+        max_entries: int,
+        trusted_proxies: List[str],
+    ) -> None:
+        self.app = app
+        self.bucket = TokenBucketLimiter(
+            capacity=capacity,
+            refill_per_second=refill_per_second,
+            max_entries=max_entries,
+        )
+        self.trusted_proxies = parse_trusted_proxies(trusted_proxies)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client_ip = get_client_ip(scope, self.trusted_proxies)
+
+        if self.bucket.try_acquire(client_ip):
+            metrics.inc("rate_limit.local.ip.passed")
+            await self.app(scope, receive, send)
+            return
+
+        metrics.inc("rate_limit.local.ip.shed")
+        await send_rate_limited(
+            send,
+            retry_after=self.bucket.retry_after(client_ip),
+            message="Слишком много запросов, попробуйте позже",
+        )
@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional
+
+import structlog
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.application.interfaces import (
+    AbstractRateLimitRepository,
+    RateLimitRule,
+    SharedRateLimitRepository,
+)
+from src.core.metrics.registry import metrics
+from src.core.middleware.client_ip import get_client_ip, parse_trusted_proxies
+from src.core.middleware.rate_limit_response import send_rate_limited
+
+
+class RateLimitMiddleware:
+    """
+    Чистый ASGI middleware: лимиты по IP клиента, по маршруту и глобальный.
+
+    Работает до роутинга, DI request-scope, валидации и LoggingMiddleware.
+    Все правила проверяются одним скриптом в Redis (check_rules),
+    квота расходуется только если прошли все правила.
+    При недоступности Redis пропускает запрос (fail-open) — лимиты
+    use case'ов остаются последней линией защиты.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        ip_limit: int,
+        ip_window_seconds: int,
+        route_limits: Dict[str, int],
+        route_window_seconds: int,
+        global_limit: int,
+        global_window_seconds: int,
+        trusted_proxies: List[str],
+        exempt_paths: List[str],
+    ) -> None:
+        self.app = app
+        self.ip_limit = ip_limit
+        self.ip_window_seconds = ip_window_seconds
+        self.route_limits = route_limits
+        self.route_window_seconds = route_window_seconds
+        self.global_limit = global_limit
+        self.global_window_seconds = global_window_seconds
+        self.trusted_proxies = parse_trusted_proxies(trusted_proxies)
+        self.exempt_paths = frozenset(exempt_paths)
+        self._repo: Optional[AbstractRateLimitRepository] = None
+        self.logger = structlog.get_logger(__name__)
+
+    async def _get_repo(self, scope: Scope) -> AbstractRateLimitRepository:
+        if self._repo is None:
+            # Берём именно Redis-лимитер (без локального pre-filter на ключ):
+            # IP и глобальные ключи не должны упираться в маленькое ведро ключа
+            container = scope["app"].state.dishka_container
+            self._repo = await container.get(SharedRateLimitRepository)
+        return self._repo
+
+    def _build_rules(self, path: str, client_ip: str) -> List[RateLimitRule]:
+        rules: List[RateLimitRule] = []
+
+        route_limit = self.route_limits.get(path)
+        if route_limit:
+            rules.append(
+                RateLimitRule.window(
+                    name="route",
+                    prefix=f"rl_route:{path}",
+                    identifier=client_ip,
+                    limit=route_limit,
+                    window_seconds=self.route_window_seconds,
+                )
+            )
+
+        if self.ip_limit:
+            rules.append(
+                RateLimitRule.window(
+                    name="ip",
+                    prefix="rl_ip",
+                    identifier=client_ip,
+                    limit=self.ip_limit,
+                    window_seconds=self.ip_window_seconds,
+                )
+            )
+
+        if self.global_limit:
+            rules.append(
+                RateLimitRule.window(
+                    name="global",
+                    prefix="rl_global",
+                    identifier="all",
+                    limit=self.global_limit,
+                    window_seconds=self.global_window_seconds,
+                )
+            )
+
+        return rules
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client_ip = get_client_ip(scope, self.trusted_proxies)
+        rules = self._build_rules(scope["path"], client_ip)
+
+        try:
+            repo = await self._get_repo(scope)
+            decision = await repo.check_rules(rules)
+        except Exception as exc:
+            metrics.inc("rate_limit.ip.errors")
+            self.logger.warning("Rate limit middleware недоступен", error=str(exc))
+            await self.app(scope, receive, send)
+            return
+
+        if decision.is_allowed:
+            metrics.inc("rate_limit.ip.passed")
+            await self.app(scope, receive, send)
+            return
+
+        rule_name = decision.violated_rule.name if decision.violated_rule else "unknown"
+        metrics.inc(f"rate_limit.ip.rejected.{rule_name}")
+        await send_rate_limited(
+            send,
+            retry_after=decision.retry_after,
+            message="Слишком много запросов, попробуйте позже",
+        )
@@ -0,0 +1,27 @@
+import json
+
+from starlette.types import Send
+
+
+async def send_rate_limited(send: Send, retry_after: int, message: str) -> None:
+    """
+    Отдаёт 429 напрямую через ASGI send — без Request/Response объектов,
+    роутинга, DI и валидации.
+    """
+    body = json.dumps(
+        {"error": "RateLimitExceeded", "message": message},
+        ensure_ascii=False,
+    ).encode()
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,83 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence
+
+
+class TokenBucketLimiter:
+    """
+    Локальный (in-process) token bucket на ключ.
+
+    Состояние хранится в ограниченном LRU: при переполнении вытесняется
+    самый давно не использованный ключ (он просто начнёт с полного ведра).
+    Не заменяет Redis-лимитер, а лишь отсекает явный флуд до похода в Redis/БД.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.max_entries = max_entries
+        self._clock = clock
+        # key -> [tokens, last_refill_ts]
+        self._buckets: "OrderedDict[str, list[float]]" = OrderedDict()
+
+    def _refill(self, key: str) -> list[float]:
+        now = self._clock()
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = [self.capacity, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            return bucket
+
+        self._buckets.move_to_end(key)
+        elapsed = now - bucket[1]
+        if elapsed > 0:
+            bucket[0] = min(self.capacity, bucket[0] + elapsed * self.refill_per_second)
+            bucket[1] = now
+        return bucket
+
+    def try_acquire(self, key: str, cost: float = 1.0) -> bool:
+        """Забирает cost токенов, если они есть. False — запрос нужно отбросить"""
+        bucket = self._refill(key)
+        if bucket[0] < cost:
+            return False
+        bucket[0] -= cost
+        return True
+
+    def try_acquire_all(self, keys: Sequence[str], cost: float = 1.0) -> Optional[str]:
+        """
+        Забирает cost токенов из каждого ведра, только если хватает во всех.
+        Возвращает первый ключ без токенов (ничего не списано) или None.
+        """
+        needed: Dict[str, float] = {}
+        for key in keys:
+            needed[key] = needed.get(key, 0.0) + cost
+
+        buckets = {key: self._refill(key) for key in needed}
+        for key, amount in needed.items():
+            if buckets[key][0] < amount:
+                return key
+
+        for key, amount in needed.items():
+            buckets[key][0] -= amount
+        return None
+
+    def retry_after(self, key: str, cost: float = 1.0) -> int:
+        """Через сколько секунд в ведре появится cost токенов"""
+        bucket = self._refill(key)
+        missing = cost - bucket[0]
+        if missing <= 0 or self.refill_per_second <= 0:
+            return 0
+        return max(1, math.ceil(missing / self.refill_per_second))
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -1,5 +1,7 @@
+from .admin import AdminSettings
+from .audit import AuditLogConfig
 from .database import DatabaseSettings
-from .rate_limit import RateLimitConfig
+from .rate_limit import RateLimitConfig, LocalRateLimitConfig, IpRateLimitConfig
 from .redis import RedisSettings
 from .verification_code import VerificationCodeConfig
 from .jwt import JwtSettings
@@ -9,8 +11,12 @@ from .rabbit import RabbitSettings
 
 
 __all__ = [
+    "AdminSettings",
+    "AuditLogConfig",
     "DatabaseSettings",
     "RateLimitConfig",
+    "LocalRateLimitConfig",
+    "IpRateLimitConfig",
     "RedisSettings",
     "VerificationCodeConfig",
     "JwtSettings",
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from pydantic import SecretStr
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AdminSettings(BaseSettings):
+    """Админский API (/api/v1/admin) и /metrics"""
+
+    # значение заголовка X-Admin-Token; пока не задано — админский API выключен
+    api_token: Optional[SecretStr] = None
+    # размер страницы поиска пользователей
+    search_default_limit: int = 50
+    search_max_limit: int = 200
+
+    model_config = SettingsConfigDict(
+        env_prefix="ADMIN__", case_sensitive=False, extra="ignore"
+    )
@@ -0,0 +1,16 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AuditLogConfig(BaseSettings):
+    """Буферизованная запись событий аутентификации в auth_events"""
+
+    enabled: bool = True
+    # период сброса буфера и размер пачки, при котором сброс идёт раньше
+    flush_interval: float = 2.0
+    batch_size: int = 1_000
+    # верхняя граница буфера: сверх неё события отбрасываются (запрос не ждёт БД)
+    max_buffer: int = 50_000
+
+    model_config = SettingsConfigDict(
+        env_prefix="AUDIT__", case_sensitive=False, extra="ignore"
+    )
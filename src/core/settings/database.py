@@ -1,5 +1,14 @@
+from typing import List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import PostgresDsn, SecretStr
+from pydantic import BaseModel, PostgresDsn, SecretStr
+
+
+class ReplicaSettings(BaseModel):
+    """Реплика для чтения. weight — доля трафика в weighted round-robin."""
+
+    dsn: str
+    weight: int = 1
 
 
 class DatabaseSettings(BaseSettings):
@@ -13,6 +22,33 @@ class DatabaseSettings(BaseSettings):
     max_overflow: int
     echo: bool
 
+    # Кеш prepared statements asyncpg/SQLAlchemy (на соединение), 0 — выключен.
+    # pgbouncer_mode: для PgBouncer в transaction mode — кеши выключены,
+    # имена statements уникальны
+    statement_cache_size: int = 100
+    pgbouncer_mode: bool = False
+
+    # Буфер last_login_at: период сброса и размер, при котором сброс идёт раньше
+    last_login_flush_interval: float = 5.0
+    last_login_max_pending: int = 10_000
+
+    # pre_ping — SELECT 1 на каждый checkout; по умолчанию вместо него фоновая
+    # проверка живости раз в pool_liveness_check_interval секунд (0 — выключена)
+    pool_pre_ping: bool = False
+    pool_liveness_check_interval: float = 15.0
+    pool_liveness_check_timeout: float = 2.0
+
+    # Реплики для read-only UoW, JSON: POSTGRES_REPLICAS='[{"dsn": "...", "weight": 2}]'
+    # Пустой список — все чтения идут в primary
+    replicas: List[ReplicaSettings] = []
+    replica_pool_size: int = 5
+    replica_max_overflow: int = 5
+    replica_health_check_interval: float = 5.0
+    replica_health_check_timeout: float = 2.0
+    # реплика с отставанием больше этого (секунды) выводится из ротации;
+    # 0 — не проверять
+    replica_max_lag_seconds: float = 5.0
+
     model_config = SettingsConfigDict(
         env_prefix="POSTGRES_", case_sensitive=False, extra="ignore"
     )
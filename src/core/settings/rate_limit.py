@@ -1,3 +1,6 @@
+from typing import Dict, List
+
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -20,3 +23,60 @@ class RateLimitConfig(BaseSettings):
     model_config = SettingsConfigDict(
         env_prefix="RATE_LIMIT__", case_sensitive=False, extra="ignore"
     )
+
+
+class LocalRateLimitConfig(BaseSettings):
+    """
+    Локальный token bucket перед Redis-лимитером (в каждом воркере свой).
+    По умолчанию выключен.
+    """
+
+    enabled: bool = False
+
+    # ведро на ключ лимита (email + prefix)
+    key_capacity: int = 20
+    key_refill_per_second: float = 1.0
+
+    # ведро на IP клиента
+    ip_capacity: int = 60
+    ip_refill_per_second: float = 10.0
+
+    # максимум ключей в LRU (на каждое из вёдер)
+    max_entries: int = 10_000
+
+    model_config = SettingsConfigDict(
+        env_prefix="RATE_LIMIT_LOCAL__", case_sensitive=False, extra="ignore"
+    )
+
+
+class IpRateLimitConfig(BaseSettings):
+    """
+    Rate limiting на уровне ASGI (до роутинга): по IP клиента, по маршруту и глобально.
+    Использует тот же Redis, что и лимитер use case'ов. По умолчанию выключен.
+    """
+
+    enabled: bool = False
+
+    # Прокси, которым доверяем X-Forwarded-For / X-Real-IP (IP или CIDR)
+    trusted_proxies: List[str] = Field(default_factory=list)
+
+    # Лимит на IP по всем маршрутам
+    ip_limit: int = 300
+    ip_window_seconds: int = 60
+
+    # Лимит на IP для конкретных путей: {"/api/v1/auth/login": 20}
+    route_limits: Dict[str, int] = Field(default_factory=dict)
+    route_window_seconds: int = 60
+
+    # Глобальный лимит на все запросы (0 — выключен)
+    global_limit: int = 0
+    global_window_seconds: int = 1
+
+    # Пути без лимитов
+    exempt_paths: List[str] = Field(
+        default_factory=lambda: ["/metrics", "/.well-known/jwks.json"]
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="RATE_LIMIT_IP__", case_sensitive=False, extra="ignore"
+    )
@@ -1,5 +1,25 @@
+from typing import List, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import SecretStr
+from pydantic import BaseModel, Field, SecretStr
+
+
+class RedisPoolSettings(BaseModel):
+    """
+    Настройки отдельного пула подсистемы (rate limit / коды / сессии).
+    host/port/db позволяют вынести подсистему в отдельную БД или инстанс Redis,
+    по умолчанию берутся из общих настроек.
+    """
+
+    host: Optional[str] = None
+    port: Optional[int] = None
+    db: Optional[str] = None
+
+    max_connections: Optional[int] = None
+    socket_timeout: float = 5.0
+    socket_connect_timeout: float = 5.0
+    # сколько ждать свободное соединение из пула
+    pool_timeout: float = 5.0
 
 
 class RedisSettings(BaseSettings):
@@ -9,11 +29,67 @@ class RedisSettings(BaseSettings):
     password: SecretStr
     max_connections: int
 
+    # Формат значений в caching-репозиториях: json / orjson / msgpack
+    serializer: str = "json"
+
+    # Client-side cache (CLIENT TRACKING + инвалидация от сервера), по умолчанию выключен
+    client_cache_enabled: bool = False
+    client_cache_prefixes: List[str] = Field(default_factory=lambda: ["pending_reg:"])
+    client_cache_max_entries: int = 10_000
+    # страховочный TTL локальной записи
+    client_cache_ttl_seconds: float = 60.0
+    # доля попаданий, которые сверяются с Redis (метрика stale_hits)
+    client_cache_verify_sample_rate: float = 0.0
+
+    # Bloom filter зарегистрированных email: быстрый отказ по неизвестным email
+    # без запроса в БД. backend: auto (BF.* если есть RedisBloom, иначе bitmap) / bloom / bitmap
+    email_filter_enabled: bool = True
+    email_filter_backend: str = "auto"
+    email_filter_capacity: int = 1_000_000
+    email_filter_error_rate: float = 0.001
+    # фильтр перестраивается из users не реже чем раз в столько секунд
+    # (подхватывает вставки в обход регистрации)
+    email_filter_rebuild_seconds: int = 86_400
+    # как часто проверяется, что фильтр есть в Redis (иначе — перестроение)
+    email_filter_check_interval: float = 60.0
+
+    # Шина инвалидации локальных кешей между воркерами (pub/sub канал)
+    invalidation_channel: str = "cache_invalidation"
+
+    # Кеш пользователей по id (get_current_user): L1 в процессе + L2 в Redis
+    user_cache_enabled: bool = True
+    user_cache_local_max_entries: int = 10_000
+    user_cache_local_ttl_seconds: float = 30.0
+    user_cache_redis_ttl_seconds: int = 300
+    # после инвалидации ключ не заполняется заново столько секунд
+    user_cache_tombstone_seconds: float = 5.0
+
+    # Денайлист отозванных access-токенов (реплика в памяти воркера)
+    token_denylist_enabled: bool = True
+    # как часто из реплики вычищаются истёкшие jti
+    token_denylist_prune_interval: float = 60.0
+
+    # Эпоха токенов (отзыв всех access-токенов пользователя): копия в Redis + L1
+    token_epoch_local_max_entries: int = 100_000
+    token_epoch_local_ttl_seconds: float = 60.0
+    token_epoch_redis_ttl_seconds: int = 86_400
+
+    # Пулы подсистем: REDIS_RATE_LIMIT__MAX_CONNECTIONS=50 и т.д.
+    rate_limit: RedisPoolSettings = Field(default_factory=RedisPoolSettings)
+    verification: RedisPoolSettings = Field(default_factory=RedisPoolSettings)
+    sessions: RedisPoolSettings = Field(default_factory=RedisPoolSettings)
+
     model_config = SettingsConfigDict(
-        env_prefix="REDIS_", case_sensitive=False, extra="ignore"
+        env_prefix="REDIS_",
+        env_nested_delimiter="__",
+        case_sensitive=False,
+        extra="ignore",
     )
 
-    def get_url(self) -> str:
+    def get_url(self, pool: Optional[RedisPoolSettings] = None) -> str:
         # password = f"{self.password.get_secret_value()}"
         # return f"redis://:{password}@{self.host}:{self.port}/{self.db}"
-        return f"redis://{self.host}:{self.port}/{self.db}"
+        host = (pool.host if pool else None) or self.host
+        port = (pool.port if pool else None) or self.port
+        db = (pool.db if pool else None) or self.db
+        return f"redis://{host}:{port}/{db}"
@@ -22,6 +22,9 @@ class User:
 
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    last_login_at: Optional[datetime] = None
 
     is_active: bool = True
     email_verified: bool = False
+    # растёт при отзыве всех токенов пользователя (смена пароля)
+    token_epoch: int = 0
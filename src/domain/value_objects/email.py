@@ -32,5 +32,16 @@ class Email:
         """Фабричный метод — удобен для use cases"""
         return cls(raw_email)
 
+    @classmethod
+    def from_trusted(cls, value: str) -> "Email":
+        """
+        Создаёт VO без повторной валидации.
+        Только для значений, которые уже прошли Email.create (например, загруженных из БД) —
+        validate_email заметно дороже самого запроса на горячем пути чтения.
+        """
+        email = object.__new__(cls)
+        object.__setattr__(email, "value", value)
+        return email
+
     def __str__(self) -> str:
         return self.value
@@ -0,0 +1,211 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+import structlog
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.asyncio.connection import Connection
+
+from src.core.metrics.registry import metrics
+
+T = TypeVar("T")
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+
+class RedisClientSideCache:
+    """
+    Локальный (in-process) кеш чтений из Redis с инвалидацией со стороны сервера.
+
+    Схема (CLIENT TRACKING в режиме BCAST + REDIRECT):
+      • отдельное pub/sub соединение подписано на __redis__:invalidate;
+      • отдельное «трекинг» соединение включает CLIENT TRACKING ... BCAST PREFIX ...
+        с redirect на pub/sub соединение;
+      • при любой записи в ключ с нужным префиксом Redis присылает имя ключа,
+        и запись вытесняется из локального LRU.
+
+    В BCAST режиме сервер шлёт инвалидации независимо от того, через какое соединение
+    читали, поэтому обычные чтения идут через общий пул.
+    Пока слушатель не подключён (старт, обрыв, переподключение) — кеш не используется.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        prefixes: List[str],
+        max_entries: int,
+        ttl_seconds: float,
+        verify_sample_rate: float = 0.0,
+        enabled: bool = True,
+    ) -> None:
+        self.redis = redis
+        self.prefixes = prefixes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.verify_sample_rate = verify_sample_rate
+        self.enabled = enabled
+
+        # key -> (value, stored_at)
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # растёт на каждую инвалидацию: значение, загруженное «во время» инвалидации,
+        # в кеш не кладём (иначе можно закешировать уже устаревшее)
+        self._epoch = 0
+        self._healthy = False
+
+        self._pubsub: Optional[PubSub] = None
+        self._tracking_conn: Optional[Connection] = None
+        self._listener: Optional[asyncio.Task] = None
+        self.logger = structlog.get_logger(__name__)
+
+    # ─── lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        if not self.enabled or self._listener is not None:
+            return
+        self._listener = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._disconnect()
+
+    async def _connect(self) -> None:
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.connect()
+
+        # id pub/sub соединения нужен для REDIRECT — узнаём до SUBSCRIBE
+        pubsub_conn = self._pubsub.connection
+        assert pubsub_conn is not None
+        await pubsub_conn.send_command("CLIENT", "ID")
+        client_id = await pubsub_conn.read_response()
+        await self._pubsub.subscribe(INVALIDATE_CHANNEL)
+
+        # отдельное соединение вне пула: с включённым трекингом оно не должно
+        # попасть к обычным командам и не занимает слот пула
+        tracking_conn = self.redis.connection_pool.make_connection()
+        self._tracking_conn = tracking_conn
+        await tracking_conn.connect()
+        args: List[Any] = ["CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST"]
+        for prefix in self.prefixes:
+            args.extend(("PREFIX", prefix))
+        await tracking_conn.send_command(*args)
+        await tracking_conn.read_response()
+
+    async def _disconnect(self) -> None:
+        self._healthy = False
+        self.clear()
+
+        if self._tracking_conn is not None:
+            # соединение не из пула — просто закрываем, трекинг умирает вместе с ним
+            await self._tracking_conn.disconnect()
+            self._tracking_conn = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _ping_tracking(self) -> None:
+        # трекинг живёт, пока живо соединение, на котором он включён
+        assert self._tracking_conn is not None
+        await self._tracking_conn.send_command("PING")
+        await self._tracking_conn.read_response()
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                await self._connect()
+                self._healthy = True
+                backoff = 0.5
+                self.logger.info("Client-side cache подключён", prefixes=self.prefixes)
+
+                assert self._pubsub is not None
+                while True:
+                    message = await self._pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=5.0
+                    )
+                    if message is None:
+                        await self._ping_tracking()
+                        continue
+                    self._handle_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                metrics.inc("redis.client_cache.disconnects")
+                self.logger.warning("Client-side cache отключён", error=str(exc))
+                await self._disconnect()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _handle_invalidation(self, keys: Any) -> None:
+        self._epoch += 1
+
+        # None — FLUSHDB/FLUSHALL: сбрасываем всё
+        if keys is None:
+            self.clear()
+            metrics.inc("redis.client_cache.flushes")
+            return
+
+        if isinstance(keys, (bytes, str)):
+            keys = [keys]
+
+        for key in keys:
+            name = key.decode() if isinstance(key, bytes) else key
+            if self._entries.pop(name, None) is not None:
+                metrics.inc("redis.client_cache.invalidations")
+
+    # ─── cache API ────────────────────────────────────────────────────────────
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def invalidate(self, key: str) -> None:
+        """Локальная инвалидация (свои записи не ждут ответа от Redis)"""
+        self._epoch += 1
+        self._entries.pop(key, None)
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[Optional[T]]]
+    ) -> Optional[T]:
+        if not self._healthy:
+            return await loader()
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[1] < self.ttl_seconds:
+            self._entries.move_to_end(key)
+            metrics.inc("redis.client_cache.hits")
+
+            # выборочно сверяем с Redis — так измеряется доля устаревших попаданий
+            if self.verify_sample_rate and random.random() < self.verify_sample_rate:
+                metrics.inc("redis.client_cache.verified")
+                fresh = await loader()
+                if fresh != entry[0]:
+                    metrics.inc("redis.client_cache.stale_hits")
+                    self.invalidate(key)
+                    return fresh
+
+            return entry[0]
+
+        metrics.inc("redis.client_cache.misses")
+        epoch = self._epoch
+        value = await loader()
+
+        # None не кешируем; если за время загрузки пришла инвалидация — тоже
+        if value is not None and self._healthy and epoch == self._epoch:
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,285 @@
+import asyncio
+import hashlib
+import math
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, List, Optional
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from src.application.interfaces import AbstractEmailFilter
+from src.core.metrics.registry import metrics
+
+# Источник email для построения: since=None — все пользователи,
+# иначе только зарегистрированные не раньше since. Отдаёт батчами
+EmailSource = Callable[[Optional[datetime]], AsyncIterator[List[str]]]
+
+# Фильтр ещё не построен — ответ «возможно есть» (иначе GETBIT/BF.EXISTS
+# по отсутствующему ключу дали бы ложный отказ)
+_MIGHT_EXIST_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 1
+end
+if ARGV[1] == 'bloom' then
+    return redis.call('BF.EXISTS', KEYS[1], ARGV[2])
+end
+for i = 2, #ARGV do
+    if redis.call('GETBIT', KEYS[1], ARGV[i]) == 0 then
+        return 0
+    end
+end
+return 1
+"""
+
+# Строящийся фильтр становится рабочим, только если за время построения его
+# не инвалидировали (импорт, восстановление БД): иначе в нём не хватает email,
+# вставленных в обход регистрации, — такой снимок выбрасываем
+_SWAP_LUA = """
+if (redis.call('GET', KEYS[3]) or '0') ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 0
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+# Пишем и в рабочий фильтр, и в строящийся (если сейчас идёт построение)
+_ADD_LUA = """
+for _, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        if ARGV[1] == 'bloom' then
+            redis.call('BF.ADD', key, ARGV[2])
+        else
+            for i = 2, #ARGV do
+                redis.call('SETBIT', key, ARGV[i], 1)
+            end
+        end
+    end
+end
+return 1
+"""
+
+
+class RedisEmailBloomFilter(AbstractEmailFilter):
+    """
+    Bloom filter зарегистрированных email в Redis.
+
+    • backend "bloom" — модуль RedisBloom (BF.*); "bitmap" — обычная строка-битмап,
+      k смещений считаются в Python (double hashing), проверка — Lua с GETBIT;
+      "auto" — BF.*, если модуль доступен;
+    • строится из lower(email) всех users во временный ключ и атомарно
+      подменяется RENAME; фоновая задача каждые check_interval секунд проверяет,
+      что фильтр есть, и строит его заново, если нет;
+    • рабочий ключ живёт rebuild_seconds: так пользователи, вставленные в обход
+      регистрации (ручной SQL, восстановление), попадают в фильтр не позже чем
+      через rebuild_seconds;
+    • регистрации пишут в фильтр до вставки в БД: ложноположительный ответ
+      (вставка не удалась) безопасен, ложноотрицательный — нет;
+    • другие пути вставки (импорт, восстановление) вызывают invalidate():
+      фильтр удаляется и до перестроения отвечает «возможно есть»; построение,
+      начатое до invalidate(), результат не публикует;
+    • в имени ключа — версия формата и параметры (capacity, error_rate):
+      фильтр с другими размерами или из старого формата не читается;
+    • при ошибках Redis отвечает «возможно есть» — запрос уходит в БД.
+    """
+
+    # v2: email в фильтре в нижнем регистре
+    FORMAT_VERSION = 2
+    # счётчик инвалидаций — общий для всех версий и параметров фильтра
+    GENERATION_KEY = "{email_bloom}:generation"
+    # никогда не создаётся: нужен только для проверки наличия BF.*
+    PROBE_KEY = "{email_bloom}:probe"
+    BUILD_LOCK_TTL = 600
+    # регистрации, чья транзакция началась до снимка выборки, но закоммичена позже
+    CATCH_UP_MARGIN = timedelta(minutes=5)
+    BITMAP_BATCH = 1000
+
+    def __init__(
+        self,
+        redis: Redis,
+        capacity: int,
+        error_rate: float,
+        backend: str = "auto",
+        enabled: bool = True,
+        rebuild_seconds: int = 86_400,
+        check_interval: float = 60.0,
+    ) -> None:
+        if backend not in ("auto", "bloom", "bitmap"):
+            raise ValueError(f"Unknown email filter backend: {backend}")
+        self.redis = redis
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.enabled = enabled
+        self.rebuild_seconds = rebuild_seconds
+        self.check_interval = check_interval
+        self.backend: Optional[str] = None if backend == "auto" else backend
+
+        # hash tag {email_bloom}: все ключи фильтра в одном слоте (Lua, RENAME)
+        self.key = f"{{email_bloom}}:v{self.FORMAT_VERSION}:{capacity}:{error_rate}"
+        self.build_key = f"{self.key}:building"
+        self.lock_key = f"{self.key}:lock"
+
+        # оптимальные размеры битмапа для capacity и error_rate
+        self.bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+
+        self._might_exist = redis.register_script(_MIGHT_EXIST_LUA)
+        self._add = redis.register_script(_ADD_LUA)
+        self._swap = redis.register_script(_SWAP_LUA)
+        self._task: Optional[asyncio.Task] = None
+        self.logger = structlog.get_logger(__name__)
+
+    # ─── AbstractEmailFilter ──────────────────────────────────────────────────
+
+    async def might_exist(self, email: str) -> bool:
+        if not self.enabled or self.backend is None:
+            return True
+        try:
+            result = await self._might_exist(keys=[self.key], args=self._args(email))
+        except RedisError:
+            metrics.inc("email_filter.fail_open")
+            return True
+
+        if result:
+            metrics.inc("email_filter.maybe")
+            return True
+        metrics.inc("email_filter.definite_miss")
+        return False
+
+    async def add(self, email: str) -> None:
+        if not self.enabled:
+            return
+        if self.backend is None:
+            await self._detect_backend()
+        await self._add(keys=[self.key, self.build_key], args=self._args(email))
+
+    async def invalidate(self) -> None:
+        """
+        Для вставок в обход регистрации: фильтр удаляется (до перестроения —
+        «возможно есть»), идущее построение свой результат не опубликует.
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(self.GENERATION_KEY)
+            # блокировку не снимаем: идущее построение само выбросит свой
+            # результат, следующее начнётся после него
+            pipe.delete(self.key)
+            await pipe.execute()
+        metrics.inc("email_filter.invalidations")
+
+    # ─── lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self, source: EmailSource) -> None:
+        """Построение в фоне: до его окончания фильтр отвечает «возможно есть»"""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(source))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, source: EmailSource) -> None:
+        # фильтр истекает (rebuild_seconds) или удаляется invalidate() —
+        # тогда один из инстансов строит его заново
+        while True:
+            try:
+                await self.ensure_built(source)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error("Не удалось построить фильтр email", error=str(e))
+            await asyncio.sleep(self.check_interval)
+
+    async def ensure_built(self, source: EmailSource) -> None:
+        await self._detect_backend()
+        if await self.redis.exists(self.key):
+            return
+        # строит один инстанс, остальные пока ходят в БД
+        if not await self.redis.set(
+            self.lock_key, b"1", nx=True, ex=self.BUILD_LOCK_TTL
+        ):
+            return
+
+        try:
+            generation = await self.redis.get(self.GENERATION_KEY) or b"0"
+            await self.redis.delete(self.build_key)
+            # ключ создаётся до выборки: регистрации во время построения
+            # попадают в него через add()
+            if self.backend == "bloom":
+                await self.redis.execute_command(
+                    "BF.RESERVE", self.build_key, self.error_rate, self.capacity
+                )
+            else:
+                await self.redis.setbit(self.build_key, self.bits - 1, 0)
+
+            started_at = datetime.now(timezone.utc)
+            count = 0
+            async for batch in source(None):
+                await self._add_batch(self.build_key, batch)
+                count += len(batch)
+
+            if not await self._swap(
+                keys=[self.build_key, self.key, self.GENERATION_KEY],
+                args=[generation, self.rebuild_seconds],
+            ):
+                metrics.inc("email_filter.build_discarded")
+                self.logger.info("Фильтр email инвалидирован во время построения")
+                return
+
+            async for batch in source(started_at - self.CATCH_UP_MARGIN):
+                await self._add_batch(self.key, batch)
+        finally:
+            await self.redis.delete(self.lock_key)
+
+        if count > self.capacity:
+            self.logger.warning(
+                "Email в фильтре больше, чем capacity — растёт доля ложных попаданий",
+                count=count,
+                capacity=self.capacity,
+            )
+        self.logger.info("Фильтр email построен", backend=self.backend, count=count)
+
+    # ─── helpers ──────────────────────────────────────────────────────────────
+
+    async def _detect_backend(self) -> None:
+        if self.backend is not None:
+            return
+        try:
+            await self.redis.execute_command("BF.EXISTS", self.PROBE_KEY, "probe")
+            self.backend = "bloom"
+        except ResponseError:
+            # unknown command — модуля RedisBloom нет
+            self.backend = "bitmap"
+
+    def _offsets(self, email: str) -> List[int]:
+        digest = hashlib.blake2b(email.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def _args(self, email: str) -> list:
+        if self.backend == "bloom":
+            return ["bloom", email]
+        return ["bitmap", *self._offsets(email)]
+
+    async def _add_batch(self, key: str, emails: List[str]) -> None:
+        if not emails:
+            return
+        if self.backend == "bloom":
+            await self.redis.execute_command("BF.MADD", key, *emails)
+            return
+        for start in range(0, len(emails), self.BITMAP_BATCH):
+            pipe = self.redis.pipeline(transaction=False)
+            for email in emails[start : start + self.BITMAP_BATCH]:
+                for offset in self._offsets(email):
+                    pipe.setbit(key, offset, 1)
+            await pipe.execute()
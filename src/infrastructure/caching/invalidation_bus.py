@@ -0,0 +1,252 @@
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+from uuid import uuid4
+
+import structlog
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from src.core.metrics.registry import metrics
+
+# Версия схемы сообщения: воркеры с другой версией сообщения пропускают
+SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class InvalidationMessage:
+    """
+    Сообщение шины: topic — какой кеш, key — что изменилось,
+    value — новое значение, если подписчику достаточно его (иначе None).
+    """
+
+    topic: str
+    key: str
+    value: Optional[str] = None
+    origin: str = ""
+    sent_at: float = field(default_factory=time.time)
+
+    def encode(self) -> bytes:
+        return json.dumps(
+            {
+                "v": SCHEMA_VERSION,
+                "topic": self.topic,
+                "key": self.key,
+                "value": self.value,
+                "origin": self.origin,
+                "sent_at": self.sent_at,
+            },
+            separators=(",", ":"),
+        ).encode()
+
+    @classmethod
+    def decode(cls, raw: Any) -> Optional["InvalidationMessage"]:
+        """None — сообщение чужой версии схемы"""
+        data = json.loads(raw)
+        if data.get("v") != SCHEMA_VERSION:
+            return None
+        return cls(
+            topic=data["topic"],
+            key=data["key"],
+            value=data.get("value"),
+            origin=data.get("origin", ""),
+            sent_at=data.get("sent_at", 0.0),
+        )
+
+
+class InvalidationSubscriber(ABC):
+    """Локальный кеш, который получает инвалидации своего topic через шину."""
+
+    topic: str
+
+    @abstractmethod
+    def handle(self, message: InvalidationMessage) -> None:
+        """Применить сообщение. Вызывается в задаче слушателя — без долгих операций."""
+        ...
+
+    @abstractmethod
+    async def resync(self) -> None:
+        """
+        Привести кеш в соответствие с источником после (пере)подключения:
+        сообщения, отправленные во время обрыва, потеряны. Самое простое — очистить.
+        """
+        ...
+
+
+class InvalidationBus:
+    """
+    Шина инвалидации локальных кешей между воркерами и подами (Redis pub/sub).
+
+    • один канал на все кеши, сообщение — InvalidationMessage (JSON с версией схемы);
+    • кеши регистрируются как InvalidationSubscriber своего topic;
+    • слушатель — фоновая задача (start()/stop() из lifespan приложения);
+    • кеши регистрируются до start() (lifespan приложения); register() только
+      запоминает подписчика — синхронизирует его слушатель;
+    • после каждого (пере)подключения: сначала SUBSCRIBE, потом resync() всех
+      подписчиков — изменения между ними придут сообщениями;
+    • ошибка resync() одного подписчика не рвёт подписку: несинхронизированным
+      остаётся только его topic, resync повторяется с backoff;
+    • is_synced(topic) — подписка жива и подписчик синхронизирован после неё.
+      Пока это не так, кеш не должен отвечать из памяти.
+    """
+
+    CHANNEL = "cache_invalidation"
+    MAX_BACKOFF = 30.0
+
+    def __init__(self, redis: Redis, channel: str = CHANNEL) -> None:
+        self.redis = redis
+        self.channel = channel
+        # идентификатор процесса — в сообщениях для диагностики
+        self.origin = uuid4().hex[:12]
+
+        self._subscribers: Dict[str, InvalidationSubscriber] = {}
+        self._synced: Set[str] = set()
+        self._connected = False
+        # повтор resync() несинхронизированных topic — не раньше этого времени
+        self._resync_at = 0.0
+        self._resync_backoff = 0.5
+        self._pubsub: Optional[PubSub] = None
+        self._listener: Optional[asyncio.Task] = None
+        self.logger = structlog.get_logger(__name__)
+
+    # ─── registration ─────────────────────────────────────────────────────────
+
+    def register(self, subscriber: InvalidationSubscriber) -> None:
+        if subscriber.topic in self._subscribers:
+            raise ValueError(f"Topic уже зарегистрирован: {subscriber.topic}")
+        self._subscribers[subscriber.topic] = subscriber
+        # подписка уже жива — слушатель догонит topic на ближайшем шаге
+        self._resync_at = 0.0
+
+    def is_synced(self, topic: str) -> bool:
+        return self._connected and topic in self._synced
+
+    # ─── lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._disconnect()
+
+    async def _disconnect(self) -> None:
+        self._connected = False
+        self._synced.clear()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _resync_pending(self) -> None:
+        """resync() подписчиков, ещё не синхронизированных после подключения"""
+        failed = False
+        for topic, subscriber in list(self._subscribers.items()):
+            if topic in self._synced:
+                continue
+            start = time.perf_counter()
+            try:
+                await subscriber.resync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                failed = True
+                metrics.inc(f"invalidation_bus.{topic}.resync_errors")
+                self.logger.warning(
+                    "Не удалось синхронизировать кеш", topic=topic, error=str(exc)
+                )
+                continue
+            self._synced.add(topic)
+            metrics.observe(
+                f"invalidation_bus.{topic}.resync_seconds",
+                time.perf_counter() - start,
+            )
+
+        if failed:
+            self._resync_at = time.monotonic() + self._resync_backoff
+            self._resync_backoff = min(self._resync_backoff * 2, self.MAX_BACKOFF)
+        else:
+            self._resync_backoff = 0.5
+
+    async def _maybe_resync(self) -> None:
+        if len(self._synced) < len(self._subscribers) and (
+            time.monotonic() >= self._resync_at
+        ):
+            await self._resync_pending()
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                self._pubsub = self.redis.pubsub()
+                await self._pubsub.subscribe(self.channel)
+                self._connected = True
+                self._resync_at = 0.0
+                backoff = 0.5
+                self.logger.info(
+                    "Шина инвалидации подключена", topics=sorted(self._subscribers)
+                )
+
+                while True:
+                    await self._maybe_resync()
+                    message = await self._pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=5.0
+                    )
+                    if message is None:
+                        await self._pubsub.ping()
+                        continue
+                    self._dispatch(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                metrics.inc("invalidation_bus.disconnects")
+                self.logger.warning("Шина инвалидации отключена", error=str(exc))
+                await self._disconnect()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.MAX_BACKOFF)
+
+    def _dispatch(self, raw: Any) -> None:
+        try:
+            message = InvalidationMessage.decode(raw)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            metrics.inc("invalidation_bus.malformed")
+            self.logger.warning("Неверное сообщение шины инвалидации", data=raw)
+            return
+        if message is None:
+            metrics.inc("invalidation_bus.skipped_version")
+            return
+
+        subscriber = self._subscribers.get(message.topic)
+        if subscriber is None:
+            return
+        metrics.inc(f"invalidation_bus.{message.topic}.received")
+        try:
+            subscriber.handle(message)
+        except Exception as exc:
+            # ошибка одного кеша не должна останавливать доставку остальным
+            metrics.inc(f"invalidation_bus.{message.topic}.handler_errors")
+            self.logger.error(
+                "Ошибка обработки инвалидации", topic=message.topic, error=str(exc)
+            )
+
+    # ─── publish ──────────────────────────────────────────────────────────────
+
+    def message(
+        self, topic: str, key: str, value: Optional[str] = None
+    ) -> InvalidationMessage:
+        return InvalidationMessage(
+            topic=topic, key=key, value=value, origin=self.origin
+        )
+
+    async def publish(self, topic: str, key: str, value: Optional[str] = None) -> None:
+        await self.redis.publish(self.channel, self.message(topic, key, value).encode())
+        metrics.inc(f"invalidation_bus.{topic}.published")
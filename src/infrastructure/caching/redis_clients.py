@@ -0,0 +1,37 @@
+import time
+from typing import Any, NewType
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError
+
+from src.core.metrics.registry import metrics
+
+# Отдельные клиенты (и пулы) на подсистему: всплеск rate limit трафика
+# или медленная команда не выедают соединения у refresh-сессий
+RateLimitRedis = NewType("RateLimitRedis", Redis)
+VerificationRedis = NewType("VerificationRedis", Redis)
+SessionRedis = NewType("SessionRedis", Redis)
+
+
+class InstrumentedBlockingConnectionPool(BlockingConnectionPool):
+    """
+    BlockingConnectionPool, который пишет время ожидания соединения (checkout wait)
+    и таймауты ожидания в метрики под своим именем.
+    """
+
+    def __init__(self, *args: Any, pool_name: str, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.pool_name = pool_name
+
+    async def get_connection(self, *args: Any, **kwargs: Any):
+        start = time.perf_counter()
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except ConnectionError:
+            metrics.inc(f"redis_pool.{self.pool_name}.checkout_timeouts")
+            raise
+        finally:
+            metrics.observe(
+                f"redis_pool.{self.pool_name}.checkout_wait_seconds",
+                time.perf_counter() - start,
+            )
@@ -0,0 +1,70 @@
+from typing import List, Optional, Set
+from uuid import UUID
+
+from src.application.interfaces import (
+    AbstractUserRepository,
+    UserCursor,
+    UserSearchMode,
+)
+from src.domain.entities.user import User
+from src.infrastructure.caching.user_cache import UserCache
+
+
+class CachedUserRepository(AbstractUserRepository):
+    """
+    Декоратор репозитория пользователей: get_by_id идёт через UserCache,
+    остальное — напрямую во внутренний репозиторий. Хеш пароля UserCache
+    не хранит — для проверки пароля пользователь читается через get_by_email.
+
+    Изменённые id копятся в pending_invalidations и инвалидируются
+    UnitOfWork'ом после коммита: инвалидация до коммита позволила бы
+    конкурентному чтению снова закешировать старую строку.
+    """
+
+    def __init__(self, inner: AbstractUserRepository, cache: UserCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.pending_invalidations: Set[UUID] = set()
+
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        return await self.cache.get(user_id, lambda: self.inner.get_by_id(user_id))
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self.inner.get_by_email(email)
+
+    async def add(self, user: User) -> None:
+        await self.inner.add(user)
+
+    async def add_if_absent(self, user: User) -> bool:
+        return await self.inner.add_if_absent(user)
+
+    async def delete(self, user_id: UUID) -> None:
+        await self.inner.delete(user_id)
+        self.pending_invalidations.add(user_id)
+
+    async def update(self, user: User) -> None:
+        await self.inner.update(user)
+        self.pending_invalidations.add(user.id)
+
+    async def set_password(self, user_id: UUID, hashed_password: str) -> None:
+        await self.inner.set_password(user_id, hashed_password)
+        self.pending_invalidations.add(user_id)
+
+    async def bump_token_epoch(self, user_id: UUID) -> int:
+        epoch = await self.inner.bump_token_epoch(user_id)
+        self.pending_invalidations.add(user_id)
+        return epoch
+
+    async def search(
+        self,
+        query: str,
+        mode: UserSearchMode,
+        limit: int,
+        after: Optional[UserCursor] = None,
+    ) -> List[User]:
+        return await self.inner.search(query, mode, limit, after)
+
+    async def flush_invalidations(self) -> None:
+        pending, self.pending_invalidations = self.pending_invalidations, set()
+        for user_id in pending:
+            await self.cache.invalidate(user_id)
@@ -0,0 +1,75 @@
+from typing import Sequence, Tuple
+
+from src.application.interfaces import (
+    AbstractRateLimitRepository,
+    RateLimitDecision,
+    RateLimitRule,
+)
+from src.core.metrics.registry import metrics
+from src.core.rate_limit.token_bucket import TokenBucketLimiter
+
+
+class LocalPrefilterRateLimitRepository(AbstractRateLimitRepository):
+    """
+    Декоратор над Redis-лимитером: сначала локальный token bucket на ключ.
+    Явный флуд отсекается без round trip в Redis,
+    всё, что прошло фильтр, проверяет основной (Redis) лимитер — он остаётся авторитетным.
+    """
+
+    def __init__(
+        self,
+        inner: AbstractRateLimitRepository,
+        bucket: TokenBucketLimiter,
+    ) -> None:
+        self.inner = inner
+        self.bucket = bucket
+
+    def _acquire(self, key: str) -> bool:
+        if self.bucket.try_acquire(key.lower()):
+            metrics.inc("rate_limit.local.key.passed")
+            return True
+        metrics.inc("rate_limit.local.key.shed")
+        return False
+
+    async def increment_and_check(
+        self,
+        email: str,
+        prefix: str,
+        limit_attempts: int,
+        window_seconds: int,
+    ) -> Tuple[bool, int, int]:
+        if not self._acquire(f"{prefix}:{email}"):
+            return False, limit_attempts, 0
+
+        return await self.inner.increment_and_check(
+            email=email,
+            prefix=prefix,
+            limit_attempts=limit_attempts,
+            window_seconds=window_seconds,
+        )
+
+    async def check_and_set_cooldown(
+        self, email: str, cooldown: int
+    ) -> Tuple[bool, int]:
+        key = f"cooldown:{email}"
+        if not self._acquire(key):
+            return False, self.bucket.retry_after(key.lower())
+
+        return await self.inner.check_and_set_cooldown(email=email, cooldown=cooldown)
+
+    async def check_rules(self, rules: Sequence[RateLimitRule]) -> RateLimitDecision:
+        # Все вёдра проверяются до списания: если отсекает более позднее правило,
+        # токены ранних правил не сгорают
+        keys = [f"{rule.prefix}:{rule.identifier}".lower() for rule in rules]
+        shed_key = self.bucket.try_acquire_all(keys)
+
+        if shed_key is not None:
+            metrics.inc("rate_limit.local.key.shed")
+            return RateLimitDecision(
+                is_allowed=False,
+                violated_rule=rules[keys.index(shed_key)],
+                retry_after=self.bucket.retry_after(shed_key),
+            )
+
+        metrics.inc("rate_limit.local.key.passed", len(keys))
+        return await self.inner.check_rules(rules)
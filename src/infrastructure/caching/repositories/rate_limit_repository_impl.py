@@ -1,11 +1,65 @@
-from src.application.interfaces import AbstractRateLimitRepository
-from typing import Tuple
-from redis.asyncio import Redis
+from src.application.interfaces import (
+    AbstractRateLimitRepository,
+    RateLimitDecision,
+    RateLimitRule,
+)
+from typing import Sequence, Tuple
+from src.infrastructure.caching.redis_clients import RateLimitRedis
+
+# Двухфазная проверка набора правил:
+#   1) только читаем: если хотя бы одно правило нарушено — возвращаем его индекс
+#      и PTTL ключа, ничего не меняя
+#   2) все правила прошли — расходуем квоту (INCR/EXPIRE для окон, SET EX для кулдаунов)
+# Скрипт выполняется в Redis атомарно, поэтому гонок между фазами нет.
+# ARGV: для каждого ключа тройка (kind, limit, window_seconds)
+_CHECK_RULES_LUA = """
+local n = #KEYS
+for i = 1, n do
+    local kind = ARGV[(i - 1) * 3 + 1]
+    local limit = tonumber(ARGV[(i - 1) * 3 + 2])
+    local window = tonumber(ARGV[(i - 1) * 3 + 3])
+    if kind == 'window' then
+        local current = tonumber(redis.call('GET', KEYS[i]) or '0')
+        if current >= limit then
+            local ttl = redis.call('PTTL', KEYS[i])
+            if ttl < 0 then
+                -- ключ без TTL (не должен появляться) — чиним, чтобы не заблокировать навсегда
+                redis.call('PEXPIRE', KEYS[i], window * 1000)
+                ttl = window * 1000
+            end
+            return {i, ttl}
+        end
+    else
+        local ttl = redis.call('PTTL', KEYS[i])
+        if ttl > 0 then
+            return {i, ttl}
+        end
+    end
+end
+for i = 1, n do
+    local kind = ARGV[(i - 1) * 3 + 1]
+    local window = tonumber(ARGV[(i - 1) * 3 + 3])
+    if kind == 'window' then
+        local current = redis.call('INCR', KEYS[i])
+        if current == 1 then
+            redis.call('PEXPIRE', KEYS[i], window * 1000)
+        end
+    else
+        redis.call('SET', KEYS[i], '1', 'EX', window)
+    end
+end
+return {0, 0}
+"""
 
 
 class RateLimitRepository(AbstractRateLimitRepository):
-    def __init__(self, redis: Redis) -> None:
+    def __init__(self, redis: RateLimitRedis) -> None:
         self.redis = redis
+        self._check_rules_script = self.redis.register_script(_CHECK_RULES_LUA)
+
+    @staticmethod
+    def _rule_key(rule: RateLimitRule) -> str:
+        return f"{rule.prefix}:{rule.identifier.lower()}"
 
     async def increment_and_check(
         self,
@@ -45,3 +99,25 @@ class RateLimitRepository(AbstractRateLimitRepository):
 
         seconds_left = (ms_left + 999) // 1000
         return False, seconds_left
+
+    async def check_rules(self, rules: Sequence[RateLimitRule]) -> RateLimitDecision:
+        if not rules:
+            return RateLimitDecision(is_allowed=True)
+
+        keys = [self._rule_key(rule) for rule in rules]
+        args: list[str | int] = []
+        for rule in rules:
+            args.extend((rule.kind.value, rule.limit, rule.window_seconds))
+
+        # Один EVALSHA на все правила
+        violated_index, ms_left = await self._check_rules_script(keys=keys, args=args)
+        violated_index, ms_left = int(violated_index), int(ms_left)
+
+        if violated_index == 0:
+            return RateLimitDecision(is_allowed=True)
+
+        return RateLimitDecision(
+            is_allowed=False,
+            violated_rule=rules[violated_index - 1],
+            retry_after=max(1, (ms_left + 999) // 1000),
+        )
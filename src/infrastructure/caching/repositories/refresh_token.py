@@ -1,4 +1,4 @@
-from redis.asyncio import Redis
+from src.infrastructure.caching.redis_clients import SessionRedis
 from uuid import UUID
 from datetime import timedelta
 
@@ -17,7 +17,7 @@ class RedisRefreshTokenRepository(AbstractRefreshTokenRepository):
 
     def __init__(
         self,
-        redis_client: Redis,
+        redis_client: SessionRedis,
         settings: JwtSettings,
     ):
         self.redis = redis_client
@@ -1,22 +1,74 @@
-import asyncio
-import json
 from src.application.interfaces import (
     AbstractVerificationCodeRepository,
     PendingRegistrationData,
+    VerificationAttempt,
 )
-from redis.asyncio import Redis
-from typing import Optional, Tuple
+from src.infrastructure.caching.client_side_cache import RedisClientSideCache
+from src.infrastructure.caching.serializers import PayloadSerializer, SerializationError
+from src.infrastructure.caching.redis_clients import VerificationRedis
+from typing import Any, Optional, Tuple
+
+PENDING_KEY_PREFIX = "pending_reg:"
+
+# Все данные pending и счётчик попыток лежат в одном hash с одним TTL:
+#   pending_reg:{email} -> {payload, otp_hash, attempts}
+# Префикс отличается от прежнего pending_data: (там была строка): во время
+# rolling deploy HGETALL/HINCRBY по старому ключу дали бы WRONGTYPE.
+# Старые записи не читаются и истекают сами, пользователь запрашивает код заново.
+# payload — сериализованные {email, hashed_password, max_attempts} (PayloadSerializer),
+# otp_hash хранится отдельным полем, чтобы Lua мог сравнить его при consume.
+
+# Увеличивает попытки и возвращает данные за один round trip.
+# HINCRBY не сбрасывает TTL. Если записи нет — nil (ключ не создаём).
+_BEGIN_ATTEMPT_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+local data = redis.call('HMGET', KEYS[1], 'payload', 'otp_hash')
+return {attempts, data[1], data[2]}
+"""
+
+# Удаляет запись, только если код не был перевыпущен (compare-and-delete)
+_CONSUME_LUA = """
+if redis.call('HGET', KEYS[1], 'otp_hash') == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _decode(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value.decode() if isinstance(value, bytes) else str(value)
 
 
 class VerificationCodeRepository(AbstractVerificationCodeRepository):
-    def __init__(self, redis: Redis) -> None:
+    def __init__(
+        self,
+        redis: VerificationRedis,
+        serializer: PayloadSerializer,
+        cache: RedisClientSideCache,
+    ) -> None:
         self.redis = redis
+        self.serializer = serializer
+        self.cache = cache
+        self._begin_attempt_script = self.redis.register_script(_BEGIN_ATTEMPT_LUA)
+        self._consume_script = self.redis.register_script(_CONSUME_LUA)
 
     def _get_key_pending_reg(self, email: str) -> str:
-        return f"pending_data:{str(email).lower()}"
+        return f"{PENDING_KEY_PREFIX}{str(email).lower()}"
 
-    def _get_key_increment_a_check(self, email: str) -> str:
-        return f"verifi_code_attempts:{str(email).lower()}"
+    def _to_pending(self, payload: Any, otp_hash: Any) -> PendingRegistrationData:
+        data = self.serializer.loads(payload)
+        return PendingRegistrationData(
+            email=data["email"],
+            # при сбросе пароля хеша пароля нет
+            hashed_password=data.get("hashed_password"),  # type: ignore[arg-type]
+            otp_hash=_decode(otp_hash) or "",
+            max_attempts=int(data["max_attempts"]),
+        )
 
     async def create_pending(
         self,
@@ -27,41 +79,75 @@ class VerificationCodeRepository(AbstractVerificationCodeRepository):
         hashed_password: Optional[str] = None,
     ) -> None:
         pending_key = self._get_key_pending_reg(email)
-        attempts_key = self._get_key_increment_a_check(email)
 
+        payload = self.serializer.dumps(
+            {
+                "email": str(email),
+                "hashed_password": hashed_password,
+                "max_attempts": max_attempts,
+            }
+        )
         data = {
-            "email": str(email),
-            "hashed_password": hashed_password,
+            "payload": payload,
             "otp_hash": otp_hash,
-            "max_attempts": max_attempts,
+            "attempts": 0,
         }
 
-        # Делаем обе операции параллельно
-        await asyncio.gather(
-            self.redis.set(pending_key, json.dumps(data), ex=ttl_seconds),
-            self.redis.delete(attempts_key),
-        )
+        # DEL + HSET + EXPIRE в одной транзакции (MULTI/EXEC) — один round trip,
+        # перезапись сбрасывает и счётчик попыток
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(pending_key)
+        pipe.hset(pending_key, mapping=data)
+        pipe.expire(pending_key, ttl_seconds)
+        await pipe.execute()
+        self.cache.invalidate(pending_key)
 
         return None
 
     async def get_pending(self, email: str) -> Optional[PendingRegistrationData]:
         key = self._get_key_pending_reg(email)
-        raw = await self.redis.get(key)
+        # горячее чтение (resend) — через client-side cache, если он включён
+        return await self.cache.get_or_load(key, lambda: self._load_pending(key))
+
+    async def _load_pending(self, key: str) -> Optional[PendingRegistrationData]:
+        raw = await self.redis.hgetall(key)
 
         if not raw:
             return None
 
+        data = {_decode(k): v for k, v in raw.items()}
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+            return self._to_pending(data["payload"], data.get("otp_hash"))
+        except (KeyError, SerializationError):
+            # битая запись — удаляем
             await self.redis.delete(key)
             return None
 
-        return PendingRegistrationData(
-            email=data["email"],
-            hashed_password=data["hashed_password"],
-            otp_hash=data["otp_hash"],
-            max_attempts=data["max_attempts"],
+    async def begin_attempt(
+        self,
+        email: str,
+        limit_attempts: int,
+    ) -> Optional[VerificationAttempt]:
+        key = self._get_key_pending_reg(email)
+        result = await self._begin_attempt_script(keys=[key])
+
+        if not result:
+            return None
+
+        current_attempts = int(result[0])
+        remaining_attempts = max(0, limit_attempts - current_attempts)
+
+        try:
+            data = self._to_pending(result[1], result[2])
+        except (KeyError, SerializationError):
+            await self.redis.delete(key)
+            return None
+
+        return VerificationAttempt(
+            data=data,
+            is_allowed=current_attempts < limit_attempts,
+            current_attempts=current_attempts,
+            remaining_attempts=remaining_attempts,
         )
 
     async def increment_and_check(
@@ -69,25 +155,24 @@ class VerificationCodeRepository(AbstractVerificationCodeRepository):
         email: str,
         limit_attempts: int,
     ) -> Tuple[bool, int, int]:
-        key = self._get_key_increment_a_check(email)
-        # Если ключа нет — создаёт его со значением 1 и возвращает 1.
-        # Если ключ есть — увеличивает его значение на 1 и возвращает новое значение.
-        current_attempts = await self.redis.incr(key)
+        attempt = await self.begin_attempt(email, limit_attempts=limit_attempts)
 
-        if current_attempts == 1:
-            await self.redis.expire(key, 1800)
+        if attempt is None:
+            return False, 0, 0
 
-        # Сколько осталось попыток
-        remaining_attempts = max(0, limit_attempts - current_attempts)
+        return attempt.is_allowed, attempt.current_attempts, attempt.remaining_attempts
 
-        is_allowed = current_attempts < limit_attempts
-
-        return is_allowed, current_attempts, remaining_attempts
+    async def consume_pending(self, email: str, otp_hash: str) -> bool:
+        key = self._get_key_pending_reg(email)
+        deleted = await self._consume_script(keys=[key], args=[otp_hash])
+        self.cache.invalidate(key)
+        return bool(int(deleted))
 
     async def delete_pending(
         self,
         email: str,
     ) -> None:
         # если регистрация прошла успешно то удалям временные данные
-        await self.redis.delete(self._get_key_pending_reg(email))
-        await self.redis.delete(self._get_key_increment_a_check(email))
+        key = self._get_key_pending_reg(email)
+        await self.redis.delete(key)
+        self.cache.invalidate(key)
@@ -0,0 +1,139 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict
+
+# Первый байт каждого значения — формат (и его версия).
+# Декодер выбирается по нему, а не по текущей настройке, поэтому при rolling upgrade
+# (часть воркеров уже пишет msgpack, часть ещё json) все читают записи друг друга.
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+
+# Значения, записанные до появления заголовка (голый json.dumps)
+_LEGACY_JSON_PREFIX = ord("{")
+
+
+class SerializationError(ValueError):
+    """Значение в Redis не удалось декодировать"""
+
+
+def _json_loads(body: bytes) -> Any:
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(body)
+    return orjson.loads(body)
+
+
+def _msgpack_loads(body: bytes) -> Any:
+    try:
+        import msgpack
+    except ImportError as e:
+        raise SerializationError("msgpack не установлен, а значение в msgpack") from e
+    return msgpack.unpackb(body, raw=False)
+
+
+_DECODERS = {
+    FORMAT_JSON: _json_loads,
+    FORMAT_MSGPACK: _msgpack_loads,
+}
+
+
+class PayloadSerializer(ABC):
+    """
+    Сериализатор значений для caching-репозиториев.
+    dumps всегда пишет в своём формате, loads читает любой известный формат.
+    """
+
+    format_id: int
+    name: str
+
+    @abstractmethod
+    def _encode(self, data: Dict[str, Any]) -> bytes: ...
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return bytes((self.format_id,)) + self._encode(data)
+
+    def loads(self, raw: bytes | str) -> Dict[str, Any]:
+        if isinstance(raw, str):
+            raw = raw.encode()
+        if not raw:
+            raise SerializationError("Пустое значение")
+
+        header = raw[0]
+        try:
+            if header == _LEGACY_JSON_PREFIX:
+                return _json_loads(raw)
+
+            decoder = _DECODERS.get(header)
+            if decoder is None:
+                raise SerializationError(f"Неизвестный формат: {header:#x}")
+            return decoder(raw[1:])
+        except SerializationError:
+            raise
+        except Exception as e:
+            raise SerializationError(str(e)) from e
+
+
+class JsonSerializer(PayloadSerializer):
+    """stdlib json — без дополнительных зависимостей"""
+
+    format_id = FORMAT_JSON
+    name = "json"
+
+    def _encode(self, data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode()
+
+
+class OrjsonSerializer(PayloadSerializer):
+    """orjson: тот же JSON на проводе, но быстрее кодирует/декодирует"""
+
+    format_id = FORMAT_JSON
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def _encode(self, data: Dict[str, Any]) -> bytes:
+        return self._orjson.dumps(data)
+
+
+class MsgpackSerializer(PayloadSerializer):
+    """msgpack: бинарный и самый компактный формат"""
+
+    format_id = FORMAT_MSGPACK
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        import msgpack
+
+        self._msgpack = msgpack
+
+    def _encode(self, data: Dict[str, Any]) -> bytes:
+        return self._msgpack.packb(data, use_bin_type=True)
+
+
+# имя из настроек -> фабрика конкретного сериализатора
+_SERIALIZERS: Dict[str, Callable[[], PayloadSerializer]] = {
+    "json": JsonSerializer,
+    "orjson": OrjsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def build_serializer(name: str) -> PayloadSerializer:
+    """Создаёт сериализатор по имени из настроек (json / orjson / msgpack)"""
+    try:
+        serializer_cls = _SERIALIZERS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Неизвестный сериализатор: {name}. Доступны: {', '.join(_SERIALIZERS)}"
+        )
+
+    try:
+        return serializer_cls()
+    except ImportError as e:
+        raise RuntimeError(
+            f"Для сериализатора {name} нужно установить пакет {name}"
+        ) from e
@@ -0,0 +1,158 @@
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import structlog
+from redis.exceptions import RedisError
+
+from src.application.interfaces import AbstractTokenDenylist
+from src.core.metrics.registry import metrics
+from src.infrastructure.caching.invalidation_bus import (
+    InvalidationBus,
+    InvalidationMessage,
+    InvalidationSubscriber,
+)
+from src.infrastructure.caching.redis_clients import SessionRedis
+
+
+class RedisTokenDenylist(AbstractTokenDenylist, InvalidationSubscriber):
+    """
+    Денайлист access-токенов с репликой в памяти каждого воркера.
+
+    • revoke() пишет revoked_jti:{jti} в Redis с TTL до exp токена
+      и публикует jti с exp в шину инвалидации (topic token_denylist);
+    • каждый воркер получает сообщения шины и держит словарь jti -> exp:
+      is_revoked() — поиск в словаре, без round trip;
+    • после (пере)подключения шины словарь строится заново из Redis (SCAN) —
+      публикации, пропущенные во время обрыва, не теряются;
+    • пока реплика не синхронизирована, проверка идёт в Redis напрямую;
+      если и Redis недоступен — токен считается действующим (он всё равно
+      истечёт по exp, а refresh уже отозван).
+    """
+
+    KEY_PREFIX = "revoked_jti:"
+    topic = "token_denylist"
+    SCAN_BATCH = 1000
+
+    def __init__(
+        self,
+        redis: SessionRedis,
+        bus: InvalidationBus,
+        prune_interval: float = 60.0,
+        enabled: bool = True,
+    ) -> None:
+        self.redis = redis
+        self.bus = bus
+        self.prune_interval = prune_interval
+        self.enabled = enabled
+
+        # jti -> exp (unix time)
+        self._revoked: Dict[str, float] = {}
+        self._last_prune = time.monotonic()
+        self.logger = structlog.get_logger(__name__)
+
+    def _key(self, jti: str) -> str:
+        return f"{self.KEY_PREFIX}{jti}"
+
+    @property
+    def _healthy(self) -> bool:
+        return self.bus.is_synced(self.topic)
+
+    # ─── invalidation bus ─────────────────────────────────────────────────────
+
+    async def resync(self) -> None:
+        # шина вызывает после подписки: отзывы во время снимка придут сообщением
+        now = time.time()
+        snapshot: Dict[str, float] = {}
+        batch: List[bytes] = []
+
+        async def _load(keys: List[bytes]) -> None:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.ttl(key)
+                ttls = await pipe.execute()
+            for key, ttl in zip(keys, ttls):
+                if ttl > 0:
+                    name = key.decode() if isinstance(key, bytes) else key
+                    snapshot[name[len(self.KEY_PREFIX) :]] = now + ttl
+
+        async for key in self.redis.scan_iter(
+            match=f"{self.KEY_PREFIX}*", count=self.SCAN_BATCH
+        ):
+            batch.append(key)
+            if len(batch) >= self.SCAN_BATCH:
+                await _load(batch)
+                batch = []
+        if batch:
+            await _load(batch)
+
+        # отзывы этого воркера, сделанные во время снимка, не теряем
+        for jti, exp in self._revoked.items():
+            snapshot.setdefault(jti, exp)
+        self._revoked = snapshot
+        self._prune()
+
+        metrics.inc("token_denylist.resyncs")
+        self.logger.info("Денайлист синхронизирован", entries=len(self._revoked))
+
+    def handle(self, message: InvalidationMessage) -> None:
+        try:
+            self._revoked[message.key] = float(message.value or "")
+        except ValueError:
+            self.logger.warning(
+                "Неверное сообщение денайлиста", key=message.key, value=message.value
+            )
+        self._maybe_prune()
+
+    def _maybe_prune(self) -> None:
+        if time.monotonic() - self._last_prune >= self.prune_interval:
+            self._prune()
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        self._last_prune = time.monotonic()
+
+    # ─── API ──────────────────────────────────────────────────────────────────
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        if not self.enabled:
+            return
+        exp = expires_at.timestamp()
+        ttl = int(exp - time.time()) + 1
+        if ttl <= 0:
+            return
+
+        self._revoked[jti] = exp
+        # сначала запись (её подхватит resync), потом публикация — через клиент
+        # шины: пул сессий может смотреть в другой инстанс Redis, где
+        # на канал никто не подписан
+        await self.redis.set(self._key(jti), 1, ex=ttl)
+        await self.bus.publish(self.topic, jti, str(exp))
+        self._maybe_prune()
+        metrics.inc("token_denylist.revoked")
+
+    async def is_revoked(self, jti: str) -> bool:
+        if not self.enabled:
+            return False
+
+        if self._healthy:
+            exp = self._revoked.get(jti)
+            revoked = exp is not None and exp > time.time()
+        else:
+            metrics.inc("token_denylist.remote_checks")
+            try:
+                revoked = bool(await self.redis.exists(self._key(jti)))
+            except RedisError as e:
+                metrics.inc("token_denylist.check_errors")
+                self.logger.warning("Денайлист недоступен", error=str(e))
+                return False
+
+        if revoked:
+            metrics.inc("token_denylist.rejected")
+        return revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
@@ -0,0 +1,184 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from redis.exceptions import RedisError
+
+from src.application.interfaces import AbstractTokenEpochStore
+from src.core.metrics.registry import metrics
+from src.infrastructure.caching.invalidation_bus import (
+    InvalidationBus,
+    InvalidationMessage,
+    InvalidationSubscriber,
+)
+from src.infrastructure.caching.redis_clients import SessionRedis
+
+# Эпоха из БД по user_id (None — пользователя нет)
+EpochLoader = Callable[[UUID], Awaitable[Optional[int]]]
+
+# Эпоха только растёт: более старое значение (загрузка из БД, гонка с bump)
+# не перетирает новое. Возвращает значение, которое осталось в Redis
+_SET_MAX_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]))
+local value = tonumber(ARGV[1])
+if current == nil or value > current then
+    redis.call('SET', KEYS[1], value, 'EX', ARGV[2])
+    return value
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return current
+"""
+
+
+class RedisTokenEpochStore(AbstractTokenEpochStore, InvalidationSubscriber):
+    """
+    Копия users.token_epoch в Redis (token_epoch:{user_id}) + локальный кеш воркера.
+
+    • get(): L1 (LRU с TTL) -> Redis -> БД (значение из БД дописывается в Redis);
+    • publish(): после коммита bump в БД пишет новую эпоху в Redis и рассылает
+      её в шину инвалидации (topic token_epoch) — воркеры обновляют L1 сразу,
+      поэтому проверка на попадании ничего не стоит, а отзыв действует мгновенно;
+    • эпоха монотонна: и в Redis, и в L1 хранится максимум из известных значений;
+    • если Redis не принял новую эпоху, publish() не падает (БД уже обновлена),
+      а удаляет token_epoch:{user_id} — чтения пойдут в БД;
+    • пока шина не подключена, L1 не используется; после
+      переподключения очищается (пропущенные сообщения).
+    """
+
+    KEY_PREFIX = "token_epoch:"
+    topic = "token_epoch"
+
+    def __init__(
+        self,
+        redis: SessionRedis,
+        bus: InvalidationBus,
+        loader: EpochLoader,
+        local_max_entries: int = 100_000,
+        local_ttl_seconds: float = 60.0,
+        redis_ttl_seconds: int = 86_400,
+    ) -> None:
+        self.redis = redis
+        self.bus = bus
+        self.loader = loader
+        self.local_max_entries = local_max_entries
+        self.local_ttl_seconds = local_ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+
+        # user_id -> (epoch, stored_at)
+        self._entries: "OrderedDict[UUID, Tuple[int, float]]" = OrderedDict()
+        self._set_max = redis.register_script(_SET_MAX_LUA)
+        self.logger = structlog.get_logger(__name__)
+
+    def _key(self, user_id: UUID) -> str:
+        return f"{self.KEY_PREFIX}{user_id}"
+
+    @property
+    def _healthy(self) -> bool:
+        return self.bus.is_synced(self.topic)
+
+    # ─── invalidation bus ─────────────────────────────────────────────────────
+
+    def handle(self, message: InvalidationMessage) -> None:
+        try:
+            self._remember(UUID(message.key), int(message.value or ""))
+        except ValueError:
+            self.logger.warning(
+                "Неверное сообщение эпохи токенов", key=message.key, value=message.value
+            )
+
+    async def resync(self) -> None:
+        # пропущенные за время обрыва bump'ы — берём заново из Redis/БД
+        self._entries.clear()
+
+    # ─── local tier ───────────────────────────────────────────────────────────
+
+    def _get_local(self, user_id: UUID) -> Optional[int]:
+        if not self._healthy:
+            return None
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] >= self.local_ttl_seconds:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[0]
+
+    def _remember(self, user_id: UUID, epoch: int) -> int:
+        if not self._healthy:
+            return epoch
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > epoch:
+            epoch = entry[0]
+        self._entries[user_id] = (epoch, time.monotonic())
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.local_max_entries:
+            self._entries.popitem(last=False)
+        return epoch
+
+    # ─── API ──────────────────────────────────────────────────────────────────
+
+    async def get(self, user_id: UUID) -> int:
+        epoch = self._get_local(user_id)
+        if epoch is not None:
+            metrics.inc("token_epoch.local_hits")
+            return epoch
+
+        metrics.inc("token_epoch.local_misses")
+        try:
+            raw = await self.redis.get(self._key(user_id))
+        except RedisError as e:
+            metrics.inc("token_epoch.redis_errors")
+            self.logger.warning("Redis недоступен, эпоха из БД", error=str(e))
+            return await self.loader(user_id) or 0
+
+        if raw is not None:
+            return self._remember(user_id, int(raw))
+
+        epoch = await self.loader(user_id)
+        if epoch is None:
+            return 0
+        try:
+            epoch = int(
+                await self._set_max(
+                    keys=[self._key(user_id)], args=[epoch, self.redis_ttl_seconds]
+                )
+            )
+        except RedisError as e:
+            metrics.inc("token_epoch.redis_errors")
+            self.logger.warning("Не удалось записать эпоху в Redis", error=str(e))
+        return self._remember(user_id, epoch)
+
+    async def publish(self, user_id: UUID, epoch: int) -> None:
+        self._remember(user_id, epoch)
+        metrics.inc("token_epoch.bumps")
+        try:
+            await self._set_max(
+                keys=[self._key(user_id)], args=[epoch, self.redis_ttl_seconds]
+            )
+            await self.bus.publish(self.topic, str(user_id), str(epoch))
+        except RedisError as e:
+            # эпоха уже закоммичена в БД — запрос не валим. Удаляем копию,
+            # чтобы чтения пошли в БД; L1 других воркеров догонит не позже
+            # local_ttl_seconds
+            metrics.inc("token_epoch.redis_errors")
+            self.logger.error(
+                "Не удалось разослать новую эпоху токенов",
+                user_id=str(user_id),
+                error=str(e),
+            )
+            await self._drop(user_id)
+
+    async def _drop(self, user_id: UUID) -> None:
+        try:
+            await self.redis.delete(self._key(user_id))
+        except RedisError as e:
+            # копия истечёт через redis_ttl_seconds
+            metrics.inc("token_epoch.redis_errors")
+            self.logger.error(
+                "Не удалось удалить устаревшую эпоху токенов из Redis",
+                user_id=str(user_id),
+                error=str(e),
+            )
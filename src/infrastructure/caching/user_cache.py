@@ -0,0 +1,301 @@
+import asyncio
+import dataclasses
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.metrics.registry import metrics
+from src.infrastructure.caching.invalidation_bus import (
+    InvalidationBus,
+    InvalidationMessage,
+    InvalidationSubscriber,
+)
+from src.domain.entities.user import User
+from src.domain.value_objects import Email, HashedPassword
+from src.infrastructure.caching.serializers import PayloadSerializer, SerializationError
+
+UserLoader = Callable[[], Awaitable[Optional[User]]]
+
+# Кладём значение, только если по ключу не было недавней инвалидации:
+# иначе чтение из БД, начатое до коммита изменения, могло бы вернуть в Redis
+# старую версию уже после DEL
+_POPULATE_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+
+def _dt(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _parse_dt(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+# Хеш пароля в кеш не попадает (user:{id} в общем Redis читают все сервисы
+# с доступом к нему): пользователь из кеша — для авторизации запроса
+# (get_current_user), проверка пароля идёт по get_by_email мимо кеша
+REDACTED_PASSWORD = HashedPassword("$redacted")
+
+
+def _redacted(user: User) -> User:
+    return dataclasses.replace(user, hashed_password=REDACTED_PASSWORD)
+
+
+def _user_to_dict(user: User) -> Dict[str, Any]:
+    return {
+        "id": str(user.id),
+        "email": user.email.value,
+        "created_at": _dt(user.created_at),
+        "updated_at": _dt(user.updated_at),
+        "last_login_at": _dt(user.last_login_at),
+        "is_active": user.is_active,
+        "email_verified": user.email_verified,
+        "token_epoch": user.token_epoch,
+    }
+
+
+def _user_from_dict(data: Dict[str, Any]) -> User:
+    return User(
+        id=UUID(data["id"]),
+        email=Email.from_trusted(data["email"]),
+        hashed_password=REDACTED_PASSWORD,
+        created_at=_parse_dt(data.get("created_at")),
+        updated_at=_parse_dt(data.get("updated_at")),
+        last_login_at=_parse_dt(data.get("last_login_at")),
+        is_active=data["is_active"],
+        email_verified=data["email_verified"],
+        token_epoch=data.get("token_epoch", 0),
+    )
+
+
+class UserCache(InvalidationSubscriber):
+    """
+    Двухуровневый cache-aside для пользователей по id.
+
+    • L1 — in-process LRU с TTL (на воркер);
+    • L2 — Redis (user:{id}, общий для всех воркеров и подов);
+    • промах обоих уровней идёт в БД; одновременные промахи по одному id
+      ждут один запрос (single-flight);
+    • invalidate() (после коммита изменения) удаляет ключ в Redis, ставит короткий
+      tombstone и публикует id в шину инвалидации (topic users) — остальные
+      воркеры выкидывают его из L1;
+    • пока шина не подключена, L1 не используется (иначе не узнаем
+      об изменениях на других воркерах), после переподключения L1 очищается.
+
+    last_login_at в кеше может отставать (пишется в обход репозитория,
+    см. BufferedLoginTracker) — не больше TTL. hashed_password у пользователей
+    из кеша — REDACTED_PASSWORD.
+    """
+
+    KEY_PREFIX = "user:"
+    topic = "users"
+
+    def __init__(
+        self,
+        redis: Redis,
+        bus: InvalidationBus,
+        serializer: PayloadSerializer,
+        local_max_entries: int = 10_000,
+        local_ttl_seconds: float = 30.0,
+        redis_ttl_seconds: int = 300,
+        tombstone_seconds: float = 5.0,
+        enabled: bool = True,
+    ) -> None:
+        self.redis = redis
+        self.bus = bus
+        self.serializer = serializer
+        self.local_max_entries = local_max_entries
+        self.local_ttl_seconds = local_ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.tombstone_seconds = tombstone_seconds
+        self.enabled = enabled
+
+        # user_id -> (user, stored_at)
+        self._entries: "OrderedDict[UUID, Tuple[User, float]]" = OrderedDict()
+        # растёт на каждую инвалидацию: загруженное «во время» неё в L1 не кладём
+        self._epoch = 0
+        # single-flight: user_id -> future с (завершён, значение, ошибка)
+        self._inflight: Dict[UUID, asyncio.Future] = {}
+        self._populate = redis.register_script(_POPULATE_LUA)
+        self.logger = structlog.get_logger(__name__)
+
+    def _key(self, user_id: UUID) -> str:
+        # hash tag: значение и tombstone в одном слоте кластера
+        return f"{self.KEY_PREFIX}{{{user_id}}}"
+
+    def _tombstone_key(self, user_id: UUID) -> str:
+        return f"{self._key(user_id)}:inv"
+
+    @property
+    def _healthy(self) -> bool:
+        return self.bus.is_synced(self.topic)
+
+    # ─── invalidation bus ─────────────────────────────────────────────────────
+
+    def handle(self, message: InvalidationMessage) -> None:
+        try:
+            user_id = UUID(message.key)
+        except ValueError:
+            return
+        self._evict(user_id)
+
+    async def resync(self) -> None:
+        # пока были отключены, инвалидации могли потеряться
+        self._epoch += 1
+        self.clear()
+
+    # ─── cache API ────────────────────────────────────────────────────────────
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _evict(self, user_id: UUID) -> None:
+        self._epoch += 1
+        self._entries.pop(user_id, None)
+
+    def _get_local(self, user_id: UUID) -> Optional[User]:
+        if not self._healthy:
+            return None
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] >= self.local_ttl_seconds:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[0]
+
+    def _put_local(self, user: User, epoch: int) -> None:
+        # если за время загрузки пришла инвалидация — не кешируем
+        if not self._healthy or epoch != self._epoch:
+            return
+        self._entries[user.id] = (user, time.monotonic())
+        self._entries.move_to_end(user.id)
+        if len(self._entries) > self.local_max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, user_id: UUID, loader: UserLoader) -> Optional[User]:
+        if not self.enabled:
+            return await loader()
+
+        user = self._get_local(user_id)
+        # summary со значениями 0/1: avg — доля попаданий
+        metrics.observe("user_cache.local_hit_ratio", 1.0 if user else 0.0)
+        if user is not None:
+            metrics.inc("user_cache.local_hits")
+            return user
+
+        while (waiter := self._inflight.get(user_id)) is not None:
+            metrics.inc("user_cache.coalesced")
+            done, value, error = await asyncio.shield(waiter)
+            if error is not None:
+                raise error
+            if done:
+                return value
+            # загружавший запрос отменён — загружаем сами
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = waiter
+        try:
+            value = await self._load(user_id, loader)
+        except asyncio.CancelledError:
+            waiter.set_result((False, None, None))
+            raise
+        except Exception as e:
+            waiter.set_result((True, None, e))
+            raise
+        else:
+            waiter.set_result((True, value, None))
+            return value
+        finally:
+            self._inflight.pop(user_id, None)
+
+    async def _load(self, user_id: UUID, loader: UserLoader) -> Optional[User]:
+        epoch = self._epoch
+        key = self._key(user_id)
+
+        try:
+            raw = await self.redis.get(key)
+        except RedisError as e:
+            metrics.inc("user_cache.redis_errors")
+            self.logger.warning(
+                "Redis недоступен, читаем пользователя из БД", error=str(e)
+            )
+            loaded = await loader()
+            return _redacted(loaded) if loaded is not None else None
+
+        if raw is not None:
+            try:
+                user = _user_from_dict(self.serializer.loads(raw))
+            except (SerializationError, KeyError, ValueError):
+                metrics.inc("user_cache.decode_errors")
+            else:
+                metrics.inc("user_cache.redis_hits")
+                metrics.observe("user_cache.redis_hit_ratio", 1.0)
+                self._put_local(user, epoch)
+                return user
+
+        metrics.inc("user_cache.misses")
+        metrics.observe("user_cache.redis_hit_ratio", 0.0)
+        loaded = await loader()
+        # отсутствующих пользователей не кешируем
+        if loaded is None:
+            return None
+        # без хеша и на промахе: ответ не зависит от того, откуда он взят
+        user = _redacted(loaded)
+
+        try:
+            await self._populate(
+                keys=[key, self._tombstone_key(user_id)],
+                args=[
+                    self.serializer.dumps(_user_to_dict(user)),
+                    self.redis_ttl_seconds,
+                ],
+            )
+        except RedisError as e:
+            metrics.inc("user_cache.redis_errors")
+            self.logger.warning(
+                "Не удалось записать пользователя в Redis", error=str(e)
+            )
+        self._put_local(user, epoch)
+        return user
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Вызывается после коммита изменения пользователя"""
+        if not self.enabled:
+            return
+        self._evict(user_id)
+        metrics.inc("user_cache.invalidations")
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.set(
+                    self._tombstone_key(user_id),
+                    1,
+                    px=int(self.tombstone_seconds * 1000),
+                )
+                pipe.delete(self._key(user_id))
+                await pipe.execute()
+            await self.bus.publish(self.topic, str(user_id))
+        except RedisError as e:
+            # запись в БД уже закоммичена: остальные воркеры увидят изменение
+            # не позже TTL своих уровней
+            metrics.inc("user_cache.redis_errors")
+            self.logger.error(
+                "Не удалось инвалидировать пользователя в Redis",
+                user_id=str(user_id),
+                error=str(e),
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -5,6 +5,7 @@ from .providers import (
     ConfigProvider,
     DbProvider,
     EmailProvider,
+    EmailFilterProvider,
     Hasherrovider,
     JwtProvider,
     RateLimitProvider,
@@ -21,6 +22,7 @@ _PROVIDERS = [
     ConfigProvider(),
     DbProvider(),
     EmailProvider(),
+    EmailFilterProvider(),
     Hasherrovider(),
     JwtProvider(),
     RateLimitProvider(),
@@ -2,6 +2,7 @@ from .auth import AuthProvider
 from .config import ConfigProvider
 from .db import DbProvider
 from .email import EmailProvider
+from .email_filter import EmailFilterProvider
 from .hasher import Hasherrovider
 from .jwt import JwtProvider
 from .rate_limit import RateLimitProvider
@@ -16,6 +17,7 @@ __all__ = [
     "ConfigProvider",
     "DbProvider",
     "EmailProvider",
+    "EmailFilterProvider",
     "Hasherrovider",
     "JwtProvider",
     "RateLimitProvider",
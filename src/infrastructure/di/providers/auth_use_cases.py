@@ -11,6 +11,7 @@ from src.application.use_cases import (
     JWKSUseCase,
     RefreshTokensUseCase,
     LogoutUseCase,
+    SearchUsersUseCase,
 )
 
 
@@ -30,3 +31,4 @@ class AuthUseCaseProvider(Provider):
     jwks = provide(JWKSUseCase, scope=Scope.REQUEST)
     refresh = provide(RefreshTokensUseCase, scope=Scope.REQUEST)
     logout = provide(LogoutUseCase, scope=Scope.REQUEST)
+    search_users = provide(SearchUsersUseCase, scope=Scope.REQUEST)
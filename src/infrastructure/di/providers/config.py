@@ -1,7 +1,10 @@
 from dishka import FromDishka, Provider, Scope, provide
 from src.core.settings import (
+    AdminSettings,
+    AuditLogConfig,
     VerificationCodeConfig,
     RateLimitConfig,
+    LocalRateLimitConfig,
     DatabaseSettings,
     RedisSettings,
     JwtSettings,
@@ -21,6 +24,18 @@ class ConfigProvider(Provider):
     def rate_limit(self) -> RateLimitConfig:
         return RateLimitConfig()
 
+    @provide(scope=Scope.APP)
+    def local_rate_limit(self) -> LocalRateLimitConfig:
+        return LocalRateLimitConfig()
+
+    @provide(scope=Scope.APP)
+    def admin(self) -> AdminSettings:
+        return AdminSettings()
+
+    @provide(scope=Scope.APP)
+    def audit_log(self) -> AuditLogConfig:
+        return AuditLogConfig()
+
     @provide(scope=Scope.APP)
     def db_settings(self) -> DatabaseSettings:
         return DatabaseSettings()
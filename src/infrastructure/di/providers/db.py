@@ -1,4 +1,4 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from dishka import Provider, Scope, provide
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
@@ -6,23 +6,50 @@ from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
 )
+from src.core.settings.audit import AuditLogConfig
 from src.core.settings.database import DatabaseSettings
 
-from src.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
-from src.application.interfaces import AbstractUnitOfWork
+from src.infrastructure.caching.user_cache import UserCache
+from src.infrastructure.persistence.asyncpg_options import asyncpg_connect_args
+from src.infrastructure.persistence.audit_log import BufferedAuditLog
+from src.infrastructure.persistence.login_tracker import BufferedLoginTracker
+from src.infrastructure.persistence.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    PoolLivenessChecker,
+    instrument_pool,
+)
+from src.infrastructure.persistence.replica_router import ReplicaNode, ReplicaRouter
+from src.infrastructure.persistence.unit_of_work import (
+    ReadOnlySessionFactory,
+    SqlAlchemyReadOnlyUnitOfWork,
+    SqlAlchemyUnitOfWork,
+)
+from src.application.interfaces import (
+    AbstractAuditLog,
+    AbstractLoginTracker,
+    AbstractReadOnlyUnitOfWork,
+    AbstractUnitOfWork,
+    PrimaryReadOnlyUnitOfWork,
+)
 
 
 class DbProvider(Provider):
     @provide(scope=Scope.APP)
-    def engine(self, db_settings: DatabaseSettings) -> AsyncEngine:
-        return create_async_engine(
-            url=str(db_settings.get_url()),
-            pool_size=db_settings.pool_size,
-            max_overflow=db_settings.max_overflow,
-            echo=db_settings.echo,
-            pool_pre_ping=True,
-            future=True,
+    async def engine(
+        self, db_settings: DatabaseSettings
+    ) -> AsyncGenerator[AsyncEngine, None]:
+        engine = _create_engine(str(db_settings.get_url()), "primary", db_settings)
+        checker = PoolLivenessChecker(
+            engine,
+            interval=db_settings.pool_liveness_check_interval,
+            timeout=db_settings.pool_liveness_check_timeout,
         )
+        await checker.start()
+        try:
+            yield engine
+        finally:
+            await checker.stop()
+            await engine.dispose()
 
     @provide(scope=Scope.APP)
     def session_factory(
@@ -34,21 +61,145 @@ class DbProvider(Provider):
             class_=AsyncSession,
         )
 
+    @provide(scope=Scope.APP)
+    async def replica_router(
+        self, engine: AsyncEngine, db_settings: DatabaseSettings
+    ) -> AsyncGenerator[ReplicaRouter, None]:
+        # живость реплик проверяет сам роутер
+        replica_engines = [
+            _create_engine(
+                replica.dsn,
+                f"replica{i}",
+                db_settings,
+                pool_size=db_settings.replica_pool_size,
+                max_overflow=db_settings.replica_max_overflow,
+            )
+            for i, replica in enumerate(db_settings.replicas)
+        ]
+        router = ReplicaRouter(
+            primary=_read_only_sessionmaker(engine),
+            replicas=[
+                ReplicaNode(
+                    name=f"replica{i}",
+                    session_factory=_read_only_sessionmaker(replica_engine),
+                    weight=replica.weight,
+                )
+                for i, (replica, replica_engine) in enumerate(
+                    zip(db_settings.replicas, replica_engines)
+                )
+            ],
+            health_check_interval=db_settings.replica_health_check_interval,
+            health_check_timeout=db_settings.replica_health_check_timeout,
+            max_lag_seconds=db_settings.replica_max_lag_seconds,
+        )
+        await router.start()
+        try:
+            yield router
+        finally:
+            await router.stop()
+            for replica_engine in replica_engines:
+                await replica_engine.dispose()
+
+    @provide(scope=Scope.APP)
+    async def login_tracker(
+        self, engine: AsyncEngine, db_settings: DatabaseSettings
+    ) -> AsyncGenerator[AbstractLoginTracker, None]:
+        tracker = BufferedLoginTracker(
+            engine,
+            flush_interval=db_settings.last_login_flush_interval,
+            max_pending=db_settings.last_login_max_pending,
+        )
+        await tracker.start()
+        try:
+            yield tracker
+        finally:
+            # финальный сброс буфера до закрытия engine
+            await tracker.stop()
+
+    @provide(scope=Scope.APP)
+    async def audit_log(
+        self, engine: AsyncEngine, audit_cfg: AuditLogConfig
+    ) -> AsyncGenerator[AbstractAuditLog, None]:
+        audit_log = BufferedAuditLog(
+            engine,
+            flush_interval=audit_cfg.flush_interval,
+            batch_size=audit_cfg.batch_size,
+            max_buffer=audit_cfg.max_buffer,
+            enabled=audit_cfg.enabled,
+        )
+        await audit_log.start()
+        try:
+            yield audit_log
+        finally:
+            # дописываем остаток буфера до закрытия engine
+            await audit_log.stop()
+
+    @provide(scope=Scope.REQUEST)
+    def read_only_session_factory(
+        self, router: ReplicaRouter
+    ) -> ReadOnlySessionFactory:
+        # реплика выбирается один раз на запрос
+        return ReadOnlySessionFactory(router.choose())
+
     @provide(scope=Scope.REQUEST)
     def session(
         self, session_factory: "async_sessionmaker[AsyncSession]"
     ) -> AsyncSession:
         return session_factory()
 
-    uow = provide(
-        SqlAlchemyUnitOfWork,
-        provides=AbstractUnitOfWork,
-        scope=Scope.REQUEST,
+    @provide(scope=Scope.REQUEST)
+    def uow(self, session: AsyncSession, user_cache: UserCache) -> AbstractUnitOfWork:
+        return SqlAlchemyUnitOfWork(session, user_cache=user_cache)
+
+    # Выбирается use case'ом через тип зависимости
+    @provide(scope=Scope.REQUEST)
+    def read_only_uow(
+        self, session_factory: ReadOnlySessionFactory, user_cache: UserCache
+    ) -> AbstractReadOnlyUnitOfWork:
+        return SqlAlchemyReadOnlyUnitOfWork(session_factory, user_cache=user_cache)
+
+    # Чтения сразу после записи: всегда primary, без отставания реплик
+    @provide(scope=Scope.REQUEST)
+    def primary_read_only_uow(
+        self, router: ReplicaRouter, user_cache: UserCache
+    ) -> PrimaryReadOnlyUnitOfWork:
+        return PrimaryReadOnlyUnitOfWork(
+            SqlAlchemyReadOnlyUnitOfWork(
+                ReadOnlySessionFactory(router.primary), user_cache=user_cache
+            )
+        )
+
+
+def _create_engine(
+    url: str,
+    pool_name: str,
+    db_settings: DatabaseSettings,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+) -> AsyncEngine:
+    engine = create_async_engine(
+        url=url,
+        pool_size=pool_size if pool_size is not None else db_settings.pool_size,
+        max_overflow=(
+            max_overflow if max_overflow is not None else db_settings.max_overflow
+        ),
+        echo=db_settings.echo,
+        pool_pre_ping=db_settings.pool_pre_ping,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_logging_name=pool_name,
+        connect_args=asyncpg_connect_args(
+            db_settings.statement_cache_size, db_settings.pgbouncer_mode
+        ),
+        future=True,
     )
+    instrument_pool(engine)
+    return engine
 
-    @provide(scope=Scope.APP)
-    async def engine_shutdown(self, engine: AsyncEngine) -> AsyncGenerator[None, None]:
-        try:
-            yield
-        finally:
-            await engine.dispose()
+
+def _read_only_sessionmaker(engine: AsyncEngine) -> "async_sessionmaker[AsyncSession]":
+    # соединения выдаются в AUTOCOMMIT (без BEGIN/COMMIT)
+    return async_sessionmaker(
+        bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
@@ -0,0 +1,33 @@
+from functools import partial
+from typing import AsyncGenerator
+
+from dishka import Provider, Scope, provide
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.application.interfaces import AbstractEmailFilter
+from src.core.settings import RedisSettings
+from src.infrastructure.caching.email_bloom_filter import RedisEmailBloomFilter
+from src.infrastructure.persistence.repositories.user import stream_registered_emails
+
+
+class EmailFilterProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def email_filter(
+        self, redis_client: Redis, engine: AsyncEngine, redis_settings: RedisSettings
+    ) -> AsyncGenerator[AbstractEmailFilter, None]:
+        email_filter = RedisEmailBloomFilter(
+            redis=redis_client,
+            capacity=redis_settings.email_filter_capacity,
+            error_rate=redis_settings.email_filter_error_rate,
+            backend=redis_settings.email_filter_backend,
+            enabled=redis_settings.email_filter_enabled,
+            rebuild_seconds=redis_settings.email_filter_rebuild_seconds,
+            check_interval=redis_settings.email_filter_check_interval,
+        )
+        # построение из users идёт в фоне, старт приложения не блокируется
+        await email_filter.start(partial(stream_registered_emails, engine))
+        try:
+            yield email_filter
+        finally:
+            await email_filter.stop()
@@ -1,13 +1,42 @@
 from dishka import Provider, Scope, provide
-from src.application.interfaces import AbstractRateLimitRepository
+from src.application.interfaces import (
+    AbstractRateLimitRepository,
+    SharedRateLimitRepository,
+)
+from src.core.rate_limit.token_bucket import TokenBucketLimiter
+from src.core.settings import LocalRateLimitConfig
 from src.infrastructure.caching.repositories.rate_limit_repository_impl import (
     RateLimitRepository,
 )
+from src.infrastructure.caching.repositories.local_prefilter_rate_limit import (
+    LocalPrefilterRateLimitRepository,
+)
 
 
 class RateLimitProvider(Provider):
-    rate_limit_repo = provide(
-        RateLimitRepository,
-        provides=AbstractRateLimitRepository,
-        scope=Scope.APP,
-    )
+    redis_rate_limit_repo = provide(RateLimitRepository, scope=Scope.APP)
+
+    @provide(scope=Scope.APP)
+    def shared_rate_limit_repo(
+        self, redis_repo: RateLimitRepository
+    ) -> SharedRateLimitRepository:
+        return SharedRateLimitRepository(redis_repo)
+
+    @provide(scope=Scope.APP)
+    def rate_limit_repo(
+        self,
+        redis_repo: RateLimitRepository,
+        local_cfg: LocalRateLimitConfig,
+    ) -> AbstractRateLimitRepository:
+        # Локальный pre-filter включается опционально
+        if not local_cfg.enabled:
+            return redis_repo
+
+        return LocalPrefilterRateLimitRepository(
+            inner=redis_repo,
+            bucket=TokenBucketLimiter(
+                capacity=local_cfg.key_capacity,
+                refill_per_second=local_cfg.key_refill_per_second,
+                max_entries=local_cfg.max_entries,
+            ),
+        )
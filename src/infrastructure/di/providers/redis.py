@@ -1,32 +1,143 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
 from dishka import Provider, Scope, provide
-from redis.asyncio import Redis, from_url
+from redis.asyncio import Redis
 
 from src.core.settings import RedisSettings
+from src.core.settings.redis import RedisPoolSettings
+from src.infrastructure.caching.serializers import PayloadSerializer, build_serializer
+from src.infrastructure.caching.client_side_cache import RedisClientSideCache
+from src.infrastructure.caching.invalidation_bus import InvalidationBus
+from src.infrastructure.caching.user_cache import UserCache
+from src.infrastructure.caching.redis_clients import (
+    InstrumentedBlockingConnectionPool,
+    RateLimitRedis,
+    SessionRedis,
+    VerificationRedis,
+)
+
+
+@asynccontextmanager
+async def _redis_client(
+    name: str,
+    redis_settings: RedisSettings,
+    pool_settings: Optional[RedisPoolSettings] = None,
+) -> AsyncIterator[Redis]:
+    """Клиент со своим инструментированным пулом; закрывается при выходе"""
+    pool_settings = pool_settings or RedisPoolSettings()
+    pool = InstrumentedBlockingConnectionPool.from_url(
+        redis_settings.get_url(pool_settings),
+        pool_name=name,
+        max_connections=pool_settings.max_connections or redis_settings.max_connections,
+        timeout=pool_settings.pool_timeout,
+        socket_timeout=pool_settings.socket_timeout,
+        socket_connect_timeout=pool_settings.socket_connect_timeout,
+        # bytes на выходе: значения могут быть бинарными (msgpack)
+        decode_responses=False,
+    )
+    client = Redis(connection_pool=pool)
+    try:
+        await client.ping()
+    except Exception as e:
+        await client.aclose()
+        await pool.disconnect()
+        raise RuntimeError(f"Cannot connect to Redis ({name})") from e
+
+    try:
+        yield client
+    finally:
+        await client.aclose()
+        await pool.disconnect()
 
 
 class RedisProvider(Provider):
-    # Основной клиент — просто Redis (без AsyncGenerator)
-    @provide(scope=Scope.APP)
-    async def redis_client(self, redis_settings: RedisSettings) -> Redis:
-        client = from_url(
-            redis_settings.get_url(),
-            decode_responses=True,
-            socket_timeout=5,
-            socket_connect_timeout=5,
+    # Общий клиент (для всего, что не выделено в отдельную подсистему)
+    @provide(scope=Scope.APP)
+    async def redis_client(
+        self, redis_settings: RedisSettings
+    ) -> AsyncGenerator[Redis, None]:
+        async with _redis_client("default", redis_settings) as client:
+            yield client
+
+    @provide(scope=Scope.APP)
+    async def rate_limit_redis(
+        self, redis_settings: RedisSettings
+    ) -> AsyncGenerator[RateLimitRedis, None]:
+        async with _redis_client(
+            "rate_limit", redis_settings, redis_settings.rate_limit
+        ) as client:
+            yield RateLimitRedis(client)
+
+    @provide(scope=Scope.APP)
+    async def verification_redis(
+        self, redis_settings: RedisSettings
+    ) -> AsyncGenerator[VerificationRedis, None]:
+        async with _redis_client(
+            "verification", redis_settings, redis_settings.verification
+        ) as client:
+            yield VerificationRedis(client)
+
+    @provide(scope=Scope.APP)
+    async def session_redis(
+        self, redis_settings: RedisSettings
+    ) -> AsyncGenerator[SessionRedis, None]:
+        async with _redis_client(
+            "sessions", redis_settings, redis_settings.sessions
+        ) as client:
+            yield SessionRedis(client)
+
+    @provide(scope=Scope.APP)
+    def payload_serializer(self, redis_settings: RedisSettings) -> PayloadSerializer:
+        return build_serializer(redis_settings.serializer)
+
+    @provide(scope=Scope.APP)
+    async def client_side_cache(
+        self, redis_client: VerificationRedis, redis_settings: RedisSettings
+    ) -> AsyncGenerator[RedisClientSideCache, None]:
+        cache = RedisClientSideCache(
+            redis=redis_client,
+            prefixes=redis_settings.client_cache_prefixes,
+            max_entries=redis_settings.client_cache_max_entries,
+            ttl_seconds=redis_settings.client_cache_ttl_seconds,
+            verify_sample_rate=redis_settings.client_cache_verify_sample_rate,
+            enabled=redis_settings.client_cache_enabled,
         )
+        await cache.start()
         try:
-            await client.ping()
-        except Exception as e:
-            await client.aclose()
-            raise RuntimeError("Cannot connect to Redis") from e
-
-        return client
+            yield cache
+        finally:
+            await cache.stop()
 
-    # Отдельный провайдер для закрытия при shutdown приложения
-    @provide(scope=Scope.APP, provides=AsyncGenerator[None, None])
-    async def redis_shutdown(self, redis_client: Redis) -> AsyncGenerator[None, None]:
+    @provide(scope=Scope.APP)
+    async def invalidation_bus(
+        self, redis_client: Redis, redis_settings: RedisSettings
+    ) -> AsyncGenerator[InvalidationBus, None]:
+        # слушатель запускается из lifespan приложения; stop() здесь — страховка
+        # для контейнеров без lifespan (CLI, тесты)
+        bus = InvalidationBus(redis_client, channel=redis_settings.invalidation_channel)
         try:
-            yield
+            yield bus
         finally:
-            await redis_client.aclose()
+            await bus.stop()
+
+    @provide(scope=Scope.APP)
+    def user_cache(
+        self,
+        redis_client: Redis,
+        bus: InvalidationBus,
+        serializer: PayloadSerializer,
+        redis_settings: RedisSettings,
+    ) -> UserCache:
+        cache = UserCache(
+            redis=redis_client,
+            bus=bus,
+            serializer=serializer,
+            local_max_entries=redis_settings.user_cache_local_max_entries,
+            local_ttl_seconds=redis_settings.user_cache_local_ttl_seconds,
+            redis_ttl_seconds=redis_settings.user_cache_redis_ttl_seconds,
+            tombstone_seconds=redis_settings.user_cache_tombstone_seconds,
+            enabled=redis_settings.user_cache_enabled,
+        )
+        if cache.enabled:
+            bus.register(cache)
+        return cache
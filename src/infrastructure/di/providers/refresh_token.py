@@ -1,8 +1,21 @@
+from functools import partial
+
 from dishka import Provider, Scope, provide
-from src.application.interfaces import AbstractRefreshTokenRepository
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.application.interfaces import (
+    AbstractRefreshTokenRepository,
+    AbstractTokenDenylist,
+    AbstractTokenEpochStore,
+)
+from src.core.settings import RedisSettings
+from src.infrastructure.caching.invalidation_bus import InvalidationBus
+from src.infrastructure.caching.redis_clients import SessionRedis
 from src.infrastructure.caching.repositories.refresh_token import (
     RedisRefreshTokenRepository,
 )
+from src.infrastructure.caching.token_denylist import RedisTokenDenylist
+from src.infrastructure.caching.token_epoch import RedisTokenEpochStore
+from src.infrastructure.persistence.repositories.user import load_token_epoch
 
 
 class RefreshTokenProvider(Provider):
@@ -11,3 +24,39 @@ class RefreshTokenProvider(Provider):
         provides=AbstractRefreshTokenRepository,
         scope=Scope.APP,
     )
+
+    @provide(scope=Scope.APP)
+    def token_denylist(
+        self,
+        redis_client: SessionRedis,
+        bus: InvalidationBus,
+        redis_settings: RedisSettings,
+    ) -> AbstractTokenDenylist:
+        denylist = RedisTokenDenylist(
+            redis=redis_client,
+            bus=bus,
+            prune_interval=redis_settings.token_denylist_prune_interval,
+            enabled=redis_settings.token_denylist_enabled,
+        )
+        if denylist.enabled:
+            bus.register(denylist)
+        return denylist
+
+    @provide(scope=Scope.APP)
+    def token_epoch_store(
+        self,
+        redis_client: SessionRedis,
+        bus: InvalidationBus,
+        engine: AsyncEngine,
+        redis_settings: RedisSettings,
+    ) -> AbstractTokenEpochStore:
+        store = RedisTokenEpochStore(
+            redis=redis_client,
+            bus=bus,
+            loader=partial(load_token_epoch, engine),
+            local_max_entries=redis_settings.token_epoch_local_max_entries,
+            local_ttl_seconds=redis_settings.token_epoch_local_ttl_seconds,
+            redis_ttl_seconds=redis_settings.token_epoch_redis_ttl_seconds,
+        )
+        bus.register(store)
+        return store
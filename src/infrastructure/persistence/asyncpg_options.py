@@ -0,0 +1,31 @@
+from typing import Any, Dict
+from uuid import uuid4
+
+
+def _unique_statement_name() -> str:
+    # PgBouncer в transaction mode отдаёт разные серверные соединения,
+    # одинаковые имена prepared statements там конфликтуют
+    return f"__asyncpg_{uuid4()}__"
+
+
+def asyncpg_connect_args(
+    statement_cache_size: int, pgbouncer_mode: bool
+) -> Dict[str, Any]:
+    """
+    connect_args для create_async_engine с драйвером asyncpg.
+
+    • statement_cache_size — кеш prepared statements самого asyncpg;
+    • prepared_statement_cache_size — кеш prepared statements адаптера SQLAlchemy;
+    • в PgBouncer режиме оба кеша выключены, а имена statements уникальны,
+      поэтому чужое серверное соединение не увидит «висящий» statement.
+    """
+    if pgbouncer_mode:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return {
+        "statement_cache_size": statement_cache_size,
+        "prepared_statement_cache_size": statement_cache_size,
+    }
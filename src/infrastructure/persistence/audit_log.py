@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.application.interfaces import AbstractAuditLog, AuthEventType
+from src.core.metrics.registry import metrics
+
+_COLUMNS = ("occurred_at", "id", "event_type", "user_id", "email", "details")
+_TABLE = "auth_events"
+
+_Record = Tuple[datetime, UUID, str, Optional[UUID], Optional[str], Optional[str]]
+
+
+class BufferedAuditLog(AbstractAuditLog):
+    """
+    Асинхронный буферизованный writer событий в auth_events.
+
+    • record() только добавляет кортеж в deque — запрос никогда не ждёт БД;
+    • фоновая задача раз в flush_interval (или когда набралось batch_size)
+      пишет пачку бинарным COPY (asyncpg copy_records_to_table) — секция
+      выбирается самим Postgres по occurred_at;
+    • буфер ограничен max_buffer: при переполнении (БД недоступна) самые старые
+      события вытесняются, счётчик audit.dropped растёт;
+    • при ошибке COPY пачка возвращается в начало буфера;
+    • stop() дописывает остаток — вызывается при остановке приложения;
+      пачка, прерванная отменой фоновой задачи, тоже возвращается в буфер.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        flush_interval: float = 2.0,
+        batch_size: int = 1_000,
+        max_buffer: int = 50_000,
+        enabled: bool = True,
+    ) -> None:
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.enabled = enabled
+
+        self._buffer: Deque[_Record] = deque()
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.logger = structlog.get_logger(__name__)
+
+    def record(
+        self,
+        event_type: AuthEventType,
+        user_id: Optional[UUID] = None,
+        email: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            metrics.inc("audit.dropped")
+        self._buffer.append(
+            (
+                datetime.now(timezone.utc),
+                uuid4(),
+                event_type.value,
+                user_id,
+                email,
+                json.dumps(details, ensure_ascii=False) if details else None,
+            )
+        )
+        if len(self._buffer) >= self.batch_size:
+            self._flush_requested.set()
+
+    # ─── lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._buffer and await self.flush():
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            # пишем пачками, пока буфер не опустеет или запись не упадёт
+            while self._buffer and await self.flush():
+                pass
+
+    # ─── flush ────────────────────────────────────────────────────────────────
+
+    async def flush(self) -> int:
+        """Пишет одну пачку (до batch_size событий), возвращает число записанных"""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            count = min(len(self._buffer), self.batch_size)
+            batch = [self._buffer.popleft() for _ in range(count)]
+
+            start = time.perf_counter()
+            try:
+                async with self.engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    assert driver is not None
+                    await driver.copy_records_to_table(
+                        _TABLE, records=batch, columns=_COLUMNS
+                    )
+            except Exception as e:
+                metrics.inc("audit.flush_failures")
+                self.logger.warning(
+                    "Не удалось записать события аудита, повтор при следующем сбросе",
+                    events=len(batch),
+                    error=str(e),
+                )
+                self._requeue(batch)
+                return 0
+            except BaseException:
+                # отмена (stop()) посреди COPY: пачка допишется финальным сбросом
+                self._requeue(batch)
+                raise
+
+            metrics.inc("audit.written", len(batch))
+            metrics.observe("audit.flush_seconds", time.perf_counter() - start)
+            return len(batch)
+
+    def _requeue(self, batch: List[_Record]) -> None:
+        # возвращаем в начало, сохраняя порядок; лишнее сверх max_buffer — теряем
+        free = self.max_buffer - len(self._buffer)
+        if free < len(batch):
+            metrics.inc("audit.dropped", len(batch) - max(free, 0))
+            batch = batch[len(batch) - max(free, 0) :]
+        self._buffer.extendleft(reversed(batch))
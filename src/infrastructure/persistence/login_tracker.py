@@ -0,0 +1,151 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, cast
+from uuid import UUID
+
+import structlog
+from sqlalchemy import DateTime, Table, Uuid, column, or_, update, values
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.application.interfaces import AbstractLoginTracker
+from src.core.metrics.registry import metrics
+from src.infrastructure.persistence.models import UserModel
+
+# __table__ типизирован как FromClause — для insert/update/delete нужен Table
+_users = cast(Table, UserModel.__table__)
+
+
+class BufferedLoginTracker(AbstractLoginTracker):
+    """
+    Буфер last_login_at с объединением записей (write coalescing).
+
+    • record() только кладёт (user_id -> время) в словарь: повторные входы
+      одного пользователя до сброса схлопываются в одну строку;
+    • раз в flush_interval секунд (или раньше, если набралось max_pending)
+      буфер сбрасывается одним UPDATE ... FROM (VALUES ...) на батч;
+    • при ошибке записи данные возвращаются в буфер и уйдут со следующим сбросом;
+    • stop() делает финальный сброс — вызывается при остановке приложения;
+      сброс, прерванный отменой фоновой задачи, тоже возвращает данные в буфер.
+
+    Время входа — монотонно неубывающее: более старое значение не перетирает новое.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        flush_interval: float = 5.0,
+        max_pending: int = 10_000,
+        batch_size: int = 1_000,
+    ) -> None:
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+
+        self._pending: Dict[UUID, datetime] = {}
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.logger = structlog.get_logger(__name__)
+
+    def record(self, user_id: UUID, at: Optional[datetime] = None) -> None:
+        at = at or datetime.now(timezone.utc)
+        previous = self._pending.get(user_id)
+        if previous is not None:
+            metrics.inc("last_login.coalesced")
+            if previous >= at:
+                return
+        self._pending[user_id] = at
+        if len(self._pending) >= self.max_pending:
+            self._flush_requested.set()
+
+    # ─── lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    # ─── flush ────────────────────────────────────────────────────────────────
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+
+            start = time.perf_counter()
+            items = list(pending.items())
+            try:
+                async with self.engine.begin() as conn:
+                    for offset in range(0, len(items), self.batch_size):
+                        await conn.execute(
+                            self._update_stmt(items[offset : offset + self.batch_size])
+                        )
+            except Exception as e:
+                metrics.inc("last_login.flush_failures")
+                self.logger.warning(
+                    "Не удалось записать last_login_at, повтор при следующем сбросе",
+                    rows=len(items),
+                    error=str(e),
+                )
+                self._requeue(items)
+                return 0
+            except BaseException:
+                # отмена (stop()) посреди записи: транзакция откатится,
+                # записи уйдут финальным сбросом
+                self._requeue(items)
+                raise
+
+            metrics.inc("last_login.flushed_rows", len(items))
+            metrics.observe("last_login.flush_seconds", time.perf_counter() - start)
+            return len(items)
+
+    def _requeue(self, items) -> None:
+        # возвращаем в буфер, не затирая более свежие записи
+        for user_id, at in items:
+            current = self._pending.get(user_id)
+            if current is None or current < at:
+                self._pending[user_id] = at
+
+    @staticmethod
+    def _update_stmt(items):
+        batch = values(
+            column("id", Uuid()),
+            column("ts", DateTime(timezone=True)),
+            name="logins",
+        ).data(items)
+        # UPDATE users SET last_login_at = logins.ts FROM (VALUES ...) AS logins(id, ts)
+        return (
+            update(_users)
+            .where(_users.c.id == batch.c.id)
+            .where(
+                or_(
+                    _users.c.last_login_at.is_(None),
+                    _users.c.last_login_at < batch.c.ts,
+                )
+            )
+            # updated_at — про изменения профиля, onupdate тут не нужен
+            .values(last_login_at=batch.c.ts, updated_at=_users.c.updated_at)
+        )
@@ -1,5 +1,8 @@
-from .user import UserModel
+from .user import Base, UserModel
+from .auth_event import AuthEventModel
 
 __all__ = [
+    "Base",
     "UserModel",
+    "AuthEventModel",
 ]
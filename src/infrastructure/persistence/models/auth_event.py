@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import DateTime, Index, String, Uuid
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.persistence.models.user import Base
+
+
+class AuthEventModel(Base):
+    """
+    Журнал событий аутентификации.
+    Таблица секционирована по месяцам (RANGE по occurred_at); секции
+    auth_events_YYYY_MM создаёт/удаляет `python -m cli.main audit-partitions`.
+    Пишется только COPY из BufferedAuditLog, ORM здесь — для схемы и выборок.
+    """
+
+    __tablename__ = "auth_events"
+    __table_args__ = (
+        Index("ix_auth_events_user_id_occurred_at", "user_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    # ключ секционирования обязан входить в первичный ключ
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    user_id: Mapped[Optional[UUID]] = mapped_column(Uuid(as_uuid=True), nullable=True)
+    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    details: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
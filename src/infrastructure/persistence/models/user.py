@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Optional
 from uuid import uuid4, UUID
 
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase
-from sqlalchemy import String, Boolean, DateTime, func, Uuid
+from sqlalchemy import Index, Integer, String, Boolean, DateTime, func, text, Uuid
 from sqlalchemy.ext.asyncio import AsyncAttrs
 
 from src.domain.entities.user import User
@@ -23,10 +24,9 @@ class UserModel(Base):
         primary_key=True,
         default=uuid4,  # uuid4(), а не uuid.uuid4 — чуть быстрее и idiomatic
     )
+    # уникальность — по lower(email), см. ux_users_email_lower ниже
     email: Mapped[str] = mapped_column(
         String(255),
-        unique=True,
-        index=True,
         nullable=False,
     )
     hashed_password: Mapped[str] = mapped_column(
@@ -44,6 +44,11 @@ class UserModel(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # обновляется пачками через BufferedLoginTracker
+    last_login_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
     is_active: Mapped[bool] = mapped_column(
         Boolean,
         default=True,
@@ -54,6 +59,12 @@ class UserModel(Base):
         default=False,
         nullable=False,
     )
+    # эпоха токенов: access-токены с меньшей эпохой недействительны
+    token_epoch: Mapped[int] = mapped_column(
+        Integer,
+        server_default=text("0"),
+        nullable=False,
+    )
 
     def to_domain(self) -> User:
         """Конвертирует загруженную ORM-модель в чистую доменную сущность."""
@@ -63,8 +74,10 @@ class UserModel(Base):
             hashed_password=HashedPassword(self.hashed_password),
             created_at=self.created_at,
             updated_at=self.updated_at,
+            last_login_at=self.last_login_at,
             is_active=self.is_active,
             email_verified=self.email_verified,
+            token_epoch=self.token_epoch,
         )
 
     @classmethod
@@ -77,3 +90,19 @@ class UserModel(Base):
             is_active=user.is_active,
             email_verified=user.email_verified,
         )
+
+
+# Уникальный индекс по lower(email): варианты одного email в разном регистре
+# не могут сосуществовать. Запросы по email должны фильтровать по lower(email),
+# иначе планировщик этот индекс не использует
+Index("ux_users_email_lower", func.lower(UserModel.email), unique=True)
+
+# Админский поиск (SQlAlchemyUserRepository.search): триграммы по lower(email)
+# для LIKE 'prefix%' / '%substring%' и btree (created_at, id) для keyset-пагинации
+Index(
+    "ix_users_email_lower_trgm",
+    func.lower(UserModel.email).label("email_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"email_lower": "gin_trgm_ops"},
+)
+Index("ix_users_created_at_id", UserModel.created_at, UserModel.id)
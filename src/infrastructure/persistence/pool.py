@@ -0,0 +1,132 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+import structlog
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from src.core.metrics.registry import metrics
+
+# ключ в ConnectionPoolEntry.info: момент выдачи соединения из пула
+_CHECKED_OUT_AT = "checked_out_at"
+
+
+def _pool_name(pool: Pool) -> str:
+    # задаётся через create_async_engine(pool_logging_name=...),
+    # при recreate() после dispose() имя переносится в новый пул
+    return pool.logging_name or "default"
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, который пишет время ожидания соединения (checkout wait)
+    и таймауты ожидания в метрики под именем пула.
+    """
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.inc(f"db_pool.{_pool_name(self)}.checkout_timeouts")
+            raise
+        finally:
+            metrics.observe(
+                f"db_pool.{_pool_name(self)}.checkout_wait_seconds",
+                time.perf_counter() - start,
+            )
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """
+    Вешает на пул engine обработчики событий:
+      • checkout — число выданных соединений и использование overflow;
+      • checkin — сколько соединение было занято (hold duration);
+      • invalidate / soft_invalidate — инвалидации соединений.
+    """
+    sync_engine = engine.sync_engine
+    name = _pool_name(sync_engine.pool)
+
+    @event.listens_for(sync_engine.pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info[_CHECKED_OUT_AT] = time.perf_counter()
+        metrics.inc(f"db_pool.{name}.checkouts")
+        # пул берём с engine: после dispose() он пересоздаётся (слушатели переносятся)
+        overflow = sync_engine.pool.overflow()
+        if overflow > 0:
+            metrics.inc(f"db_pool.{name}.overflow_checkouts")
+            metrics.observe(f"db_pool.{name}.overflow_in_use", overflow)
+
+    @event.listens_for(sync_engine.pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop(_CHECKED_OUT_AT, None)
+        if started is not None:
+            metrics.observe(
+                f"db_pool.{name}.hold_seconds", time.perf_counter() - started
+            )
+
+    @event.listens_for(sync_engine.pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.inc(f"db_pool.{name}.invalidations")
+
+    @event.listens_for(sync_engine.pool, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.inc(f"db_pool.{name}.soft_invalidations")
+
+
+class PoolLivenessChecker:
+    """
+    Фоновая проверка живости БД вместо pool_pre_ping.
+
+    pre_ping добавляет SELECT 1 к каждому checkout; здесь один SELECT 1
+    раз в interval секунд. Если проверка не прошла — пул сбрасывается
+    (engine.dispose()): простаивающие соединения закрываются, занятые
+    отбрасываются при возврате, новые создаются заново.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float, timeout: float) -> None:
+        self.engine = engine
+        self.interval = interval
+        self.timeout = timeout
+        self.name = _pool_name(engine.sync_engine.pool)
+
+        self._task: Optional[asyncio.Task] = None
+        self.logger = structlog.get_logger(__name__)
+
+    async def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def check(self) -> bool:
+        try:
+            async with self.engine.connect() as conn:
+                await asyncio.wait_for(
+                    conn.execute(text("SELECT 1")), timeout=self.timeout
+                )
+            return True
+        except Exception as e:
+            metrics.inc(f"db_pool.{self.name}.liveness_failures")
+            self.logger.warning(
+                "Проверка живости БД не прошла, пул сброшен",
+                pool=self.name,
+                error=str(e),
+            )
+            await self.engine.dispose()
+            return False
@@ -0,0 +1,143 @@
+import asyncio
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.metrics.registry import metrics
+
+_REPLICATION_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+
+@dataclass
+class ReplicaNode:
+    name: str
+    session_factory: "async_sessionmaker[AsyncSession]"
+    weight: int = 1
+    healthy: bool = True
+    # состояние smooth weighted round-robin
+    current_weight: int = 0
+
+
+class ReplicaRouter:
+    """
+    Выбор фабрики сессий для read-only UoW.
+
+    • smooth weighted round-robin (как в nginx) по здоровым репликам —
+      трафик распределяется по весам без «пачек» в одну реплику;
+    • фоновая проверка здоровья (SELECT 1 с таймаутом), упавшая реплика
+      исключается из ротации и возвращается после успешной проверки;
+    • реплика, отставшая больше max_lag_seconds, тоже исключается —
+      так отставание чтений с реплик ограничено сверху;
+    • если здоровых реплик нет (или они не настроены) — чтения идут в primary.
+
+    Записи и read-your-writes сценарии сюда не попадают: записи идут через
+    AbstractUnitOfWork, чтения сразу после записи (логин, заполнение кеша
+    пользователей) — через PrimaryReadOnlyUnitOfWork; оба привязаны к primary.
+    """
+
+    def __init__(
+        self,
+        primary: "async_sessionmaker[AsyncSession]",
+        replicas: Sequence[ReplicaNode] = (),
+        health_check_interval: float = 5.0,
+        health_check_timeout: float = 2.0,
+        max_lag_seconds: Optional[float] = None,
+    ) -> None:
+        self.primary = primary
+        self.replicas: List[ReplicaNode] = list(replicas)
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.max_lag_seconds = max_lag_seconds
+
+        self._task: Optional[asyncio.Task] = None
+        self.logger = structlog.get_logger(__name__)
+
+    def choose(self) -> "async_sessionmaker[AsyncSession]":
+        best: Optional[ReplicaNode] = None
+        total = 0
+        for node in self.replicas:
+            if not node.healthy:
+                continue
+            node.current_weight += node.weight
+            total += node.weight
+            if best is None or node.current_weight > best.current_weight:
+                best = node
+
+        if best is None:
+            if self.replicas:
+                metrics.inc("db.read.primary_fallback")
+            return self.primary
+
+        best.current_weight -= total
+        metrics.inc(f"db.read.replica.{best.name}")
+        return best.session_factory
+
+    # ─── health checks ────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        if not self.replicas or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_check_interval)
+
+    async def check_health(self) -> None:
+        results = await asyncio.gather(*(self._probe(node) for node in self.replicas))
+        for node, healthy in zip(self.replicas, results):
+            if node.healthy != healthy:
+                self.logger.warning(
+                    "Статус реплики изменился", replica=node.name, healthy=healthy
+                )
+                # сбрасываем накопленный вес, чтобы вернувшаяся реплика
+                # не получила разом весь «долг» по трафику
+                node.current_weight = 0
+            node.healthy = healthy
+
+    async def _probe(self, node: ReplicaNode) -> bool:
+        try:
+            async with node.session_factory() as session:
+                if not self.max_lag_seconds:
+                    await asyncio.wait_for(
+                        session.execute(text("SELECT 1")),
+                        timeout=self.health_check_timeout,
+                    )
+                    return True
+                lag = await asyncio.wait_for(
+                    self._replication_lag(session),
+                    timeout=self.health_check_timeout,
+                )
+        except Exception:
+            metrics.inc(f"db.replica.{node.name}.probe_failed")
+            return False
+
+        metrics.observe(f"db.replica.{node.name}.lag_seconds", lag)
+        if lag > self.max_lag_seconds:
+            metrics.inc(f"db.replica.{node.name}.lagging")
+            return False
+        return True
+
+    async def _replication_lag(self, session: AsyncSession) -> float:
+        # всё воспроизведено — отставания нет, даже если primary давно не писал
+        # (иначе now() - replay_timestamp растёт на простаивающей базе)
+        result = await session.execute(text(_REPLICATION_LAG_SQL))
+        return float(result.scalar_one() or 0.0)
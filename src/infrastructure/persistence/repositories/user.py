@@ -1,34 +1,134 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, cast
 from uuid import UUID
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Table, delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from src.domain.entities.user import User
-from src.application.interfaces import AbstractUserRepository
+from src.domain.value_objects import Email, HashedPassword
+from src.application.interfaces import (
+    AbstractUserRepository,
+    UserCursor,
+    UserSearchMode,
+)
 from src.infrastructure.persistence.models import UserModel
 
+# __table__ типизирован как FromClause — для insert/update/delete нужен Table
+_users = cast(Table, UserModel.__table__)
+
+# Колонки для чтения через Core: без ORM-инструментирования и identity map
+_USER_COLUMNS = (
+    _users.c.id,
+    _users.c.email,
+    _users.c.hashed_password,
+    _users.c.created_at,
+    _users.c.updated_at,
+    _users.c.last_login_at,
+    _users.c.is_active,
+    _users.c.email_verified,
+    _users.c.token_epoch,
+)
+
+
+def _escape_like(value: str) -> str:
+    """Экранирует спецсимволы LIKE, чтобы «%» и «_» в запросе искались буквально"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _row_to_domain(row: Any) -> User:
+    """Собирает доменную сущность напрямую из строки результата"""
+    return User(
+        id=row.id,
+        # email в БД уже нормализован и провалидирован при регистрации
+        email=Email.from_trusted(row.email),
+        hashed_password=HashedPassword(row.hashed_password),
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        last_login_at=row.last_login_at,
+        is_active=row.is_active,
+        email_verified=row.email_verified,
+        token_epoch=row.token_epoch,
+    )
+
 
 class SQlAlchemyUserRepository(AbstractUserRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
-        stmt = select(UserModel).where(UserModel.id == user_id)
+        stmt = select(*_USER_COLUMNS).where(_users.c.id == user_id)
         result = await self.session.execute(stmt)
-        user_model = result.scalar_one_or_none()
-        return user_model.to_domain() if user_model else None
+        row = result.first()
+        return _row_to_domain(row) if row else None
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        stmt = select(UserModel).where(UserModel.email == email)
+        # lower(email) — по нему построен уникальный индекс ux_users_email_lower
+        stmt = select(*_USER_COLUMNS).where(func.lower(_users.c.email) == email.lower())
         result = await self.session.execute(stmt)
-        user_model = result.scalar_one_or_none()
-        return user_model.to_domain() if user_model else None
+        row = result.first()
+        return _row_to_domain(row) if row else None
 
     async def add(self, user: User) -> None:
         user_model = UserModel.from_domain(user)
         self.session.add(user_model)
 
+    async def add_if_absent(self, user: User) -> bool:
+        # INSERT ... ON CONFLICT (lower(email)) DO NOTHING RETURNING id:
+        # при конфликте строка не возвращается
+        stmt = (
+            insert(_users)
+            .values(
+                id=user.id,
+                email=user.email.value,
+                hashed_password=user.hashed_password.value,
+                is_active=user.is_active,
+                email_verified=user.email_verified,
+            )
+            .on_conflict_do_nothing(index_elements=[func.lower(_users.c.email)])
+            .returning(_users.c.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def delete(self, user_id: UUID) -> None:
+        await self.session.execute(delete(_users).where(_users.c.id == user_id))
+
+    async def search(
+        self,
+        query: str,
+        mode: UserSearchMode,
+        limit: int,
+        after: Optional[UserCursor] = None,
+    ) -> List[User]:
+        # lower(email) LIKE ... обслуживает GIN индекс ix_users_email_lower_trgm
+        # (pg_trgm) — и для префикса, и для подстроки
+        pattern = _escape_like(query.lower())
+        pattern = f"{pattern}%" if mode is UserSearchMode.PREFIX else f"%{pattern}%"
+        stmt = select(*_USER_COLUMNS).where(
+            func.lower(_users.c.email).like(pattern, escape="\\")
+        )
+        if after is not None:
+            # keyset: (created_at, id) > курсора — стоимость не растёт с номером страницы
+            stmt = stmt.where(
+                tuple_(_users.c.created_at, _users.c.id)
+                > tuple_(after.created_at, after.id)
+            )
+        stmt = stmt.order_by(_users.c.created_at, _users.c.id).limit(limit)
+        result = await self.session.execute(stmt)
+        return [_row_to_domain(row) for row in result]
+
+    async def bump_token_epoch(self, user_id: UUID) -> int:
+        stmt = (
+            update(_users)
+            .where(_users.c.id == user_id)
+            .values(token_epoch=_users.c.token_epoch + 1)
+            .returning(_users.c.token_epoch)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
     async def update(self, user: User) -> None:
         # Обычно делаем через merge или update-выражение
         stmt = (
@@ -50,3 +150,30 @@ class SQlAlchemyUserRepository(AbstractUserRepository):
             .values(hashed_password=hashed_password)
         )
         await self.session.execute(stmt)
+
+
+async def stream_registered_emails(
+    engine: AsyncEngine, since: Optional[datetime] = None, batch_size: int = 10_000
+) -> AsyncIterator[List[str]]:
+    """
+    Потоково отдаёт email пользователей батчами (серверный курсор).
+    В нижнем регистре — как их нормализует Email (старые строки могли
+    сохраниться в исходном регистре).
+    """
+    email = func.lower(_users.c.email).label("email")
+    stmt = select(email)
+    if since is not None:
+        stmt = stmt.where(_users.c.created_at >= since)
+    async with engine.connect() as conn:
+        result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions(batch_size):
+            yield [row.email for row in partition]
+
+
+async def load_token_epoch(engine: AsyncEngine, user_id: UUID) -> Optional[int]:
+    """Эпоха токенов пользователя из БД (источник истины для Redis-копии)"""
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(_users.c.token_epoch).where(_users.c.id == user_id)
+        )
+        return result.scalar_one_or_none()
@@ -1,15 +1,38 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from src.application.interfaces import AbstractUnitOfWork
+from typing import NewType, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.application.interfaces import (
+    AbstractUnitOfWork,
+    AbstractReadOnlyUnitOfWork,
+    AbstractUserRepository,
+)
+from src.infrastructure.caching.repositories.cached_user_repository import (
+    CachedUserRepository,
+)
+from src.infrastructure.caching.user_cache import UserCache
 from src.infrastructure.persistence.repositories.user import SQlAlchemyUserRepository
 
+# Фабрика сессий поверх engine с isolation_level=AUTOCOMMIT
+ReadOnlySessionFactory = NewType("ReadOnlySessionFactory", async_sessionmaker)
+
+
+def _user_repository(
+    session: AsyncSession, user_cache: Optional[UserCache]
+) -> AbstractUserRepository:
+    repository = SQlAlchemyUserRepository(session)
+    if user_cache is None:
+        return repository
+    return CachedUserRepository(repository, user_cache)
+
 
 class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, user_cache: Optional[UserCache] = None):
         self.session = session
+        self.user_cache = user_cache
 
     async def __aenter__(self) -> "SqlAlchemyUnitOfWork":
         # Репозитории создаём здесь — они используют текущую session
-        self.users = SQlAlchemyUserRepository(self.session)
+        self.users = _user_repository(self.session, self.user_cache)
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
@@ -19,6 +42,35 @@ class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
 
     async def commit(self) -> None:
         await self.session.commit()
+        # кеш сбрасывается только для закоммиченных изменений
+        if isinstance(self.users, CachedUserRepository):
+            await self.users.flush_invalidations()
 
     async def rollback(self) -> None:
         await self.session.rollback()
+        if isinstance(self.users, CachedUserRepository):
+            self.users.pending_invalidations.clear()
+
+
+class SqlAlchemyReadOnlyUnitOfWork(AbstractReadOnlyUnitOfWork):
+    """
+    Read-only UoW: сессия на AUTOCOMMIT соединении.
+    asyncpg не открывает транзакцию, поэтому запрос — это ровно один round trip
+    (без BEGIN и COMMIT). Соединение возвращается в пул при выходе из контекста.
+    """
+
+    def __init__(
+        self,
+        session_factory: ReadOnlySessionFactory,
+        user_cache: Optional[UserCache] = None,
+    ):
+        self.session_factory = session_factory
+        self.user_cache = user_cache
+
+    async def __aenter__(self) -> "SqlAlchemyReadOnlyUnitOfWork":
+        self.session = self.session_factory()
+        self.users = _user_repository(self.session, self.user_cache)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.session.close()
@@ -1,6 +1,14 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from src.core.settings.cors import cors_config
+from src.core.settings import LocalRateLimitConfig, IpRateLimitConfig
+from src.application.interfaces import (
+    AbstractEmailFilter,
+    AbstractTokenDenylist,
+    AbstractTokenEpochStore,
+)
+from src.infrastructure.caching.invalidation_bus import InvalidationBus
+from src.infrastructure.caching.user_cache import UserCache
 from src.infrastructure.di.container import get_container
 from dishka.integrations.fastapi import setup_dishka
 from src.presentation.exception_handlers import setup_exception_handlers
@@ -9,21 +17,57 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.logging.config import setup_logging
 from src.core.middleware.logging_middleware import LoggingMiddleware
+from src.core.middleware.local_rate_limit_middleware import LocalRateLimitMiddleware
+from src.core.middleware.rate_limit_middleware import RateLimitMiddleware
 
 container = get_container()
+local_rate_limit_cfg = LocalRateLimitConfig()
+ip_rate_limit_cfg = IpRateLimitConfig()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup
     setup_logging()
+    # запускает фоновое построение фильтра email сразу, а не на первом запросе
+    await container.get(AbstractEmailFilter)
+    # кеши регистрируются в шине при создании — создаём их до старта
+    # слушателя, а не лениво на первом запросе
+    await container.get(UserCache)
+    await container.get(AbstractTokenDenylist)
+    await container.get(AbstractTokenEpochStore)
+    invalidation_bus = await container.get(InvalidationBus)
+    await invalidation_bus.start()
     yield
     # shutdown
+    await invalidation_bus.stop()
     await container.close()
 
 
 app = FastAPI(lifespan=lifespan)
 app.add_middleware(LoggingMiddleware)
+# Добавляются после LoggingMiddleware => выполняются раньше него (снаружи).
+# Порядок выполнения: CORS -> локальный bucket -> Redis лимиты -> логирование
+if ip_rate_limit_cfg.enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        ip_limit=ip_rate_limit_cfg.ip_limit,
+        ip_window_seconds=ip_rate_limit_cfg.ip_window_seconds,
+        route_limits=ip_rate_limit_cfg.route_limits,
+        route_window_seconds=ip_rate_limit_cfg.route_window_seconds,
+        global_limit=ip_rate_limit_cfg.global_limit,
+        global_window_seconds=ip_rate_limit_cfg.global_window_seconds,
+        trusted_proxies=ip_rate_limit_cfg.trusted_proxies,
+        exempt_paths=ip_rate_limit_cfg.exempt_paths,
+    )
+if local_rate_limit_cfg.enabled:
+    app.add_middleware(
+        LocalRateLimitMiddleware,
+        capacity=local_rate_limit_cfg.ip_capacity,
+        refill_per_second=local_rate_limit_cfg.ip_refill_per_second,
+        max_entries=local_rate_limit_cfg.max_entries,
+        trusted_proxies=ip_rate_limit_cfg.trusted_proxies,
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_config.origins,
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class AdminUserResponse(BaseModel):
+    id: UUID
+    email: str
+    is_active: bool
+    email_verified: bool
+    created_at: datetime
+    last_login_at: Optional[datetime] = None
+
+
+class UserSearchResponse(BaseModel):
+    items: List[AdminUserResponse]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Передайте в cursor, чтобы получить следующую страницу; null — страница последняя",
+    )
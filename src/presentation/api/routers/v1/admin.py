@@ -0,0 +1,66 @@
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from dishka.integrations.fastapi import FromDishka, inject
+from pydantic import StringConstraints
+
+from src.application.dtos import UserSearchDTO
+from src.application.interfaces import UserSearchMode
+from src.application.use_cases import SearchUsersUseCase
+from src.domain.entities.user import User
+from src.presentation.api.dto.admin import AdminUserResponse, UserSearchResponse
+from src.secure.dependencies import require_admin
+
+router = APIRouter(tags=["admin"], dependencies=[Depends(require_admin)])
+
+# пробелы обрезаются до проверки длины: "  ab " — это два символа, а не пять
+SearchQuery = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, min_length=3, max_length=255),
+    Query(description="Часть email"),
+]
+
+
+def _to_response(user: User) -> AdminUserResponse:
+    # created_at в users NOT NULL — у загруженного из БД пользователя он есть
+    assert user.created_at is not None
+    return AdminUserResponse(
+        id=user.id,
+        email=user.email.value,
+        is_active=user.is_active,
+        email_verified=user.email_verified,
+        created_at=user.created_at,
+        last_login_at=user.last_login_at,
+    )
+
+
+@router.get(
+    "/users",
+    status_code=status.HTTP_200_OK,
+    response_model=UserSearchResponse,
+    summary="Поиск пользователей по email",
+    description=(
+        "Поиск по префиксу или подстроке email (без учёта регистра). "
+        "Результаты упорядочены по дате регистрации; для следующей страницы "
+        "передайте next_cursor из предыдущего ответа."
+    ),
+    responses={
+        400: {"description": "Неверный курсор"},
+        401: {"description": "Неверный X-Admin-Token"},
+    },
+)
+@inject
+async def search_users(
+    use_case: FromDishka[SearchUsersUseCase],
+    q: SearchQuery,
+    mode: UserSearchMode = Query(UserSearchMode.PREFIX),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None, max_length=256),
+) -> UserSearchResponse:
+    page = await use_case.execute(
+        UserSearchDTO(query=q, mode=mode, limit=limit, cursor=cursor)
+    )
+    return UserSearchResponse(
+        items=[_to_response(user) for user in page.items],
+        next_cursor=page.next_cursor,
+    )
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status, Response
 from dishka.integrations.fastapi import FromDishka, inject
-from src.secure.dependencies import get_current_user
-from src.domain.entities.user import User
+from src.secure.dependencies import get_current_principal
+from src.application.dtos import PrincipalDTO
 
 from src.application.use_cases import LogoutUseCase
 
@@ -20,9 +20,10 @@ router = APIRouter(tags=["logout"])
 async def logout(
     response: Response,
     use_case: FromDishka[LogoutUseCase],
-    user: User = Depends(get_current_user),
+    # logout нужен только user_id — пользователя из БД не загружаем
+    principal: PrincipalDTO = Depends(get_current_principal),
 ) -> None:
-    await use_case.execute(user_id=user.id)
+    await use_case.execute(user_id=principal.user_id, principal=principal)
 
     response.delete_cookie(
         "refresh_token",
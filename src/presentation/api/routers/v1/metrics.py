@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+
+from src.core.metrics.registry import metrics
+from src.secure.dependencies import require_admin
+
+# счётчики раскрывают внутреннее устройство сервиса — только с X-Admin-Token
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_admin)])
+
+
+@router.get(
+    "/metrics",
+    summary="Метрики воркера",
+    description="Счётчики текущего процесса (in-process, у каждого воркера свои).",
+    include_in_schema=False,
+)
+async def get_metrics() -> dict:
+    return metrics.snapshot()
@@ -86,6 +86,10 @@ async def initiate_registration(
             "model": CodeAttemptResponse,
             "description": "Неверный код подтверждения",
         },
+        409: {
+            "model": EmailAlreadyExistsResponse,
+            "description": "Email занят параллельной регистрацией",
+        },
         429: {
             "model": LimitCodeAttemptsResponse,
             "description": "Исчерпаны попытки ввести код правильно",
@@ -10,6 +10,7 @@ from src.application.exceptions import (
     InvalidCredentialsError,
     UserNotFoundError,
     InvalidTokenError,
+    InvalidCursorError,
 )
 
 from fastapi import FastAPI, Request
@@ -123,6 +124,17 @@ async def invalid_token(request: Request, exc: InvalidTokenError):
     )
 
 
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    logger.info("Неверный курсор пагинации", error=str(exc), path=request.url.path)
+    return JSONResponse(
+        status_code=400,
+        content={
+            "error": "InvalidCursor",
+            "message": str(exc),
+        },
+    )
+
+
 def setup_exception_handlers(app: FastAPI):
     """Единая регистрация всех обработчиков ошибок."""
     app.add_exception_handler(EmailAlreadyExistsError, email_exists_handler)  # type: ignore[arg-type]
@@ -134,3 +146,4 @@ def setup_exception_handlers(app: FastAPI):
     app.add_exception_handler(InvalidCredentialsError, invalide_credentional_handler)  # type: ignore[arg-type]
     app.add_exception_handler(UserNotFoundError, user_not_found_handler)  # type: ignore[arg-type]
     app.add_exception_handler(InvalidTokenError, invalid_token)  # type: ignore[arg-type]
+    app.add_exception_handler(InvalidCursorError, invalid_cursor_handler)  # type: ignore[arg-type]
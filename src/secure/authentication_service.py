@@ -4,7 +4,12 @@ from src.application.interfaces import (
     AbstractJWTService,
     AbstractRefreshTokenRepository,
     AbstractAuthenticationService,
+    AbstractLoginTracker,
+    AbstractAuditLog,
+    AbstractTokenEpochStore,
+    AuthEventType,
 )
+from src.application.dtos import EMBEDDED_CLAIMS
 from src.application.exceptions import InvalidTokenError, TokenReuseDetectedError
 
 
@@ -19,9 +24,15 @@ class AuthenticationService(AbstractAuthenticationService):
         self,
         jwt_service: AbstractJWTService,
         refresh_token_repo: AbstractRefreshTokenRepository,
+        login_tracker: AbstractLoginTracker,
+        audit_log: AbstractAuditLog,
+        token_epochs: AbstractTokenEpochStore,
     ):
         self.jwt_service = jwt_service
+        self.token_epochs = token_epochs
         self.refresh_token_repo = refresh_token_repo
+        self.login_tracker = login_tracker
+        self.audit_log = audit_log
 
     async def authenticate_and_generate_tokens(
         self,
@@ -54,6 +65,11 @@ class AuthenticationService(AbstractAuthenticationService):
             old_jti = payload["jti"]
 
             user_id = UUID(payload["sub"])
+            if extra_claims is None:
+                # claims пользователя переносятся в новую пару без похода в БД
+                extra_claims = {
+                    name: payload[name] for name in EMBEDDED_CLAIMS if name in payload
+                }
 
             # Атомарный consume старого токена + reuse detection
             consumed_user_id = await self.refresh_token_repo.get_user_id_by_jti(old_jti)
@@ -61,6 +77,11 @@ class AuthenticationService(AbstractAuthenticationService):
             if consumed_user_id is None:
                 # Reuse detected или токен уже отозван → сразу revoke текущую сессию  (logout)
                 await self.refresh_token_repo.revoke_by_user_id(user_id)
+                self.audit_log.record(
+                    AuthEventType.TOKEN_REUSE,
+                    user_id=user_id,
+                    details={"jti": old_jti},
+                )
                 raise TokenReuseDetectedError(
                     "Refresh token reused or revoked – possible theft"
                 )
@@ -68,13 +89,19 @@ class AuthenticationService(AbstractAuthenticationService):
         if user_id is None:
             raise ValueError()
 
-        # Генерируем новую пару токенов
+        # Генерируем новую пару токенов; эпоха всегда текущая, а не перенесённая
         access_token = self.jwt_service.create_access_token(
             user_id=user_id,
-            extra_claims=extra_claims or {},
+            extra_claims={
+                **(extra_claims or {}),
+                "epoch": await self.token_epochs.get(user_id),
+            },
         )
 
-        new_refresh_token = self.jwt_service.create_refresh_token(user_id=user_id)
+        new_refresh_token = self.jwt_service.create_refresh_token(
+            user_id=user_id,
+            extra_claims=extra_claims or {},
+        )
 
         # Извлекаем jti нового refresh-токена
         new_payload = self.jwt_service.verify_refresh_token(new_refresh_token)
@@ -86,4 +113,9 @@ class AuthenticationService(AbstractAuthenticationService):
             token_jti=new_jti,
         )
 
+        if refresh_token:
+            # успешная ротация refresh — тоже вход (логин отмечает LoginCodeUseCase)
+            self.login_tracker.record(user_id)
+            self.audit_log.record(AuthEventType.REFRESH, user_id=user_id)
+
         return access_token, new_refresh_token
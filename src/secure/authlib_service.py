@@ -78,10 +78,14 @@ class AuthlibJWTService(AbstractJWTService):
         expires_in = timedelta(minutes=self.settings.access_expire_minutes)
         claims = {
             "sub": str(user_id),
+            # по jti access-токен можно отозвать до exp (денайлист)
+            "jti": str(uuid4()),
             "iss": self.issuer,
             "iat": datetime.now(timezone.utc),
             "exp": datetime.now(timezone.utc) + expires_in,
             **(extra_claims or {}),
+            # тип после extra_claims — его не перетереть
+            "type": "access",
         }
 
         return self.jwt.encode(self._prepare_headers(), claims, self.private_key)
@@ -89,9 +93,11 @@ class AuthlibJWTService(AbstractJWTService):
     def create_refresh_token(
         self,
         user_id: UUID,
+        extra_claims: Optional[Dict[str, Any]] = None,
     ) -> str:
         expires_in = timedelta(days=self.settings.refresh_expire_days)
         claims = {
+            **(extra_claims or {}),
             "sub": str(user_id),
             "type": "refresh",
             "jti": str(uuid4()),
@@ -112,11 +118,16 @@ class AuthlibJWTService(AbstractJWTService):
                     "sub": {"essential": True},
                     "exp": {"essential": True},
                     "iat": {"essential": True},
+                    # refresh-токен (без epoch, живёт 30 дней) как bearer не принимаем;
+                    # access-токены без type истекают за access_expire_minutes
+                    "type": {"essential": True, "value": "access"},
                     # "nbf": {"essential": False},
                     # "aud": {"essential": True, "value": "..."}
                     # "scope": {"essential": False},
                 },
             )
+            # decode только проверяет подпись — exp/iss проверяет validate()
+            claims.validate()
             return claims
         except ExpiredTokenError:
             raise InvalidTokenError("Token expired")
@@ -138,6 +149,8 @@ class AuthlibJWTService(AbstractJWTService):
                     "type": {"essential": True, "value": "refresh"},
                 },
             )
+            # без validate() истёкший или чужой (iss/type) токен прошёл бы
+            claims.validate()
             return claims
 
         except ExpiredTokenError:
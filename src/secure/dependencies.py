@@ -1,71 +1,82 @@
-from datetime import datetime
+import hmac
+from typing import Optional
+
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from authlib.jose import JsonWebKey, JsonWebToken, JoseError
-from authlib.jose.errors import ExpiredTokenError, InvalidClaimError
-from src.core.settings.jwt import JwtSettings
-from src.application.interfaces.unit_of_work import AbstractUnitOfWork
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
+from src.core.settings.admin import AdminSettings
+from src.application.dtos import PrincipalDTO
+from src.application.interfaces.jwt_service import AbstractJWTService
+from src.application.interfaces.token_denylist import AbstractTokenDenylist
+from src.application.interfaces.token_epoch import AbstractTokenEpochStore
+from src.application.interfaces.unit_of_work import PrimaryReadOnlyUnitOfWork
 from src.application.exceptions import InvalidTokenError
 
 from src.domain.entities.user import User
 
 
 bearer_scheme = HTTPBearer()
+admin_token_scheme = APIKeyHeader(name="X-Admin-Token", auto_error=False)
 
 
 @inject
-async def get_current_user(
-    settings: FromDishka[JwtSettings],
-    uow: FromDishka[AbstractUnitOfWork],
+async def get_current_principal(
+    jwt_service: FromDishka[AbstractJWTService],
+    denylist: FromDishka[AbstractTokenDenylist],
+    token_epochs: FromDishka[AbstractTokenEpochStore],
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+) -> PrincipalDTO:
+    """
+    Пользователь запроса только из claims access-токена: подпись, iss и exp
+    проверяются, БД не используется. Для эндпоинтов, которым хватает
+    user_id и встроенных claims (email_verified).
+    Отозванные токены (logout, смена пароля) отклоняются по реплике денайлиста в памяти,
+    токены со старой эпохой (отзыв всех токенов пользователя) — по кешу эпох.
+    """
+    claims = jwt_service.verify_access_token(credentials.credentials)
+    try:
+        principal = PrincipalDTO.from_claims(claims)
+    except (KeyError, ValueError):
+        raise InvalidTokenError("Invalid claim")
+
+    if principal.jti is not None and await denylist.is_revoked(principal.jti):
+        raise InvalidTokenError("Token revoked")
+    # токены без epoch выпущены до её появления и доживают до exp
+    if principal.epoch is not None and principal.epoch < await token_epochs.get(
+        principal.user_id
+    ):
+        raise InvalidTokenError("Token revoked")
+    return principal
+
+
+@inject
+async def get_current_user(
+    uow: FromDishka[PrimaryReadOnlyUnitOfWork],
+    principal: PrincipalDTO = Depends(get_current_principal),
 ) -> User:
-    token = credentials.credentials
-    jwt = JsonWebToken(["RS256"])
-    issuer = settings.issuer
+    # primary: промах кеша пользователей заполняет его, строка с реплики могла
+    # бы вернуть в кеш версию до только что закоммиченного изменения
+    async with uow:
+        user = await uow.users.get_by_id(principal.user_id)
 
-    with open(settings.public_key_path) as f:
-        public_key = JsonWebKey.import_key(f.read(), {"kty": "RSA"})
+    if user is None:
+        raise InvalidTokenError("User not found")
+    return user
 
-    try:
-        claims = jwt.decode(
-            token,
-            public_key,
-            claims_options={
-                "iss": {"essential": True, "value": issuer},
-                "sub": {"essential": True},
-                "exp": {"essential": True, "validate": True},
-                "iat": {"essential": True},
-                # "nbf": {"essential": False},
-                # "aud": {"essential": True, "value": "..."}
-                # "scope": {"essential": False},
-            },
-        )
-        timestamp = int(claims["exp"])
-        # dt = datetime.utcfromtimestamp(timestamp)
-        # now = (datetime.utcnow())
-        # print(dt, now)
-        # exp_timestamp = claims.get("exp")
-        if datetime.utcfromtimestamp(timestamp) < datetime.utcnow():
-            raise InvalidTokenError("Token expired")
 
-    except ExpiredTokenError:
-        raise InvalidTokenError("Token expired")
-    except InvalidClaimError:
-        raise InvalidTokenError("Invalid claim")
-    except JoseError:
-        raise InvalidTokenError("Invalid token")
+@inject
+async def require_admin(
+    settings: FromDishka[AdminSettings],
+    token: Optional[str] = Depends(admin_token_scheme),
+) -> None:
+    if settings.api_token is None:
+        # токен не настроен — админского API как будто нет
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-    user_id = claims.get("sub")
-    if not user_id:
+    expected = settings.api_token.get_secret_value().encode()
+    if token is None or not hmac.compare_digest(token.encode(), expected):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token missing subject (sub)",
+            detail="Неверный X-Admin-Token",
         )
-
-    async with uow:
-        user = await uow.users.get_by_id(user_id)
-        await uow.commit()
-
-    return user
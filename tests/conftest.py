@@ -0,0 +1,141 @@
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.infrastructure.caching.invalidation_bus import InvalidationBus
+from src.secure.authlib_service import AuthlibJWTService
+
+
+@pytest.fixture(scope="session")
+def jwt_service(tmp_path_factory) -> AuthlibJWTService:
+    keys = tmp_path_factory.mktemp("keys")
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    (keys / "private.pem").write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    (keys / "public.pem").write_bytes(
+        key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return AuthlibJWTService(
+        SimpleNamespace(
+            private_key_path=keys / "private.pem",
+            public_key_path=keys / "public.pem",
+            key_id="test",
+            issuer="auth-service",
+            access_expire_minutes=15,
+            refresh_expire_days=30,
+        )
+    )
+
+
+# ─── Redis ───────────────────────────────────────────────────────────────────
+
+ScriptHandler = Callable[["FakeRedis", list, list], Awaitable[object]]
+
+
+class FakePipeline:
+    """Команды копятся и применяются в execute() — как MULTI/EXEC"""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.ops: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc): ...
+
+    def set(self, key, value, ex=None, px=None):
+        self.ops.append(lambda: self.redis.data.__setitem__(key, value))
+
+    def delete(self, *keys):
+        self.ops.append(lambda: [self.redis.data.pop(key, None) for key in keys])
+
+    async def execute(self):
+        self.redis.check("execute")
+        for op in self.ops:
+            op()
+
+
+class FakeRedis:
+    """
+    Словарь вместо Redis (без TTL): команды, которые используют кеши.
+    Lua-скрипты эмулирует тест: scripts[<текст скрипта>] = async handler(redis, keys, args).
+    fail(command, error) — команда начинает падать.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict = {}
+        self.published: list = []
+        self.scripts: Dict[str, ScriptHandler] = {}
+        self.errors: Dict[str, Exception] = {}
+
+    def fail(self, command: str, error: Optional[Exception]) -> None:
+        if error is None:
+            self.errors.pop(command, None)
+        else:
+            self.errors[command] = error
+
+    def check(self, command: str) -> None:
+        error = self.errors.get(command)
+        if error is not None:
+            raise error
+
+    async def get(self, key):
+        self.check("get")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, px=None):
+        self.check("set")
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        self.check("delete")
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def exists(self, key):
+        self.check("exists")
+        return int(key in self.data)
+
+    async def publish(self, channel, message):
+        self.check("publish")
+        self.published.append(message)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        async def run(keys, args):
+            self.check("evalsha")
+            return await self.scripts[script](self, keys, args)
+
+        return run
+
+
+@pytest.fixture
+def make_redis() -> Callable[[], FakeRedis]:
+    return FakeRedis
+
+
+@pytest.fixture
+def make_bus() -> Callable[..., InvalidationBus]:
+    """Шина без слушателя: подписка считается живой, topics из synced — синхронизированы"""
+
+    def make(redis: Optional[FakeRedis] = None, synced: Iterable[str] = ()):
+        bus = InvalidationBus(redis or FakeRedis())
+        bus._connected = True
+        bus._synced.update(synced)
+        return bus
+
+    return make
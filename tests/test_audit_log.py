@@ -0,0 +1,205 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from cli import audit_partitions
+from cli.audit_partitions import add_months, maintain_partitions
+from src.application.interfaces import AuthEventType
+from src.core.metrics.registry import metrics
+from src.infrastructure.persistence.audit_log import BufferedAuditLog
+
+
+class FakeEngine:
+    """engine.connect() -> raw asyncpg соединение с copy_records_to_table"""
+
+    def __init__(self, error=None, block=False) -> None:
+        self.error = error
+        self.block = asyncio.Event() if block else None
+        self.started = asyncio.Event()
+        self.written: list = []
+
+    async def copy_records_to_table(self, table, records, columns):
+        if self.block is not None:
+            self.started.set()
+            await self.block.wait()
+        if self.error is not None:
+            raise self.error
+        self.written.extend(records)
+
+    @asynccontextmanager
+    async def connect(self):
+        async def get_raw_connection():
+            return SimpleNamespace(driver_connection=self)
+
+        yield SimpleNamespace(get_raw_connection=get_raw_connection)
+
+
+def _emails(records) -> list:
+    return [record[4] for record in records]
+
+
+def _record(audit: BufferedAuditLog, *emails: str) -> None:
+    for email in emails:
+        audit.record(AuthEventType.LOGIN, email=email)
+
+
+def test_full_buffer_drops_oldest_events():
+    audit = BufferedAuditLog(engine=None, max_buffer=3)
+    dropped = metrics.get("audit.dropped")
+
+    _record(audit, "e0", "e1", "e2", "e3", "e4")
+
+    assert _emails(audit._buffer) == ["e2", "e3", "e4"]
+    assert metrics.get("audit.dropped") - dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_returns_to_the_front_and_overflow_drops_its_oldest():
+    engine = FakeEngine(error=ConnectionError("db down"), block=True)
+    audit = BufferedAuditLog(engine=engine, batch_size=2, max_buffer=4)
+    _record(audit, "e0", "e1", "e2")
+
+    flush = asyncio.create_task(audit.flush())
+    await engine.started.wait()
+    # события во время COPY: места хватает только на одно из пачки
+    _record(audit, "e3", "e4")
+    dropped = metrics.get("audit.dropped")
+    engine.block.set()
+
+    assert await flush == 0
+    assert _emails(audit._buffer) == ["e1", "e2", "e3", "e4"]
+    assert metrics.get("audit.dropped") - dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_during_flush_writes_the_interrupted_batch():
+    engine = FakeEngine(block=True)
+    audit = BufferedAuditLog(engine=engine, batch_size=2)
+    _record(audit, "e0", "e1", "e2")
+    audit._task = asyncio.create_task(audit.flush())
+    await engine.started.wait()
+
+    engine.block = None
+    await audit.stop()
+
+    assert _emails(engine.written) == ["e0", "e1", "e2"]
+    assert not audit._buffer
+
+
+class FakeConnection:
+    """
+    pg_inherits — existing; строки DEFAULT — список occurred_at.
+    SQL не разбирается: по тексту запроса понятно, что спрашивают.
+    """
+
+    def __init__(self, existing, default_rows=()) -> None:
+        self.existing = existing
+        self.default_rows = list(default_rows)
+        self.executed: list = []
+
+    async def fetch(self, query):
+        return [{"name": name} for name in self.existing]
+
+    async def fetchval(self, query, *args):
+        if "occurred_at >= $1" in query:
+            return sum(1 for ts in self.default_rows if args[0] <= ts < args[1])
+        return sum(1 for ts in self.default_rows if ts < args[0])
+
+    async def execute(self, query, *args):
+        self.executed.append(" ".join(query.split()[:4]))
+        if query.startswith("DELETE"):
+            kept = [ts for ts in self.default_rows if ts >= args[0]]
+            deleted, self.default_rows = len(self.default_rows) - len(kept), kept
+            return f"DELETE {deleted}"
+        return "OK"
+
+    def transaction(self):
+        connection = self
+
+        class Transaction:
+            async def __aenter__(self):
+                connection.executed.append("BEGIN")
+
+            async def __aexit__(self, *exc):
+                connection.executed.append("COMMIT")
+
+        return Transaction()
+
+    async def close(self):
+        pass
+
+
+def _month(offset: int) -> date:
+    return add_months(date.today().replace(day=1), offset)
+
+
+def _name(offset: int) -> str:
+    return f"auth_events_{_month(offset):%Y_%m}"
+
+
+def _at(offset: int) -> datetime:
+    month = _month(offset)
+    return datetime(month.year, month.month, 15, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    def use(conn: FakeConnection) -> FakeConnection:
+        async def connect():
+            return conn
+
+        monkeypatch.setattr(audit_partitions, "connect", connect)
+        return conn
+
+    return use
+
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_missing_and_expired_partitions(connection):
+    conn = connection(
+        FakeConnection(
+            # граница хранения: секция на 12 месяцев назад остаётся
+            [_name(-13), _name(-12), _name(0), "auth_events_default"],
+            default_rows=[_at(-14), _at(1), _at(1)],
+        )
+    )
+
+    changes = await maintain_partitions(
+        months_ahead=2, retention_months=12, dry_run=True
+    )
+
+    assert changes.created == [_name(1), _name(2)]
+    assert changes.moved == {_name(1): 2}
+    assert changes.dropped == [_name(-13)]
+    assert changes.pruned_default == 1
+    assert conn.executed == []
+
+
+@pytest.mark.asyncio
+async def test_rows_stranded_in_default_are_moved_into_the_new_partition(connection):
+    conn = connection(
+        FakeConnection(
+            [_name(0), "auth_events_default"], default_rows=[_at(1), _at(-14)]
+        )
+    )
+
+    changes = await maintain_partitions(
+        months_ahead=1, retention_months=12, dry_run=False
+    )
+
+    assert changes.created == [_name(1)]
+    assert changes.moved == {_name(1): 1}
+    # DEFAULT отсоединяется на время создания секции — в одной транзакции
+    assert conn.executed[:6] == [
+        "BEGIN",
+        "ALTER TABLE auth_events DETACH",
+        f"CREATE TABLE {_name(1)} PARTITION",
+        "WITH moved AS (DELETE",
+        "ALTER TABLE auth_events ATTACH",
+        "COMMIT",
+    ]
+    # устаревшие строки DEFAULT удалены
+    assert changes.pruned_default == 1
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.application.exceptions import InvalidTokenError
+from src.secure.authlib_service import AuthlibJWTService
+
+
+def _refresh(jwt_service: AuthlibJWTService, **claims) -> str:
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": str(uuid4()),
+        "type": "refresh",
+        "iss": jwt_service.issuer,
+        "iat": now,
+        "exp": now + timedelta(days=1),
+        **claims,
+    }
+    return jwt_service.jwt.encode(
+        jwt_service._prepare_headers(), payload, jwt_service.private_key
+    )
+
+
+def test_refresh_token_round_trip(jwt_service):
+    user_id = uuid4()
+    token = jwt_service.create_refresh_token(user_id)
+
+    assert jwt_service.verify_refresh_token(token)["sub"] == str(user_id)
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"exp": datetime.now(timezone.utc) - timedelta(seconds=1)},
+        {"iss": "someone-else"},
+        {"type": "access"},
+    ],
+    ids=["expired", "foreign-issuer", "not-refresh"],
+)
+def test_refresh_token_claims_are_validated(jwt_service, claims):
+    with pytest.raises(InvalidTokenError):
+        jwt_service.verify_refresh_token(_refresh(jwt_service, **claims))
+
+
+def test_access_token_is_not_a_refresh_token(jwt_service):
+    with pytest.raises(InvalidTokenError):
+        jwt_service.verify_refresh_token(jwt_service.create_access_token(uuid4()))
+
+
+def test_refresh_token_is_not_an_access_token(jwt_service):
+    with pytest.raises(InvalidTokenError):
+        jwt_service.verify_access_token(jwt_service.create_refresh_token(uuid4()))
+
+
+def test_extra_claims_cannot_override_token_type(jwt_service):
+    token = jwt_service.create_access_token(uuid4(), extra_claims={"type": "refresh"})
+
+    assert jwt_service.verify_access_token(token)["type"] == "access"
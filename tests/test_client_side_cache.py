@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.caching.client_side_cache import RedisClientSideCache
+
+
+def _cache() -> RedisClientSideCache:
+    cache = RedisClientSideCache(
+        redis=None, prefixes=["pending_reg:"], max_entries=10, ttl_seconds=60
+    )
+    # слушатель не запускаем — считаем, что трекинг включён
+    cache._healthy = True
+    return cache
+
+
+def _loader(value):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return value
+
+    return load, calls
+
+
+@pytest.mark.asyncio
+async def test_invalidation_message_evicts_only_listed_keys():
+    cache = _cache()
+    load_a, calls_a = _loader("a")
+    load_b, calls_b = _loader("b")
+    await cache.get_or_load("pending_reg:a", load_a)
+    await cache.get_or_load("pending_reg:b", load_b)
+
+    # Redis присылает список ключей (bytes)
+    cache._handle_invalidation([b"pending_reg:a"])
+
+    assert await cache.get_or_load("pending_reg:a", load_a) == "a"
+    assert await cache.get_or_load("pending_reg:b", load_b) == "b"
+    assert len(calls_a) == 2
+    assert len(calls_b) == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_notification_clears_everything():
+    cache = _cache()
+    load, _ = _loader("a")
+    await cache.get_or_load("pending_reg:a", load)
+
+    # FLUSHDB/FLUSHALL приходит как None
+    cache._handle_invalidation(None)
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_value_loaded_during_invalidation_is_not_cached():
+    cache = _cache()
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    task = asyncio.create_task(cache.get_or_load("pending_reg:a", slow_load))
+    await started.wait()
+    cache._handle_invalidation(b"pending_reg:a")
+    release.set()
+
+    assert await task == "stale"
+    assert len(cache) == 0
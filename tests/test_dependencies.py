@@ -0,0 +1,90 @@
+from uuid import uuid4
+
+import pytest
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.dtos import PrincipalDTO
+from src.application.interfaces import (
+    AbstractJWTService,
+    AbstractTokenDenylist,
+    AbstractTokenEpochStore,
+)
+from src.presentation.exception_handlers import setup_exception_handlers
+from src.secure.dependencies import get_current_principal
+
+
+class FakeDenylist:
+    def __init__(self) -> None:
+        self.revoked: set = set()
+
+    async def is_revoked(self, jti) -> bool:
+        return jti in self.revoked
+
+
+class FakeTokenEpochs:
+    def __init__(self) -> None:
+        self.epochs: dict = {}
+
+    async def get(self, user_id) -> int:
+        return self.epochs.get(user_id, 0)
+
+
+@pytest.fixture
+def api(jwt_service):
+    denylist, epochs = FakeDenylist(), FakeTokenEpochs()
+    provider = Provider(scope=Scope.APP)
+    provider.provide(lambda: jwt_service, provides=AbstractJWTService)
+    provider.provide(lambda: denylist, provides=AbstractTokenDenylist)
+    provider.provide(lambda: epochs, provides=AbstractTokenEpochStore)
+
+    app = FastAPI()
+    setup_exception_handlers(app)
+
+    @app.get("/me")
+    async def me(principal: PrincipalDTO = Depends(get_current_principal)):
+        return {"user_id": str(principal.user_id)}
+
+    setup_dishka(make_async_container(provider), app)
+    with TestClient(app) as client:
+        yield client, denylist, epochs
+
+
+def _get(client, token) -> int:
+    # authlib отдаёт токен в bytes
+    token = token.decode() if isinstance(token, bytes) else token
+    return client.get("/me", headers={"Authorization": f"Bearer {token}"}).status_code
+
+
+def test_access_token_is_accepted(api, jwt_service):
+    client, _, _ = api
+    token = jwt_service.create_access_token(uuid4(), extra_claims={"epoch": 0})
+
+    assert _get(client, token) == 200
+
+
+def test_refresh_token_is_rejected_as_bearer(api, jwt_service):
+    client, _, _ = api
+
+    assert _get(client, jwt_service.create_refresh_token(uuid4())) == 401
+
+
+def test_token_with_stale_epoch_is_rejected(api, jwt_service):
+    client, _, epochs = api
+    user_id = uuid4()
+    token = jwt_service.create_access_token(user_id, extra_claims={"epoch": 0})
+
+    # смена пароля подняла эпоху
+    epochs.epochs[user_id] = 1
+
+    assert _get(client, token) == 401
+
+
+def test_revoked_jti_is_rejected(api, jwt_service):
+    client, denylist, _ = api
+    token = jwt_service.create_access_token(uuid4(), extra_claims={"epoch": 0})
+    denylist.revoked.add(jwt_service.verify_access_token(token)["jti"])
+
+    assert _get(client, token) == 401
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.caching.email_bloom_filter import RedisEmailBloomFilter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _filter(redis) -> RedisEmailBloomFilter:
+    return RedisEmailBloomFilter(
+        redis=redis, capacity=1000, error_rate=0.001, backend="bitmap"
+    )
+
+
+def _source(emails, started=None, release=None):
+    async def source(since):
+        if since is not None:
+            return
+        if started is not None:
+            started.set()
+            await release.wait()
+        yield list(emails)
+
+    return source
+
+
+@pytest.mark.asyncio
+async def test_built_filter_rejects_unknown_emails():
+    redis = fakeredis.FakeAsyncRedis()
+    email_filter = _filter(redis)
+    # до построения — «возможно есть»
+    assert await email_filter.might_exist("nobody@example.com")
+
+    await email_filter.ensure_built(_source(["alice@example.com"]))
+    await email_filter.add("bob@example.com")
+
+    assert await email_filter.might_exist("alice@example.com")
+    assert await email_filter.might_exist("bob@example.com")
+    assert not await email_filter.might_exist("nobody@example.com")
+    assert 0 < await redis.ttl(email_filter.key) <= email_filter.rebuild_seconds
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_filter_until_rebuilt():
+    redis = fakeredis.FakeAsyncRedis()
+    email_filter = _filter(redis)
+    await email_filter.ensure_built(_source(["alice@example.com"]))
+
+    # импорт в обход регистрации
+    await email_filter.invalidate()
+    assert await email_filter.might_exist("imported@example.com")
+
+    await email_filter.ensure_built(
+        _source(["alice@example.com", "imported@example.com"])
+    )
+    assert await email_filter.might_exist("imported@example.com")
+    assert not await email_filter.might_exist("nobody@example.com")
+
+
+@pytest.mark.asyncio
+async def test_build_started_before_invalidate_is_discarded():
+    redis = fakeredis.FakeAsyncRedis()
+    email_filter = _filter(redis)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    build = asyncio.create_task(
+        email_filter.ensure_built(_source(["alice@example.com"], started, release))
+    )
+    await started.wait()
+    await email_filter.invalidate()
+    release.set()
+    await build
+
+    assert not await redis.exists(email_filter.key)
+    assert not await redis.exists(email_filter.build_key)
+    assert await email_filter.might_exist("imported@example.com")
+
+
+@pytest.mark.asyncio
+async def test_filters_with_other_parameters_do_not_share_a_key():
+    redis = fakeredis.FakeAsyncRedis()
+    await _filter(redis).ensure_built(_source(["alice@example.com"]))
+
+    resized = RedisEmailBloomFilter(
+        redis=redis, capacity=2000, error_rate=0.001, backend="bitmap"
+    )
+    # чужой битмап не читается — до своего построения «возможно есть»
+    assert await resized.might_exist("nobody@example.com")
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.application.dtos import VerifyCodeDTO
+from src.application.exceptions import RequestExpiredError
+from src.application.interfaces import PendingRegistrationData, VerificationAttempt
+from src.application.use_cases.register.finish_registration import (
+    FinishRegistrationUseCase,
+)
+
+# Имитация подписи JWT + записи сессии в Redis
+SLOW_STEP_SECONDS = 0.05
+PASSWORD_HASH = "$argon2id$v=19$m=65536,t=3,p=4$c2FsdHNhbHQ$aGFzaGhhc2hoYXNo"
+
+
+class FakeUsers:
+    def __init__(self) -> None:
+        self.rows: dict = {}
+
+    async def add_if_absent(self, user) -> bool:
+        self.rows[user.id] = user
+        return True
+
+    async def delete(self, user_id) -> None:
+        self.rows.pop(user_id, None)
+
+
+class FakeUnitOfWork:
+    """Считает, сколько времени «соединение» занято открытой транзакцией"""
+
+    def __init__(self) -> None:
+        self.users = FakeUsers()
+        self.in_transaction = False
+        self.hold_seconds = 0.0
+
+    async def __aenter__(self):
+        self.in_transaction = True
+        self._started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.hold_seconds += time.perf_counter() - self._started
+        self.in_transaction = False
+
+    async def commit(self) -> None: ...
+
+    async def rollback(self) -> None: ...
+
+
+class FakeAuthentication:
+    def __init__(self, uow: FakeUnitOfWork) -> None:
+        self.uow = uow
+        self.called_in_transaction = None
+
+    async def authenticate_and_generate_tokens(
+        self, user_id=None, refresh_token=None, extra_claims=None
+    ):
+        self.called_in_transaction = self.uow.in_transaction
+        await asyncio.sleep(SLOW_STEP_SECONDS)
+        return "access", "refresh"
+
+
+class FakeVerificationCodes:
+    def __init__(self, consumed: bool = True, error=None) -> None:
+        self.consumed = consumed
+        self.error = error
+
+    async def begin_attempt(self, email, limit_attempts):
+        data = PendingRegistrationData(
+            email=email,
+            hashed_password=PASSWORD_HASH,
+            otp_hash="otp",
+            max_attempts=3,
+        )
+        return VerificationAttempt(
+            data=data, is_allowed=True, current_attempts=1, remaining_attempts=2
+        )
+
+    async def consume_pending(self, email, otp_hash) -> bool:
+        if self.error is not None:
+            raise self.error
+        return self.consumed
+
+
+class FakeEmailFilter:
+    def __init__(self) -> None:
+        self.emails: set = set()
+
+    async def might_exist(self, email) -> bool:
+        return email in self.emails
+
+    async def add(self, email) -> None:
+        self.emails.add(email)
+
+
+class FakeRefreshTokens:
+    def __init__(self, error=None) -> None:
+        self.revoked = []
+        self.error = error
+
+    async def revoke_by_user_id(self, user_id) -> None:
+        if self.error is not None:
+            raise self.error
+        self.revoked.append(user_id)
+
+
+def _build(consumed: bool = True, consume_error=None, revoke_error=None):
+    uow = FakeUnitOfWork()
+    refresh_tokens = FakeRefreshTokens(error=revoke_error)
+    use_case = FinishRegistrationUseCase(
+        hasher=SimpleNamespace(verify=lambda code, code_hash: True),
+        verification_code_repo=FakeVerificationCodes(
+            consumed=consumed, error=consume_error
+        ),
+        authentication=FakeAuthentication(uow),
+        refresh_token_repo=refresh_tokens,
+        email_filter=FakeEmailFilter(),
+        uow=uow,
+        verification_code_cfg=SimpleNamespace(max_attempts=3),
+    )
+    return use_case, uow, refresh_tokens
+
+
+@pytest.mark.asyncio
+async def test_transaction_is_closed_before_token_issuance():
+    use_case, uow, _ = _build()
+
+    tokens, user_id = await use_case.execute(
+        VerifyCodeDTO(email="user@example.com", code="123456")
+    )
+
+    assert tokens.access_token == "access"
+    assert use_case.authentication.called_in_transaction is False
+    # соединение не держится на время медленных шагов после вставки
+    assert uow.hold_seconds < SLOW_STEP_SECONDS
+    assert len(uow.users.rows) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_is_removed_when_pending_was_reissued():
+    use_case, uow, refresh_tokens = _build(consumed=False)
+
+    with pytest.raises(RequestExpiredError):
+        await use_case.execute(VerifyCodeDTO(email="user@example.com", code="123456"))
+
+    assert uow.users.rows == {}
+    assert len(refresh_tokens.revoked) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_is_removed_when_pending_cleanup_fails():
+    use_case, uow, refresh_tokens = _build(consume_error=ConnectionError("redis"))
+
+    with pytest.raises(ConnectionError):
+        await use_case.execute(VerifyCodeDTO(email="user@example.com", code="123456"))
+
+    assert uow.users.rows == {}
+    assert len(refresh_tokens.revoked) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_is_removed_when_redis_is_down_for_cleanup_and_revoke():
+    redis_down = ConnectionError("redis")
+    use_case, uow, _ = _build(consume_error=redis_down, revoke_error=redis_down)
+
+    with pytest.raises(ConnectionError):
+        await use_case.execute(VerifyCodeDTO(email="user@example.com", code="123456"))
+
+    # email не остаётся занятым пользователем без сессии
+    assert uow.users.rows == {}
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from src.infrastructure.caching.invalidation_bus import (
+    InvalidationBus,
+    InvalidationMessage,
+    InvalidationSubscriber,
+)
+
+
+class RecordingCache(InvalidationSubscriber):
+    def __init__(self, topic: str) -> None:
+        self.topic = topic
+        self.received: list = []
+        self.resyncs = 0
+
+    def handle(self, message: InvalidationMessage) -> None:
+        if message.key == "boom":
+            raise RuntimeError("boom")
+        self.received.append((message.key, message.value))
+
+    async def resync(self) -> None:
+        self.resyncs += 1
+
+
+@pytest.mark.asyncio
+async def test_messages_are_routed_by_topic(make_redis):
+    origin, replica = InvalidationBus(make_redis()), InvalidationBus(make_redis())
+    users, keys = RecordingCache("users"), RecordingCache("keys")
+    replica.register(users)
+    replica.register(keys)
+
+    await origin.publish("users", "u1")
+    await origin.publish("keys", "k1", "v2")
+    await origin.publish("users", "boom")
+    await origin.publish("users", "u2")
+    # сообщения, которые реплика получила бы из канала
+    for raw in origin.redis.published:
+        replica._dispatch(raw)
+    # мусор и чужая версия схемы пропускаются
+    replica._dispatch(b"not json")
+    replica._dispatch(json.dumps({"v": 99, "topic": "users", "key": "u3"}))
+
+    # ошибка обработчика не мешает следующим сообщениям
+    assert users.received == [("u1", None), ("u2", None)]
+    assert keys.received == [("k1", "v2")]
+
+
+@pytest.mark.asyncio
+async def test_subscriber_is_synced_only_after_resync_on_live_connection(make_redis):
+    bus = InvalidationBus(make_redis())
+    cache = RecordingCache("users")
+
+    # регистрация ничего не синхронизирует сама — это делает слушатель
+    bus.register(cache)
+    assert cache.resyncs == 0
+    assert not bus.is_synced("users")
+
+    # подписка поднялась раньше регистрации — слушатель догоняет на своём шаге
+    bus._connected = True
+    await bus._maybe_resync()
+    late = RecordingCache("keys")
+    bus.register(late)
+    assert not bus.is_synced("keys")
+    await bus._maybe_resync()
+    assert late.resyncs == 1
+    assert bus.is_synced("users") and bus.is_synced("keys")
+
+    await bus.stop()
+    assert not bus.is_synced("keys")
+
+    with pytest.raises(ValueError):
+        bus.register(RecordingCache("keys"))
+
+
+class FlakyCache(RecordingCache):
+    def __init__(self, topic: str, failures: int) -> None:
+        super().__init__(topic)
+        self.failures = failures
+
+    async def resync(self) -> None:
+        await super().resync()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("scan failed")
+
+
+@pytest.mark.asyncio
+async def test_failed_resync_leaves_only_its_topic_unsynced_and_is_retried(
+    make_redis, monkeypatch
+):
+    bus = InvalidationBus(make_redis())
+    healthy, flaky = RecordingCache("users"), FlakyCache("token_denylist", 1)
+    bus.register(healthy)
+    bus.register(flaky)
+    bus._connected = True
+    now = 100.0
+    monkeypatch.setattr(
+        "src.infrastructure.caching.invalidation_bus.time.monotonic", lambda: now
+    )
+
+    await bus._maybe_resync()
+    assert bus.is_synced("users")
+    assert not bus.is_synced("token_denylist")
+
+    # до конца backoff повторов нет
+    await bus._maybe_resync()
+    assert flaky.resyncs == 1
+
+    now += bus._resync_backoff
+    await bus._maybe_resync()
+    assert flaky.resyncs == 2
+    assert bus.is_synced("token_denylist")
+    # уже синхронизированный topic повторно не сбрасывается
+    assert healthy.resyncs == 1
@@ -0,0 +1,91 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.persistence.login_tracker import BufferedLoginTracker
+
+
+def test_record_coalesces_per_user_and_keeps_latest():
+    tracker = BufferedLoginTracker(engine=None, max_pending=10)
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    tracker.record(user_id, now)
+    tracker.record(user_id, now - timedelta(seconds=5))
+    tracker.record(user_id, now + timedelta(seconds=5))
+
+    assert tracker._pending == {user_id: now + timedelta(seconds=5)}
+
+
+def test_record_requests_early_flush_when_buffer_is_full():
+    tracker = BufferedLoginTracker(engine=None, max_pending=2)
+
+    tracker.record(uuid4())
+    assert not tracker._flush_requested.is_set()
+
+    tracker.record(uuid4())
+    assert tracker._flush_requested.is_set()
+
+
+class FakeConnection:
+    def __init__(self, engine) -> None:
+        self.engine = engine
+
+    async def execute(self, stmt):
+        if self.engine.block is not None:
+            self.engine.started.set()
+            await self.engine.block.wait()
+        if self.engine.error is not None:
+            raise self.engine.error
+        self.engine.executed.append(stmt.compile().params)
+
+
+class FakeEngine:
+    def __init__(self, error=None, block=False) -> None:
+        self.error = error
+        self.block = asyncio.Event() if block else None
+        self.started = asyncio.Event()
+        self.executed: list = []
+
+    @asynccontextmanager
+    async def begin(self):
+        yield FakeConnection(self)
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_merges_back_without_overwriting_newer_logins():
+    engine = FakeEngine(error=ConnectionError("db down"), block=True)
+    tracker = BufferedLoginTracker(engine=engine)
+    user_id, other_id = uuid4(), uuid4()
+    now = datetime.now(timezone.utc)
+    tracker.record(user_id, now)
+    tracker.record(other_id, now)
+
+    flush = asyncio.create_task(tracker.flush())
+    await engine.started.wait()
+    # вход во время сброса — новее того, что не удалось записать
+    tracker.record(user_id, now + timedelta(seconds=5))
+    engine.block.set()
+
+    assert await flush == 0
+    assert tracker._pending == {user_id: now + timedelta(seconds=5), other_id: now}
+
+
+@pytest.mark.asyncio
+async def test_stop_during_flush_keeps_the_batch_for_the_final_flush():
+    engine = FakeEngine(block=True)
+    tracker = BufferedLoginTracker(engine=engine)
+    user_id = uuid4()
+    tracker.record(user_id)
+    tracker._task = asyncio.create_task(tracker.flush())
+    await engine.started.wait()
+
+    # отмена фоновой задачи посреди записи
+    engine.block = None
+    await tracker.stop()
+
+    assert tracker._pending == {}
+    assert len(engine.executed) == 1
@@ -0,0 +1,34 @@
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import SecretStr
+
+from src.core.settings import AdminSettings
+from src.presentation.api.routers.v1 import metrics
+
+
+def _client(api_token=None) -> TestClient:
+    provider = Provider(scope=Scope.APP)
+    provider.provide(lambda: AdminSettings(api_token=api_token), provides=AdminSettings)
+    app = FastAPI()
+    app.include_router(metrics.router)
+    setup_dishka(make_async_container(provider), app)
+    return TestClient(app)
+
+
+def test_metrics_require_admin_token():
+    with _client(SecretStr("secret")) as client:
+        assert client.get("/metrics").status_code == 401
+        assert (
+            client.get("/metrics", headers={"X-Admin-Token": "nope"}).status_code == 401
+        )
+        response = client.get("/metrics", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    assert isinstance(response.json(), dict)
+
+
+def test_metrics_are_hidden_without_admin_token_configured():
+    with _client() as client:
+        assert client.get("/metrics").status_code == 404
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.metrics.registry import metrics
+from src.infrastructure.persistence.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    PoolLivenessChecker,
+    instrument_pool,
+)
+
+
+def _engine(name: str):
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_logging_name=name,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_pool(engine)
+    return engine
+
+
+def _summary_count(name: str) -> int:
+    summary = metrics.snapshot()["summaries"].get(name)
+    return summary["count"] if summary else 0
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_are_labelled_with_logging_name():
+    engine = _engine("pool_test")
+    checkouts = metrics.get("db_pool.pool_test.checkouts")
+    waits = _summary_count("db_pool.pool_test.checkout_wait_seconds")
+    holds = _summary_count("db_pool.pool_test.hold_seconds")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert metrics.get("db_pool.pool_test.checkouts") == checkouts + 1
+    assert _summary_count("db_pool.pool_test.checkout_wait_seconds") == waits + 1
+    assert _summary_count("db_pool.pool_test.hold_seconds") == holds + 1
+
+    # после dispose() пул пересоздаётся, имя в метриках сохраняется
+    await engine.dispose()
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert metrics.get("db_pool.pool_test.checkouts") == checkouts + 2
+    assert PoolLivenessChecker(engine, interval=0, timeout=1).name == "pool_test"
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_checkout_timeout_is_counted():
+    engine = _engine("pool_timeout_test")
+    timeouts = metrics.get("db_pool.pool_timeout_test.checkout_timeouts")
+
+    async with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+
+    assert metrics.get("db_pool.pool_timeout_test.checkout_timeouts") == timeouts + 1
+    await engine.dispose()
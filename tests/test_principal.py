@@ -0,0 +1,68 @@
+from uuid import uuid4
+
+import pytest
+
+from src.application.dtos import PrincipalDTO
+from src.secure.authentication_service import AuthenticationService
+
+
+class FakeJWT:
+    """Токен — это просто словарь claims"""
+
+    def create_access_token(self, user_id, extra_claims=None):
+        return {"sub": str(user_id), "exp": 2_000_000_000, **(extra_claims or {})}
+
+    def create_refresh_token(self, user_id, extra_claims=None):
+        return {**(extra_claims or {}), "sub": str(user_id), "jti": str(uuid4())}
+
+    def verify_refresh_token(self, token):
+        return token
+
+
+class FakeRefreshTokens:
+    def __init__(self) -> None:
+        self.jti_to_user: dict = {}
+
+    async def save(self, user_id, token_jti) -> None:
+        self.jti_to_user[token_jti] = user_id
+
+    async def get_user_id_by_jti(self, jti):
+        return self.jti_to_user.pop(jti, None)
+
+
+class Noop:
+    def record(self, *args, **kwargs) -> None: ...
+
+
+class FakeTokenEpochs:
+    async def get(self, user_id) -> int:
+        return 3
+
+
+@pytest.mark.asyncio
+async def test_embedded_claims_survive_refresh_rotation():
+    service = AuthenticationService(
+        jwt_service=FakeJWT(),
+        refresh_token_repo=FakeRefreshTokens(),
+        login_tracker=Noop(),
+        audit_log=Noop(),
+        token_epochs=FakeTokenEpochs(),
+    )
+    user_id = uuid4()
+
+    _, refresh = await service.authenticate_and_generate_tokens(
+        user_id, extra_claims={"email_verified": True}
+    )
+    access, _ = await service.authenticate_and_generate_tokens(refresh_token=refresh)
+
+    principal = PrincipalDTO.from_claims(access)
+    assert principal.user_id == user_id
+    assert principal.email_verified is True
+    assert principal.expires_at is not None
+    assert principal.epoch == 3
+
+
+def test_principal_from_token_without_embedded_claims():
+    principal = PrincipalDTO.from_claims({"sub": str(uuid4())})
+
+    assert principal.email_verified is None
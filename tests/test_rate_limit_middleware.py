@@ -0,0 +1,112 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.application.interfaces import RateLimitDecision, SharedRateLimitRepository
+from src.core.middleware.client_ip import get_client_ip, parse_trusted_proxies
+from src.core.middleware.rate_limit_middleware import RateLimitMiddleware
+
+TRUSTED = parse_trusted_proxies(["10.0.0.0/8"])
+
+
+def _scope(peer: str, headers=(), path: str = "/api/v1/auth/login") -> dict:
+    return {
+        "type": "http",
+        "path": path,
+        "client": (peer, 12345),
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+    }
+
+
+def test_proxy_headers_are_ignored_from_untrusted_peer():
+    scope = _scope("203.0.113.7", [("x-forwarded-for", "1.1.1.1")])
+    assert get_client_ip(scope, TRUSTED) == "203.0.113.7"
+
+
+def test_forwarded_for_is_read_right_to_left_past_trusted_hops():
+    # левый адрес подставлен клиентом, правый — внутренний прокси
+    scope = _scope("10.0.0.2", [("x-forwarded-for", "6.6.6.6, 198.51.100.4, 10.0.0.9")])
+    assert get_client_ip(scope, TRUSTED) == "198.51.100.4"
+
+
+def test_real_ip_is_used_without_forwarded_for():
+    scope = _scope("10.0.0.2", [("x-real-ip", " 198.51.100.4 ")])
+    assert get_client_ip(scope, TRUSTED) == "198.51.100.4"
+
+
+class FakeRateLimitRepository:
+    def __init__(self, decision=None, error=None) -> None:
+        self.decision = decision
+        self.error = error
+        self.rules: list = []
+
+    async def check_rules(self, rules):
+        self.rules = list(rules)
+        if self.error is not None:
+            raise self.error
+        return self.decision
+
+
+class FakeContainer:
+    def __init__(self, repo) -> None:
+        self.repo = repo
+
+    async def get(self, dependency):
+        assert dependency is SharedRateLimitRepository
+        return self.repo
+
+
+async def _call(repo, scope):
+    app_calls = []
+
+    async def app(scope, receive, send):
+        app_calls.append(scope["path"])
+
+    middleware = RateLimitMiddleware(
+        app,
+        ip_limit=10,
+        ip_window_seconds=60,
+        route_limits={"/api/v1/auth/login": 5},
+        route_window_seconds=60,
+        global_limit=0,
+        global_window_seconds=60,
+        trusted_proxies=[],
+        exempt_paths=["/health"],
+    )
+    scope["app"] = SimpleNamespace(
+        state=SimpleNamespace(dishka_container=FakeContainer(repo))
+    )
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, None, send)
+    return app_calls, sent
+
+
+@pytest.mark.asyncio
+async def test_rejected_request_gets_429_with_retry_after():
+    repo = FakeRateLimitRepository(
+        RateLimitDecision(is_allowed=False, violated_rule=None, retry_after=17)
+    )
+
+    app_calls, sent = await _call(repo, _scope("203.0.113.7"))
+
+    assert app_calls == []
+    assert [rule.name for rule in repo.rules] == ["route", "ip"]
+    assert repo.rules[0].identifier == "203.0.113.7"
+    assert sent[0]["status"] == 429
+    assert (b"retry-after", b"17") in sent[0]["headers"]
+    assert json.loads(sent[1]["body"])["error"] == "RateLimitExceeded"
+
+
+@pytest.mark.asyncio
+async def test_limiter_errors_fail_open():
+    repo = FakeRateLimitRepository(error=ConnectionError("redis down"))
+
+    app_calls, sent = await _call(repo, _scope("203.0.113.7"))
+
+    assert app_calls == ["/api/v1/auth/login"]
+    assert sent == []
@@ -0,0 +1,76 @@
+"""
+Сравнение числа запросов к PostgreSQL для чтения пользователя через
+обычный UoW и read-only UoW. Запросы считаются через query logger asyncpg.
+
+Нужна живая БД: TEST_DATABASE_URL=postgresql+asyncpg://...
+"""
+
+import os
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.infrastructure.persistence.unit_of_work import (
+    ReadOnlySessionFactory,
+    SqlAlchemyReadOnlyUnitOfWork,
+    SqlAlchemyUnitOfWork,
+)
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    TEST_DATABASE_URL is None, reason="TEST_DATABASE_URL не задан"
+)
+
+
+def _is_tx_control(query: str) -> bool:
+    return query.strip().upper().startswith(("BEGIN", "COMMIT", "ROLLBACK"))
+
+
+@pytest.mark.asyncio
+async def test_read_only_uow_skips_transaction_round_trips():
+    engine = create_async_engine(TEST_DATABASE_URL, pool_size=1, max_overflow=0)
+    queries: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.driver_connection.add_query_logger(
+            lambda record: queries.append(record.query)
+        )
+
+    session_factory = async_sessionmaker(
+        bind=engine, expire_on_commit=False, class_=AsyncSession
+    )
+    read_only_factory = ReadOnlySessionFactory(
+        async_sessionmaker(
+            bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+            expire_on_commit=False,
+            class_=AsyncSession,
+        )
+    )
+
+    try:
+        # прогрев: служебные запросы диалекта при первом соединении не считаем
+        async with engine.connect():
+            pass
+
+        queries.clear()
+        session = session_factory()
+        async with SqlAlchemyUnitOfWork(session) as uow:
+            await uow.users.get_by_id(uuid4())
+            await uow.commit()
+        await session.close()
+        read_write = list(queries)
+
+        queries.clear()
+        async with SqlAlchemyReadOnlyUnitOfWork(read_only_factory) as uow:
+            await uow.users.get_by_id(uuid4())
+        read_only = list(queries)
+    finally:
+        await engine.dispose()
+
+    assert any(_is_tx_control(q) for q in read_write)
+    assert not any(_is_tx_control(q) for q in read_only)
+    assert len(read_only) < len(read_write)
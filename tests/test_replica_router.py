@@ -0,0 +1,94 @@
+from collections import Counter
+
+import pytest
+
+from src.infrastructure.persistence.replica_router import ReplicaNode, ReplicaRouter
+
+
+def _node(name: str, weight: int) -> ReplicaNode:
+    # для распределения фабрика не вызывается — достаточно уникального маркера
+    return ReplicaNode(name=name, session_factory=name, weight=weight)
+
+
+def test_weighted_round_robin_follows_weights():
+    router = ReplicaRouter(primary="primary", replicas=[_node("a", 3), _node("b", 1)])
+
+    picks = [router.choose() for _ in range(8)]
+
+    assert Counter(picks) == {"a": 6, "b": 2}
+    # smooth WRR не отдаёт больше 3 подряд в тяжёлую реплику
+    assert "b" in picks[:4]
+
+
+def test_unhealthy_replicas_fall_back_to_primary():
+    a, b = _node("a", 1), _node("b", 1)
+    router = ReplicaRouter(primary="primary", replicas=[a, b])
+
+    a.healthy = False
+    assert {router.choose() for _ in range(4)} == {"b"}
+
+    b.healthy = False
+    assert router.choose() == "primary"
+
+
+def test_no_replicas_routes_to_primary():
+    assert ReplicaRouter(primary="primary").choose() == "primary"
+
+
+@pytest.mark.asyncio
+async def test_health_check_against_sqlite(tmp_path):
+    # SQLite как стенд-ин для реплик: одна доступна, вторая указывает в несуществующий каталог
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    good = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    bad = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+    router = ReplicaRouter(
+        primary=async_sessionmaker(good),
+        replicas=[
+            ReplicaNode(name="good", session_factory=async_sessionmaker(good)),
+            ReplicaNode(name="bad", session_factory=async_sessionmaker(bad)),
+        ],
+        health_check_timeout=1.0,
+    )
+
+    try:
+        await router.check_health()
+    finally:
+        await good.dispose()
+        await bad.dispose()
+
+    assert [node.healthy for node in router.replicas] == [True, False]
+    assert {router.choose() for _ in range(3)} == {router.replicas[0].session_factory}
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc): ...
+
+
+class LagRouter(ReplicaRouter):
+    """Отставание задаётся тестом вместо запроса к pg_last_xact_replay_timestamp"""
+
+    def __init__(self, lags, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.lags = lags
+
+    async def _replication_lag(self, session) -> float:
+        return self.lags.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_leaves_rotation_until_it_catches_up():
+    node = ReplicaNode(name="a", session_factory=FakeSession)
+    router = LagRouter(
+        [12.0, 0.5], primary="primary", replicas=[node], max_lag_seconds=5.0
+    )
+
+    await router.check_health()
+    assert router.choose() == "primary"
+
+    await router.check_health()
+    assert router.choose() is FakeSession
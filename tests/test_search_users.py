@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.dtos import UserSearchDTO
+from src.application.exceptions import InvalidCursorError
+from src.application.interfaces import UserSearchMode
+from src.application.use_cases.admin.search_users import (
+    SearchUsersUseCase,
+    decode_cursor,
+)
+from src.presentation.api.routers.v1 import admin
+from src.secure.dependencies import require_admin
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeUsers:
+    """Keyset-поиск поверх списка — та же семантика, что у SQL-реализации"""
+
+    def __init__(self, rows) -> None:
+        self.rows = sorted(rows, key=lambda u: (u.created_at, u.id))
+
+    async def search(self, query, mode, limit, after=None):
+        matched = [
+            u
+            for u in self.rows
+            if (
+                u.email.value.startswith(query)
+                if mode is UserSearchMode.PREFIX
+                else query in u.email.value
+            )
+            and (after is None or (u.created_at, u.id) > (after.created_at, after.id))
+        ]
+        return matched[:limit]
+
+
+class FakeUnitOfWork:
+    def __init__(self, rows) -> None:
+        self.users = FakeUsers(rows)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc): ...
+
+
+def _user(i: int):
+    # по три пользователя на одну секунду — id разрешает совпадения created_at
+    return SimpleNamespace(
+        id=uuid4(),
+        email=SimpleNamespace(value=f"user{i}@example.com"),
+        created_at=BASE + timedelta(seconds=i // 3),
+        is_active=True,
+        email_verified=True,
+        last_login_at=None,
+    )
+
+
+def _build(rows):
+    return SearchUsersUseCase(
+        uow=FakeUnitOfWork(rows),
+        admin_cfg=SimpleNamespace(search_default_limit=4, search_max_limit=10),
+    )
+
+
+@pytest.mark.asyncio
+async def test_cursor_walks_all_pages_without_gaps_or_duplicates():
+    rows = [_user(i) for i in range(11)]
+    use_case = _build(rows)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = await use_case.execute(UserSearchDTO(query="user", cursor=cursor))
+        seen.extend(u.id for u in page.items)
+        pages += 1
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert pages == 3
+    assert seen == [u.id for u in use_case.uow.users.rows]
+
+
+@pytest.mark.asyncio
+async def test_limit_is_capped():
+    use_case = _build([_user(i) for i in range(30)])
+
+    page = await use_case.execute(UserSearchDTO(query="user", limit=1000))
+
+    assert len(page.items) == 10
+    assert page.next_cursor is not None
+
+
+def test_tampered_cursor_is_rejected():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_query_is_stripped_before_length_check():
+    use_case = _build([_user(i) for i in range(3)])
+    provider = Provider(scope=Scope.APP)
+    provider.provide(lambda: use_case, provides=SearchUsersUseCase)
+    app = FastAPI()
+    app.include_router(admin.router)
+    app.dependency_overrides[require_admin] = lambda: None
+    setup_dishka(make_async_container(provider), app)
+
+    with TestClient(app) as client:
+        assert client.get("/users", params={"q": "  us  "}).status_code == 422
+        response = client.get("/users", params={"q": "  user1 "})
+
+    assert response.status_code == 200
+    assert [u["email"] for u in response.json()["items"]] == ["user1@example.com"]
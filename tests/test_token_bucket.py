@@ -0,0 +1,79 @@
+import pytest
+
+from src.application.interfaces import RateLimitDecision, RateLimitRule
+from src.core.rate_limit.token_bucket import TokenBucketLimiter
+from src.infrastructure.caching.repositories.local_prefilter_rate_limit import (
+    LocalPrefilterRateLimitRepository,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_sheds_after_capacity_and_refills():
+    clock = FakeClock()
+    bucket = TokenBucketLimiter(
+        capacity=3, refill_per_second=1, max_entries=10, clock=clock
+    )
+
+    assert all(bucket.try_acquire("1.2.3.4") for _ in range(3))
+    assert bucket.try_acquire("1.2.3.4") is False
+    assert bucket.retry_after("1.2.3.4") == 1
+
+    clock.now += 1
+    assert bucket.try_acquire("1.2.3.4") is True
+
+
+def test_bucket_lru_is_bounded():
+    bucket = TokenBucketLimiter(capacity=1, refill_per_second=0, max_entries=2)
+
+    for key in ("a", "b", "c"):
+        assert bucket.try_acquire(key) is True
+
+    assert len(bucket) == 2
+    # "a" был вытеснен и начинает с полного ведра
+    assert bucket.try_acquire("a") is True
+
+
+def test_acquire_all_takes_nothing_when_one_bucket_is_empty():
+    bucket = TokenBucketLimiter(capacity=2, refill_per_second=0, max_entries=10)
+    assert bucket.try_acquire("b") is True
+    assert bucket.try_acquire("b") is True
+
+    assert bucket.try_acquire_all(["a", "b"]) == "b"
+    # ведро "a" не тронуто: два токена на месте
+    assert bucket.try_acquire_all(["a", "a"]) is None
+    assert bucket.try_acquire("a") is False
+
+
+class FakeRateLimitRepository:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def check_rules(self, rules):
+        self.calls += 1
+        return RateLimitDecision(is_allowed=True)
+
+
+@pytest.mark.asyncio
+async def test_prefilter_shed_by_later_rule_does_not_burn_earlier_tokens():
+    inner = FakeRateLimitRepository()
+    bucket = TokenBucketLimiter(capacity=1, refill_per_second=0, max_entries=10)
+    repo = LocalPrefilterRateLimitRepository(inner=inner, bucket=bucket)
+    by_email = RateLimitRule.window("email", "reg", "User@example.com", 5, 60)
+    by_ip = RateLimitRule.window("ip", "reg_ip", "1.2.3.4", 5, 60)
+
+    assert bucket.try_acquire("reg_ip:1.2.3.4") is True
+    decision = await repo.check_rules([by_email, by_ip])
+
+    assert decision.is_allowed is False
+    assert decision.violated_rule is by_ip
+    assert inner.calls == 0
+    # токен правила по email не списан
+    assert (await repo.check_rules([by_email])).is_allowed is True
+    assert inner.calls == 1
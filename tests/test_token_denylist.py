@@ -0,0 +1,64 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.infrastructure.caching.invalidation_bus import InvalidationMessage
+from src.infrastructure.caching.token_denylist import RedisTokenDenylist
+
+
+@pytest.fixture
+def make_denylist(make_redis, make_bus):
+    def make() -> RedisTokenDenylist:
+        # пул сессий и шина — разные инстансы Redis
+        return RedisTokenDenylist(
+            redis=make_redis(), bus=make_bus(synced=[RedisTokenDenylist.topic])
+        )
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_revoked_on_one_worker_is_rejected_on_another(make_denylist):
+    origin, replica = make_denylist(), make_denylist()
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+
+    await origin.revoke("jti-1", expires_at)
+    # сообщение, которое реплика получила бы из канала
+    replica.handle(InvalidationMessage.decode(origin.bus.redis.published[0]))
+
+    assert await origin.is_revoked("jti-1")
+    assert await replica.is_revoked("jti-1")
+    assert not await replica.is_revoked("jti-2")
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_pruned(make_denylist):
+    denylist = make_denylist()
+    denylist.handle(InvalidationMessage(denylist.topic, "old", str(time.time() - 1)))
+
+    assert not await denylist.is_revoked("old")
+    denylist._prune()
+    assert len(denylist) == 0
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_redis_until_synced(make_denylist):
+    denylist = make_denylist()
+    await denylist.revoke("jti-1", datetime.now(timezone.utc) + timedelta(minutes=5))
+    denylist.bus._synced.clear()
+    denylist._revoked.clear()
+
+    assert await denylist.is_revoked("jti-1")
+
+
+@pytest.mark.asyncio
+async def test_revoke_publishes_through_the_bus_client(make_denylist):
+    denylist = make_denylist()
+
+    await denylist.revoke("jti-1", datetime.now(timezone.utc) + timedelta(minutes=5))
+
+    assert denylist.redis.data == {"revoked_jti:jti-1": 1}
+    # в Redis сессий ничего не публикуется — подписчики слушают Redis шины
+    assert denylist.redis.published == []
+    assert len(denylist.bus.redis.published) == 1
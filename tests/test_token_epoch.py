@@ -0,0 +1,73 @@
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.infrastructure.caching.invalidation_bus import InvalidationMessage
+from src.infrastructure.caching.token_epoch import _SET_MAX_LUA, RedisTokenEpochStore
+
+
+async def _set_max(redis, keys, args):
+    current = redis.data.get(keys[0])
+    if current is None or int(args[0]) > int(current):
+        redis.data[keys[0]] = str(args[0]).encode()
+    return int(redis.data[keys[0]])
+
+
+@pytest.fixture
+def make_store(make_redis, make_bus):
+    def make(db: dict) -> RedisTokenEpochStore:
+        async def loader(user_id):
+            db["queries"] = db.get("queries", 0) + 1
+            return db.get(user_id)
+
+        redis = make_redis()
+        redis.scripts[_SET_MAX_LUA] = _set_max
+        bus = make_bus(redis, synced=[RedisTokenEpochStore.topic])
+        return RedisTokenEpochStore(redis=redis, bus=bus, loader=loader)
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_epoch_is_loaded_once_then_served_locally(make_store):
+    user_id = uuid4()
+    db = {user_id: 2}
+    store = make_store(db)
+
+    assert await store.get(user_id) == 2
+    assert await store.get(user_id) == 2
+    assert db["queries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bump_on_another_worker_reaches_local_cache(make_store):
+    user_id = uuid4()
+    origin, replica = make_store({user_id: 0}), make_store({user_id: 0})
+    assert await replica.get(user_id) == 0
+
+    await origin.publish(user_id, 1)
+    replica.handle(InvalidationMessage.decode(origin.redis.published[0]))
+
+    assert await replica.get(user_id) == 1
+    # запоздавшее старое значение эпоху не откатывает
+    replica.handle(InvalidationMessage(replica.topic, str(user_id), "0"))
+    assert await replica.get(user_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_drops_redis_copy_and_falls_back_to_db(make_store):
+    user_id = uuid4()
+    db = {user_id: 1}
+    store = make_store(db)
+    await store.get(user_id)
+    store.redis.fail("publish", RedisConnectionError("redis down"))
+
+    # эпоха в БД уже закоммичена — publish не падает
+    db[user_id] = 2
+    await store.publish(user_id, 2)
+
+    assert store._key(user_id) not in store.redis.data
+    # другой воркер без L1 читает эпоху из БД
+    other = RedisTokenEpochStore(redis=store.redis, bus=store.bus, loader=store.loader)
+    assert await other.get(user_id) == 2
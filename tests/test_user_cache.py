@@ -0,0 +1,103 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.domain.entities.user import User
+from src.domain.value_objects import Email, HashedPassword
+from src.infrastructure.caching.invalidation_bus import InvalidationMessage
+from src.infrastructure.caching.serializers import JsonSerializer
+from src.infrastructure.caching.user_cache import (
+    _POPULATE_LUA,
+    REDACTED_PASSWORD,
+    UserCache,
+)
+
+PASSWORD_HASH = "$argon2id$v=19$m=65536,t=3,p=4$c2FsdHNhbHQ$aGFzaGhhc2hoYXNo"
+
+
+async def _populate(redis, keys, args):
+    if keys[1] in redis.data:
+        return 0
+    redis.data[keys[0]] = args[0]
+    return 1
+
+
+@pytest.fixture
+def cache(make_redis, make_bus) -> UserCache:
+    redis = make_redis()
+    redis.scripts[_POPULATE_LUA] = _populate
+    return UserCache(
+        redis=redis,
+        bus=make_bus(redis, synced=[UserCache.topic]),
+        serializer=JsonSerializer(),
+    )
+
+
+def _user() -> User:
+    return User(
+        id=uuid4(),
+        email=Email.from_trusted("user@example.com"),
+        hashed_password=HashedPassword(PASSWORD_HASH),
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_query(cache):
+    user = _user()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return user
+
+    results = await asyncio.gather(*(cache.get(user.id, loader) for _ in range(20)))
+
+    assert calls == 1
+    assert all(result.id == user.id for result in results)
+    # повторное чтение — из L1, без запроса
+    assert (await cache.get(user.id, loader)).id == user.id
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_both_tiers(cache):
+    user = _user()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return user
+
+    await cache.get(user.id, loader)
+    await cache.invalidate(user.id)
+
+    message = InvalidationMessage.decode(cache.bus.redis.published[0])
+    assert (message.topic, message.key) == ("users", str(user.id))
+    assert cache._key(user.id) not in cache.redis.data
+
+    await cache.get(user.id, loader)
+    assert calls == 2
+    # tombstone: значение, прочитанное сразу после изменения, в Redis не попадает
+    assert cache._key(user.id) not in cache.redis.data
+
+
+@pytest.mark.asyncio
+async def test_password_hash_is_kept_out_of_the_cache(cache):
+    user = _user()
+
+    async def loader():
+        return user
+
+    loaded = await cache.get(user.id, loader)
+    assert loaded.hashed_password == REDACTED_PASSWORD
+    assert PASSWORD_HASH.encode() not in cache.redis.data[cache._key(user.id)]
+
+    # из Redis (L1 пуст) — тот же пользователь без хеша
+    cache.clear()
+    cached = await cache.get(user.id, loader)
+    assert cached.email == user.email
+    assert cached.hashed_password == REDACTED_PASSWORD
@@ -0,0 +1,54 @@
+import io
+import json
+
+from cli.users_io import _batches
+
+PASSWORD_HASH = "$argon2id$v=19$m=65536,t=3,p=4$c2FsdHNhbHQ$aGFzaGhhc2hoYXNo"
+USER_ID = "0b0f7c1e-7a51-4a4e-9a38-2b0c5f4ad0f1"
+
+
+def _ndjson(*rows) -> io.StringIO:
+    return io.StringIO(
+        "".join(r if isinstance(r, str) else json.dumps(r) + "\n" for r in rows)
+    )
+
+
+def test_invalid_rows_are_reported_and_skipped():
+    stream = _ndjson(
+        {
+            "id": USER_ID,
+            "email": " Alice@Example.COM ",
+            "hashed_password": PASSWORD_HASH,
+        },
+        {"email": "not-an-email", "hashed_password": PASSWORD_HASH},
+        {"email": "bob@example.com", "hashed_password": "plaintext"},
+        "{broken json\n",
+        {"email": "carol@example.com", "hashed_password": PASSWORD_HASH, "id": "x"},
+        {"email": "dave@example.com", "hashed_password": PASSWORD_HASH},
+    )
+    rejected: list = []
+
+    records = [r for batch in _batches(stream, "ndjson", 10, rejected) for r in batch]
+
+    assert rejected == [2, 3, 4, 5]
+    assert [r[1] for r in records] == ["alice@example.com", "dave@example.com"]
+    assert str(records[0][0]) == USER_ID
+    assert records[0][2] == PASSWORD_HASH
+
+
+def test_csv_rows_are_validated_with_file_line_numbers():
+    stream = io.StringIO(
+        "email,hashed_password,is_active\n"
+        # в хеше argon2 есть запятые — поле в кавычках
+        f'alice@example.com,"{PASSWORD_HASH}",false\n'
+        ",,\n"
+        f'bob@example.com,"{PASSWORD_HASH}",\n'
+    )
+    rejected: list = []
+
+    batches = list(_batches(stream, "csv", 1, rejected))
+
+    assert rejected == [3]
+    assert [len(batch) for batch in batches] == [1, 1]
+    # is_active по умолчанию — True
+    assert [batch[0][3] for batch in batches] == [False, True]